@@ -1,5 +1,7 @@
 import RPi.GPIO as GPIO
+from svc.config.settings_state import Settings
 from svc.manager import app
+from svc.services import email_jobs
 
 THERMO_PIN = 18
 
@@ -8,4 +10,6 @@ GPIO.setmode(GPIO.BOARD)
 GPIO.setup(THERMO_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
 if __name__ == '__main__':
+    if Settings.get_instance().Queue.email_consumer:
+        email_jobs.start_email_consumer()
     app.run()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+import jwt
+
+from benchmark.stub_server import StubServer
+from svc.config.settings_state import Settings
+from svc.manager import app
+from svc.utilities.coalesce_utils import LightStateCoalescer
+
+JWT_SECRET = 'benchmarkSecret'
+GROUP_ID = '1'
+
+
+def main():
+    args = _parse_args()
+    server = StubServer(delay=args.delay / 1000).start()
+    Settings.get_instance()._settings = {'JwtSecret': JWT_SECRET, 'LightApiKey': 'benchmark'}
+    Settings.get_instance().BaseUrls._settings = {'Lights': f'{server.url}/api/lights'}
+    body = {'user': {'user_id': 'benchmark'}, 'exp': datetime.now() + timedelta(hours=12)}
+    headers = {'Authorization': 'Bearer ' + jwt.encode(body, JWT_SECRET, algorithm='HS256').decode('UTF-8')}
+    try:
+        with app.test_client() as client:
+            uncoalesced = _replay_drag(client, headers, server, args, window=0)
+            coalesced = _replay_drag(client, headers, server, args, window=args.window / 1000)
+    finally:
+        server.stop()
+    _print_row('every update forwarded', args.events, *uncoalesced)
+    _print_row(f'coalesced ({args.window:g} ms window)', args.events, *coalesced)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Upstream lights api calls made by a brightness slider drag with and without coalescing')
+    parser.add_argument('--events', type=int, default=120, help='brightness updates sent during one drag')
+    parser.add_argument('--interval', type=float, default=16.0, help='milliseconds between slider updates')
+    parser.add_argument('--window', type=float, default=100.0, help='coalescing window in milliseconds')
+    parser.add_argument('--delay', type=float, default=20.0, help='stub lights api response delay in milliseconds')
+    return parser.parse_args()
+
+
+def _replay_drag(client, headers, server, args, window):
+    Settings.get_instance().Http._settings = {'CoalesceWindow': window}
+    LightStateCoalescer.get_instance().clear()
+    del server.requests[:]
+    start = time.perf_counter()
+    for event in range(args.events):
+        brightness = round(255 * (event + 1) / args.events)
+        request = {'groupId': GROUP_ID, 'on': True, 'brightness': brightness, 'wait': event == args.events - 1}
+        response = client.post('/lights/group/state', data=json.dumps(request), headers=headers)
+        assert response.status_code == 200
+        time.sleep(args.interval / 1000)
+    elapsed = (time.perf_counter() - start) * 1000
+    applied = [json.loads(body) for path, body in server.requests if path.endswith('/group/state')]
+    return len(applied), applied[-1]['brightness'], elapsed
+
+
+def _print_row(label, events, calls, final_brightness, elapsed):
+    print(f'{label:<30} {events:5d} updates -> {calls:5d} upstream calls   final brightness {final_brightness:3d}   drag {elapsed:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
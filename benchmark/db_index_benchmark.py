@@ -0,0 +1,163 @@
+import argparse
+import hashlib
+import os
+import random
+import re
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+
+from svc.config.settings_state import Settings
+from svc.db.engine import DatabaseEngine
+from svc.db.methods.user_credentials import UserDatabaseManager
+
+MIGRATION_FILE = os.path.join(os.path.dirname(__file__), '..', 'docker', 'flyway', 'migration', 'V1.28__add_lookup_indexes.sql')
+LOCAL_DATABASE = {'User': 'postgres', 'Password': 'password', 'Name': 'garage_door', 'Port': '5432'}
+
+SEED_STATEMENTS = [
+    "INSERT INTO user_information (id, first_name, last_name, email) "
+    "SELECT md5('bench-user-' || n)::uuid, 'Bench', 'User', 'bench' || n || '@example.com' FROM generate_series(1, :users) n",
+    "INSERT INTO user_login (id, user_name, password, user_id) "
+    "SELECT gen_random_uuid(), 'bench' || n, 'password', md5('bench-user-' || n)::uuid FROM generate_series(1, :users) n",
+    "INSERT INTO user_preferences (user_id, is_fahrenheit, is_imperial, city) "
+    "SELECT md5('bench-user-' || n)::uuid, TRUE, TRUE, 'Des Moines' FROM generate_series(1, :users) n",
+    "INSERT INTO user_roles (id, user_id, role_id) "
+    "SELECT md5('bench-role-' || n)::uuid, md5('bench-user-' || n)::uuid, (SELECT id FROM roles WHERE role_name = 'garage_door') "
+    "FROM generate_series(1, :users) n",
+    "INSERT INTO role_devices (ip_address, ip_port, max_nodes, user_role_id) "
+    "SELECT '127.0.0.1', 5001, 2, md5('bench-role-' || n)::uuid FROM generate_series(1, :users) n",
+    "INSERT INTO schedule_tasks (user_id, alarm_days, enabled, task_type_id) "
+    "SELECT md5('bench-user-' || n)::uuid, 'MonTueWed', TRUE, (SELECT id FROM scheduled_task_types WHERE activity_name = 'turn on') "
+    "FROM generate_series(1, :users) n",
+    "INSERT INTO child_accounts (parent_user_id, child_user_id) "
+    "SELECT md5('bench-user-' || n)::uuid, md5('bench-user-' || (n + 1))::uuid FROM generate_series(1, :users - 1, 10) n",
+    "INSERT INTO refresh_token (user_id, refresh, count, expire_time) "
+    "SELECT md5('bench-user-' || n)::uuid, md5('bench-refresh-' || n)::uuid, 10, now() + interval '1 day' FROM generate_series(1, :users) n",
+    "INSERT INTO scenes (id, name, user_id) "
+    "SELECT md5('bench-scene-' || n)::uuid, 'Evening', md5('bench-user-' || n)::uuid FROM generate_series(1, :users) n",
+    "INSERT INTO scene_details (scene_id, light_group, light_group_name, light_brightness) "
+    "SELECT md5('bench-scene-' || n)::uuid, '1', 'Living Room', 50 FROM generate_series(1, :users) n",
+    "INSERT INTO daily_sump_level (user_id, distance, warning_level, create_date) "
+    "SELECT md5('bench-user-' || (1 + n % :users))::uuid, 30 + random() * 10, 1, now() - n * interval '1 second' "
+    "FROM generate_series(1, :sump_rows) n",
+    "INSERT INTO average_daily_sump_level (user_id, distance, create_day) "
+    "SELECT md5('bench-user-' || (1 + n % :users))::uuid, 33.4, current_date - n / :users FROM generate_series(1, :sump_rows / 10) n",
+]
+
+CLEANUP_STATEMENTS = [
+    "DELETE FROM scene_details WHERE scene_id IN (SELECT s.id FROM scenes s JOIN user_information u ON u.id = s.user_id WHERE u.first_name = 'Bench')",
+    "DELETE FROM role_devices WHERE user_role_id IN (SELECT r.id FROM user_roles r JOIN user_information u ON u.id = r.user_id WHERE u.first_name = 'Bench')",
+    "DELETE FROM child_accounts WHERE parent_user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM scenes WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM refresh_token WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM schedule_tasks WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM user_roles WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM user_preferences WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM user_login WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM daily_sump_level WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM average_daily_sump_level WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'Bench')",
+    "DELETE FROM user_information WHERE first_name = 'Bench'",
+]
+
+METHODS = [
+    ('validate_credentials', lambda n: (f'bench{n}', 'password')),
+    ('get_user_info', lambda n: (_user_id(n),)),
+    ('get_roles_by_user', lambda n: (_user_id(n),)),
+    ('get_preferences_by_user', lambda n: (_user_id(n),)),
+    ('get_schedule_tasks_by_user', lambda n: (_user_id(n), None)),
+    ('get_current_sump_level_by_user', lambda n: (_user_id(n),)),
+    ('get_average_sump_level_by_user', lambda n: (_user_id(n),)),
+    ('get_user_garage_ip', lambda n: (_user_id(n),)),
+    ('get_user_child_accounts', lambda n: (_user_id(n),)),
+    ('get_scenes_by_user', lambda n: (_user_id(n),)),
+]
+
+
+def main():
+    args = _parse_args()
+    Settings.get_instance().Database._settings = {**LOCAL_DATABASE, **(Settings.get_instance().Database._settings or {})}
+    if args.seed:
+        _execute(SEED_STATEMENTS, {'users': args.users, 'sump_rows': args.sump_rows})
+    samples = [random.randint(1, args.users) for _ in range(args.samples)]
+
+    _execute([f'DROP INDEX IF EXISTS {name}' for name in _index_names()] + ['ANALYZE'])
+    before = _time_methods(samples)
+    _execute(_migration_statements() + ['ANALYZE'])
+    after = _time_methods(samples)
+
+    _print_results(before, after)
+    if args.cleanup:
+        _execute(CLEANUP_STATEMENTS)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Latency of UserDatabase lookups with and without the V1.28 indexes')
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--sump-rows', type=int, default=2000000)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--no-seed', dest='seed', action='store_false')
+    parser.add_argument('--cleanup', action='store_true')
+    return parser.parse_args()
+
+
+def _user_id(number):
+    return str(uuid.UUID(_md5_hex(f'bench-user-{number}')))
+
+
+def _md5_hex(value):
+    return hashlib.md5(value.encode('UTF-8')).hexdigest()
+
+
+def _execute(statements, params=None):
+    connection = DatabaseEngine.get_instance().connect()
+    try:
+        for statement in statements:
+            with connection.begin():
+                connection.execute(text(statement), params or {})
+    finally:
+        connection.close()
+
+
+def _index_names():
+    with open(MIGRATION_FILE, 'r') as reader:
+        return re.findall(r'CREATE INDEX IF NOT EXISTS (\w+)', reader.read())
+
+
+def _migration_statements():
+    with open(MIGRATION_FILE, 'r') as reader:
+        return [statement.strip() for statement in reader.read().split(';') if statement.strip()]
+
+
+def _time_methods(samples):
+    results = {}
+    with UserDatabaseManager() as database:
+        for name, build_args in METHODS:
+            timings = []
+            for number in samples:
+                start = time.perf_counter()
+                try:
+                    getattr(database, name)(*build_args(number))
+                except Exception:
+                    pass
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = timings
+    return results
+
+
+def _print_results(before, after):
+    print(f'{"method":<34}{"before p50":>12}{"before p95":>12}{"after p50":>12}{"after p95":>12}')
+    for name, _ in METHODS:
+        print(f'{name:<34}{_percentile(before[name], 50):>12.3f}{_percentile(before[name], 95):>12.3f}'
+              f'{_percentile(after[name], 50):>12.3f}{_percentile(after[name], 95):>12.3f}')
+
+
+def _percentile(timings, percent):
+    if percent == 50:
+        return statistics.median(timings)
+    return sorted(timings)[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+
+if __name__ == '__main__':
+    main()
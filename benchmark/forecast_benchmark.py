@@ -0,0 +1,79 @@
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import jwt
+from mock import patch
+
+from benchmark.stub_server import StubServer
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import CacheNamespace
+from svc.manager import app
+from svc.utilities.cache_utils import SharedCache
+
+JWT_SECRET = 'benchmarkSecret'
+USER_ID = 'benchmark'
+PREFERENCE = {'city': 'Prague', 'temp_unit': 'celsius', 'is_fahrenheit': False}
+WEATHER = {'coord': {'lat': 50.08, 'lon': 14.42}, 'main': {'temp': 12.3}, 'weather': [{'description': 'clear sky'}]}
+FORECAST = {'daily': [{'temp': {'min': 8.1, 'max': 15.6}}]}
+
+
+class PreferenceDatabase:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def get_preferences_by_user(self, user_id):
+        return PREFERENCE
+
+
+def main():
+    args = _parse_args()
+    server = StubServer(delay=args.delay / 1000, responses={'/weather': WEATHER, '/onecall': FORECAST}).start()
+    Settings.get_instance()._settings = {'JwtSecret': JWT_SECRET, 'WeatherAppId': 'benchmark'}
+    Settings.get_instance().BaseUrls._settings = {'Weather': server.url}
+    body = {'user': {'user_id': USER_ID}, 'exp': datetime.now() + timedelta(hours=12)}
+    headers = {'Authorization': 'Bearer ' + jwt.encode(body, JWT_SECRET, algorithm='HS256').decode('UTF-8')}
+    try:
+        with patch('svc.controllers.thermostat_controller.UserDatabaseManager', PreferenceDatabase), app.test_client() as client:
+            sequential = _time_calls(client, headers, args.requests, keep_coordinates=False)
+            concurrent = _time_calls(client, headers, args.requests, keep_coordinates=True)
+    finally:
+        server.stop()
+    _print_row('sequential weather, forecast', sequential)
+    _print_row('cached coords, concurrent', concurrent)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Latency of /thermostat/forecast with sequential vs concurrent weather calls')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=50.0, help='stub response delay in milliseconds')
+    return parser.parse_args()
+
+
+def _time_calls(client, headers, count, keep_coordinates):
+    cache = SharedCache.get_instance()
+    timings = []
+    for _ in range(count):
+        cache.invalidate(CacheNamespace.WEATHER, f'{PREFERENCE["city"]}:metric')
+        if not keep_coordinates:
+            cache.invalidate(CacheNamespace.COORDINATES, PREFERENCE['city'])
+        start = time.perf_counter()
+        response = client.get(f'/thermostat/forecast/{USER_ID}', headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return timings
+
+
+def _print_row(label, timings):
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f'{label:<30} p50 {statistics.median(timings):7.3f} ms   p99 {p99:7.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import jwt
+
+from benchmark.db_index_benchmark import LOCAL_DATABASE, _execute
+from benchmark.stub_server import StubServer
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import CacheNamespace
+from svc.manager import app
+from svc.utilities.cache_utils import SharedCache
+
+JWT_SECRET = 'benchmarkSecret'
+USER_ID = '6f0e7b52-6a3c-4f0e-9a55-1b2b3c4d5e6f'
+ROLE_ID = '8a1d2c3b-4e5f-4a6b-8c7d-9e0f1a2b3c4d'
+GARAGE_ID = '1'
+STATUS = {'isGarageOpen': False, 'statusDuration': '2021-01-01T12:00:00', 'coordinates': {'latitude': 41.6, 'longitude': -93.6}}
+
+SEED_STATEMENTS = [
+    "INSERT INTO user_information (id, first_name, last_name, email) VALUES (:user_id, 'Bench', 'Garage', 'bench-garage@example.com')",
+    "INSERT INTO user_roles (id, user_id, role_id) VALUES (:role_id, :user_id, (SELECT id FROM roles WHERE role_name = 'garage_door'))",
+    "INSERT INTO role_devices (ip_address, ip_port, max_nodes, user_role_id) VALUES ('127.0.0.1', :port, 2, :role_id)",
+]
+
+CLEANUP_STATEMENTS = [
+    "DELETE FROM role_devices WHERE user_role_id = :role_id",
+    "DELETE FROM user_roles WHERE id = :role_id",
+    "DELETE FROM user_information WHERE id = :user_id",
+]
+
+
+def main():
+    args = _parse_args()
+    server = StubServer(delay=args.delay / 1000, responses={f'/garageDoor/{GARAGE_ID}/status': STATUS}).start()
+    Settings.get_instance()._settings = {'JwtSecret': JWT_SECRET}
+    Settings.get_instance().Database._settings = {**LOCAL_DATABASE, **(Settings.get_instance().Database._settings or {})}
+    params = {'user_id': USER_ID, 'role_id': ROLE_ID, 'port': server.server_address[1]}
+    _execute(CLEANUP_STATEMENTS, params)
+    _execute(SEED_STATEMENTS, params)
+    body = {'user': {'user_id': USER_ID}, 'exp': datetime.now() + timedelta(hours=12)}
+    headers = {'Authorization': 'Bearer ' + jwt.encode(body, JWT_SECRET, algorithm='HS256').decode('UTF-8')}
+    try:
+        with app.test_client() as client:
+            uncached = _time_calls(client, headers, args.requests, keep_url=False)
+            cached = _time_calls(client, headers, args.requests, keep_url=True)
+    finally:
+        _execute(CLEANUP_STATEMENTS, params)
+        server.stop()
+    _print_row('garage url from database', uncached)
+    _print_row('garage url from cache', cached)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Latency of /garageDoor/<id>/user/<id>/status with and without the garage url cache')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--delay', type=float, default=0.0, help='stub garage node response delay in milliseconds')
+    return parser.parse_args()
+
+
+def _time_calls(client, headers, count, keep_url):
+    cache = SharedCache.get_instance()
+    timings = []
+    for _ in range(count):
+        if not keep_url:
+            cache.invalidate(CacheNamespace.GARAGE_URLS, USER_ID)
+        start = time.perf_counter()
+        response = client.get(f'/garageDoor/{GARAGE_ID}/user/{USER_ID}/status', headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return timings
+
+
+def _print_row(label, timings):
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f'{label:<26} p50 {statistics.median(timings):7.3f} ms   p99 {p99:7.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
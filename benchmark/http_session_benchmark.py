@@ -0,0 +1,58 @@
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmark.stub_server import StubServer
+from svc.config.settings_state import Settings
+from svc.utilities import api_utils
+
+GROUPS = [{'groupId': '1', 'groupName': 'Living Room', 'on': True, 'brightness': 200}]
+
+
+def main():
+    args = _parse_args()
+    server = StubServer(delay=args.delay / 1000, responses={'/api/lights/groups': GROUPS}).start()
+    Settings.get_instance().BaseUrls._settings = {'Lights': f'{server.url}/api/lights'}
+    try:
+        old = _time_calls(_get_groups_without_session, f'{server.url}/api/lights/groups', args.requests)
+        new = _time_calls(_get_groups_with_session, None, args.requests)
+    finally:
+        server.stop()
+    _print_row('new connection per call', old)
+    _print_row('pooled keep-alive session', new)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Latency of get_light_groups with a new connection per call vs pooled sessions')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--delay', type=float, default=0.0, help='stub response delay in milliseconds')
+    return parser.parse_args()
+
+
+def _get_groups_without_session(url):
+    requests.get(url, headers={'LightApiKey': 'benchmark'}, timeout=10).json()
+
+
+def _get_groups_with_session(_):
+    api_utils.get_light_groups('benchmark')
+
+
+def _time_calls(function, argument, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        function(argument)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _print_row(label, timings):
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f'{label:<28} p50 {statistics.median(timings):7.3f} ms   p99 {p99:7.3f} ms   total {sum(timings) / 1000:6.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+import jwt
+
+from svc.config.settings_state import Settings
+from svc.utilities.cache_utils import TokenCache
+from svc.utilities.jwt_utils import is_jwt_valid
+
+JWT_SECRET = 'benchmarkSecret'
+
+
+def main():
+    args = _parse_args()
+    Settings.get_instance()._settings = {'JwtSecret': JWT_SECRET}
+    body = {'user': {'user_id': 'benchmark'}, 'exp': datetime.now() + timedelta(hours=12)}
+    bearer_token = 'Bearer ' + jwt.encode(body, JWT_SECRET, algorithm='HS256').decode('UTF-8')
+
+    cold = timeit.repeat(lambda: _validate_uncached(bearer_token), number=args.iterations, repeat=args.repeat)
+    TokenCache.get_instance().clear()
+    warm = timeit.repeat(lambda: is_jwt_valid(bearer_token), number=args.iterations, repeat=args.repeat)
+
+    cold_us = min(cold) / args.iterations * 1000000
+    warm_us = min(warm) / args.iterations * 1000000
+    print(f'uncached verification: {cold_us:8.2f} us/request')
+    print(f'cached verification:   {warm_us:8.2f} us/request')
+    print(f'saved per request:     {cold_us - warm_us:8.2f} us ({cold_us / warm_us:.1f}x faster)')
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Per-request cost of is_jwt_valid with and without the verified token cache')
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+
+def _validate_uncached(bearer_token):
+    TokenCache.get_instance().clear()
+    is_jwt_valid(bearer_token)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import time
+
+import pika
+
+from svc.config.settings_state import Settings
+from svc.utilities.rabbitmq_client import RabbitMQClient
+from test.memory_broker import MemoryBroker
+
+QUEUE = 'benchmark'
+EXCHANGE = 'home_automation'
+
+
+def main():
+    args = _parse_args()
+    broker = MemoryBroker(latency=args.latency / 1000)
+    _declare_queue(broker)
+    payloads = [{'email': f'user{index}@example.com', 'password': 'benchmark'} for index in range(args.messages)]
+    client = RabbitMQClient(Settings.get_instance(), QUEUE, connection_factory=broker.connect)
+    try:
+        rows = [('connection per message', _time_publish(broker, lambda: [_publish_with_new_connection(broker, payload) for payload in payloads])),
+                ('persistent channel', _time_publish(broker, lambda: [client.publish(QUEUE, payload) for payload in payloads])),
+                (f'batches of {args.batch_size}', _time_publish(broker, lambda: _publish_batches(client, payloads, args.batch_size)))]
+    finally:
+        client.close_publisher()
+    for label, (elapsed, connections) in rows:
+        print(f'{label:<24} {args.messages / elapsed:10.1f} msg/s   {connections:5d} connections opened')
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Messages/sec published by RabbitMQClient against the in-memory broker stand-in')
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.5, help='simulated broker round trip in milliseconds')
+    return parser.parse_args()
+
+
+def _declare_queue(broker):
+    connection = broker.connect()
+    channel = connection.channel()
+    channel.exchange_declare(exchange=EXCHANGE)
+    channel.queue_declare(queue=QUEUE, durable=True)
+    channel.queue_bind(queue=QUEUE, exchange=EXCHANGE, routing_key=QUEUE)
+    connection.close()
+
+
+def _publish_with_new_connection(broker, payload):
+    connection = broker.connect()
+    try:
+        channel = connection.channel()
+        channel.exchange_declare(exchange=EXCHANGE, exchange_type='direct', durable=False)
+        props = pika.BasicProperties(content_type='application/json', delivery_mode=1)
+        channel.basic_publish(exchange=EXCHANGE, routing_key=QUEUE, body=json.dumps(payload).encode('utf-8'), properties=props)
+    finally:
+        connection.close()
+
+
+def _publish_batches(client, payloads, batch_size):
+    for start in range(0, len(payloads), batch_size):
+        client.publish_batch(QUEUE, payloads[start:start + batch_size])
+
+
+def _time_publish(broker, publish):
+    broker.queues[QUEUE].clear()
+    connections = broker.stats['connections']
+    start = time.perf_counter()
+    publish()
+    elapsed = time.perf_counter() - start
+    return elapsed, broker.stats['connections'] - connections
+
+
+if __name__ == '__main__':
+    main()
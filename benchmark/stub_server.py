@@ -0,0 +1,55 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.__respond()
+
+    def do_POST(self):
+        self.server.record(self.path, self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        self.__respond()
+
+    def log_message(self, format, *args):
+        pass
+
+    def __respond(self):
+        time.sleep(self.server.delay)
+        body = json.dumps(self.server.responses.get(self.path.split('?')[0], {})).encode('UTF-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0.0, responses=None):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.delay = delay
+        self.responses = responses or {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def record(self, path, body):
+        with self._lock:
+            self.requests.append((path, body))
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
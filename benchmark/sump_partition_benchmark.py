@@ -0,0 +1,116 @@
+import argparse
+import hashlib
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from svc.config.settings_state import Settings
+from svc.db.engine import DatabaseEngine
+from svc.db.methods.user_credentials import UserDatabase
+
+LOCAL_DATABASE = {'User': 'postgres', 'Password': 'password', 'Name': 'garage_door', 'Port': '5432'}
+PLAIN_SCHEMA = 'sump_benchmark'
+
+SEED_STATEMENTS = [
+    "INSERT INTO user_information (id, first_name, last_name, email) "
+    "SELECT md5('bench-sump-user-' || n)::uuid, 'BenchSump', 'User', 'benchsump' || n || '@example.com' FROM generate_series(1, :users) n",
+    "SELECT create_daily_sump_level_partitions((current_date - make_interval(months => :months))::date, 3)",
+    "INSERT INTO daily_sump_level (user_id, distance, warning_level, create_date) "
+    "SELECT md5('bench-sump-user-' || (1 + n % :users))::uuid, 30 + random() * 10, 1, "
+    "now() - (n * (:months * interval '30 days') / :sump_rows) FROM generate_series(1, :sump_rows) n",
+    f"CREATE SCHEMA IF NOT EXISTS {PLAIN_SCHEMA}",
+    f"CREATE TABLE {PLAIN_SCHEMA}.daily_sump_level (id SERIAL PRIMARY KEY, user_id UUID NOT NULL, distance DOUBLE PRECISION NOT NULL, "
+    "warning_level INT NOT NULL, create_date TIMESTAMP NOT NULL DEFAULT current_timestamp)",
+    f"INSERT INTO {PLAIN_SCHEMA}.daily_sump_level (id, user_id, distance, warning_level, create_date) "
+    "SELECT id, user_id, distance, warning_level, create_date FROM public.daily_sump_level "
+    "WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'BenchSump')",
+    f"CREATE INDEX ON {PLAIN_SCHEMA}.daily_sump_level (user_id, id DESC)",
+    f"CREATE INDEX ON {PLAIN_SCHEMA}.daily_sump_level (user_id, create_date)",
+    'ANALYZE',
+]
+
+CLEANUP_STATEMENTS = [
+    f"DROP SCHEMA IF EXISTS {PLAIN_SCHEMA} CASCADE",
+    "DELETE FROM daily_sump_level WHERE user_id IN (SELECT id FROM user_information WHERE first_name = 'BenchSump')",
+    "DELETE FROM user_information WHERE first_name = 'BenchSump'",
+]
+
+
+def main():
+    args = _parse_args()
+    Settings.get_instance().Database._settings = {**LOCAL_DATABASE, **(Settings.get_instance().Database._settings or {})}
+    if args.seed:
+        _execute(SEED_STATEMENTS, {'users': args.users, 'sump_rows': args.sump_rows, 'months': args.months})
+    samples = [random.randint(1, args.users) for _ in range(args.samples)]
+
+    results = {'unpartitioned': _time_queries(samples, f'{PLAIN_SCHEMA}, public'),
+               'partitioned': _time_queries(samples, 'public')}
+    _print_results(results)
+    if args.cleanup:
+        _execute(CLEANUP_STATEMENTS)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Latency of sump level lookups against daily_sump_level with and without the V1.31 monthly partitions')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--sump-rows', type=int, default=10000000)
+    parser.add_argument('--months', type=int, default=12, help='months of history the seeded readings are spread over')
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--no-seed', dest='seed', action='store_false')
+    parser.add_argument('--cleanup', action='store_true')
+    return parser.parse_args()
+
+
+def _user_id(number):
+    return str(uuid.UUID(hashlib.md5(f'bench-sump-user-{number}'.encode('UTF-8')).hexdigest()))
+
+
+def _execute(statements, params=None):
+    connection = DatabaseEngine.get_instance().connect()
+    try:
+        for statement in statements:
+            with connection.begin():
+                connection.execute(text(statement), params or {})
+    finally:
+        connection.close()
+
+
+def _time_queries(samples, search_path):
+    connection = DatabaseEngine.get_instance().connect()
+    connection.execute(text(f'SET search_path TO {search_path}'))
+    session = DatabaseEngine.get_instance().session_factory(bind=connection)
+    database = UserDatabase(session)
+    end = datetime.now()
+    queries = {'get_current_sump_level_by_user': lambda user_id: database.get_current_sump_level_by_user(user_id),
+               'get_sump_levels_by_user (7 days)': lambda user_id: list(database.get_sump_levels_by_user(user_id, end - timedelta(days=7), end))}
+    try:
+        return {name: [_time(query, _user_id(number)) for number in samples] for name, query in queries.items()}
+    finally:
+        session.close()
+        connection.execute(text('RESET search_path'))
+        connection.close()
+
+
+def _time(query, user_id):
+    start = time.perf_counter()
+    query(user_id)
+    return (time.perf_counter() - start) * 1000
+
+
+def _print_results(results):
+    print(f'{"query":<36}{"table":<16}{"p50 ms":>10}{"p95 ms":>10}')
+    for name in results['unpartitioned']:
+        for table, timings in results.items():
+            print(f'{name:<36}{table:<16}{statistics.median(timings[name]):>10.3f}{_percentile(timings[name], 95):>10.3f}')
+
+
+def _percentile(timings, percent):
+    return sorted(timings)[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+
+if __name__ == '__main__':
+    main()
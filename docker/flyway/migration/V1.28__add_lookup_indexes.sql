@@ -0,0 +1,21 @@
+CREATE INDEX IF NOT EXISTS user_login_user_name_idx ON user_login (user_name);
+CREATE INDEX IF NOT EXISTS user_login_user_id_idx ON user_login (user_id);
+
+CREATE INDEX IF NOT EXISTS user_roles_user_id_idx ON user_roles (user_id);
+CREATE INDEX IF NOT EXISTS role_devices_user_role_id_idx ON role_devices (user_role_id);
+CREATE INDEX IF NOT EXISTS role_device_nodes_role_device_id_idx ON role_device_nodes (role_device_id);
+
+CREATE INDEX IF NOT EXISTS user_preferences_user_id_idx ON user_preferences (user_id);
+CREATE INDEX IF NOT EXISTS schedule_tasks_user_id_idx ON schedule_tasks (user_id);
+
+CREATE INDEX IF NOT EXISTS child_accounts_child_user_id_idx ON child_accounts (child_user_id);
+CREATE INDEX IF NOT EXISTS child_accounts_parent_user_id_idx ON child_accounts (parent_user_id);
+
+CREATE INDEX IF NOT EXISTS refresh_token_refresh_idx ON refresh_token (refresh);
+CREATE INDEX IF NOT EXISTS refresh_token_user_id_idx ON refresh_token (user_id);
+
+CREATE INDEX IF NOT EXISTS scenes_user_id_idx ON scenes (user_id);
+CREATE INDEX IF NOT EXISTS scene_details_scene_id_idx ON scene_details (scene_id);
+
+CREATE INDEX IF NOT EXISTS daily_sump_level_user_id_id_idx ON daily_sump_level (user_id, id DESC);
+CREATE INDEX IF NOT EXISTS average_daily_sump_level_user_id_id_idx ON average_daily_sump_level (user_id, id DESC);
@@ -0,0 +1,22 @@
+ALTER TABLE average_daily_sump_level ADD COLUMN reading_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE average_daily_sump_level ADD COLUMN distance_sum DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE average_daily_sump_level ADD COLUMN distance_min DOUBLE PRECISION;
+ALTER TABLE average_daily_sump_level ADD COLUMN distance_max DOUBLE PRECISION;
+
+DELETE FROM average_daily_sump_level a
+    USING average_daily_sump_level b
+    WHERE a.user_id = b.user_id AND a.create_day = b.create_day AND a.id < b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS average_daily_sump_level_user_id_create_day_idx ON average_daily_sump_level (user_id, create_day);
+
+UPDATE average_daily_sump_level
+    SET reading_count = 1, distance_sum = distance, distance_min = distance, distance_max = distance
+    WHERE reading_count = 0;
+
+INSERT INTO average_daily_sump_level (user_id, create_day, reading_count, distance_sum, distance_min, distance_max, distance)
+    SELECT user_id, create_date::date, count(*), sum(distance), min(distance), max(distance), avg(distance)
+    FROM daily_sump_level
+    GROUP BY user_id, create_date::date
+ON CONFLICT (user_id, create_day) DO UPDATE
+    SET reading_count = excluded.reading_count, distance_sum = excluded.distance_sum, distance_min = excluded.distance_min,
+        distance_max = excluded.distance_max, distance = excluded.distance;
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS daily_sump_level_user_id_create_date_idx ON daily_sump_level (user_id, create_date);
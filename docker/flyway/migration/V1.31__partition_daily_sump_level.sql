@@ -0,0 +1,71 @@
+CREATE OR REPLACE FUNCTION create_daily_sump_level_partitions(first_month DATE, months_ahead INTEGER) RETURNS INTEGER AS $$
+DECLARE
+    partition_month DATE := date_trunc('month', first_month);
+    last_month DATE := date_trunc('month', current_date) + make_interval(months => months_ahead);
+    next_month DATE;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE partition_month <= last_month LOOP
+        partition_name := 'daily_sump_level_' || to_char(partition_month, 'YYYY_MM');
+        next_month := partition_month + interval '1 month';
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE daily_sump_level INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format('WITH moved AS (DELETE FROM daily_sump_level_default WHERE create_date >= %L AND create_date < %L RETURNING *) '
+                           'INSERT INTO %I SELECT * FROM moved', partition_month, next_month, partition_name);
+            EXECUTE format('ALTER TABLE daily_sump_level ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                           partition_name, partition_month, next_month);
+            created := created + 1;
+        END IF;
+        partition_month := partition_month + interval '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION drop_daily_sump_level_partitions(retention_days INTEGER) RETURNS INTEGER AS $$
+DECLARE
+    expired RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR expired IN
+        SELECT child.relname AS name
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'daily_sump_level'
+          AND child.relname ~ '^daily_sump_level_[0-9]{4}_[0-9]{2}$'
+          AND to_date(right(child.relname, 7), 'YYYY_MM') + interval '1 month' <= current_date - retention_days
+    LOOP
+        EXECUTE format('DROP TABLE %I', expired.name);
+        dropped := dropped + 1;
+    END LOOP;
+    DELETE FROM daily_sump_level_default WHERE create_date < current_date - retention_days;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE daily_sump_level RENAME TO daily_sump_level_unpartitioned;
+ALTER INDEX daily_sump_level_pkey RENAME TO daily_sump_level_unpartitioned_pkey;
+ALTER SEQUENCE daily_sump_level_id_seq OWNED BY NONE;
+
+CREATE TABLE daily_sump_level (
+    id INTEGER NOT NULL DEFAULT nextval('daily_sump_level_id_seq'),
+    user_id UUID REFERENCES user_information(ID) NOT NULL,
+    distance DOUBLE PRECISION NOT NULL,
+    warning_level INT NOT NULL,
+    create_date TIMESTAMP NOT NULL DEFAULT current_timestamp,
+    PRIMARY KEY (id, create_date)
+) PARTITION BY RANGE (create_date);
+
+CREATE TABLE daily_sump_level_default PARTITION OF daily_sump_level DEFAULT;
+
+SELECT create_daily_sump_level_partitions(COALESCE((SELECT min(create_date) FROM daily_sump_level_unpartitioned)::date, current_date), 3);
+
+INSERT INTO daily_sump_level (id, user_id, distance, warning_level, create_date)
+    SELECT id, user_id, distance, warning_level, create_date FROM daily_sump_level_unpartitioned;
+
+DROP TABLE daily_sump_level_unpartitioned;
+ALTER SEQUENCE daily_sump_level_id_seq OWNED BY daily_sump_level.id;
+
+CREATE INDEX IF NOT EXISTS daily_sump_level_user_id_create_date_id_idx ON daily_sump_level (user_id, create_date DESC, id DESC);
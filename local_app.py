@@ -1,4 +1,8 @@
+from svc.config.settings_state import Settings
 from svc.manager import app
+from svc.services import email_jobs
 
 if __name__ == '__main__':
+    if Settings.get_instance().Queue.email_consumer:
+        email_jobs.start_email_consumer()
     app.run(host='0.0.0.0', port=5000)
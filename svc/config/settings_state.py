@@ -13,6 +13,8 @@ class Settings:
         self.Queue = Queue(self._settings)
         self.Database = Database(self._settings)
         self.BaseUrls = BaseUrls(self._settings)
+        self.Cache = Cache(self._settings)
+        self.Http = Http(self._settings)
 
     @property
     def environment(self):
@@ -40,7 +42,7 @@ class Settings:
 
     @property
     def allowed_origins(self):
-        return self._settings.get('AllowedOrigins') if self._settings is not None else []
+        return self._settings.get('AllowedOrigins', []) if self._settings is not None else []
 
     def __load_settings(self):
         try:
@@ -73,6 +75,34 @@ class Database:
     def port(self):
         return _get_setting('SQL_PORT', 'Port', self._settings)
 
+    @property
+    def pool_size(self):
+        return _get_int_setting('SQL_POOL_SIZE', 'PoolSize', self._settings, 2)
+
+    @property
+    def max_overflow(self):
+        return _get_int_setting('SQL_MAX_OVERFLOW', 'MaxOverflow', self._settings, 3)
+
+    @property
+    def pool_timeout(self):
+        return _get_int_setting('SQL_POOL_TIMEOUT', 'PoolTimeout', self._settings, 10)
+
+    @property
+    def pool_recycle(self):
+        return _get_int_setting('SQL_POOL_RECYCLE', 'PoolRecycle', self._settings, 1800)
+
+    @property
+    def pool_pre_ping(self):
+        return _get_bool_setting('SQL_POOL_PRE_PING', 'PoolPrePing', self._settings, True)
+
+    @property
+    def sump_partitions_ahead(self):
+        return _get_int_setting('SQL_SUMP_PARTITIONS_AHEAD', 'SumpPartitionsAhead', self._settings, 3)
+
+    @property
+    def sump_retention_days(self):
+        return _get_int_setting('SQL_SUMP_RETENTION_DAYS', 'SumpRetentionDays', self._settings, 0)
+
 
 class Queue:
 
@@ -99,6 +129,47 @@ class Queue:
     def vhost(self):
         return _get_setting('QUEUE_VHOST', 'VHost', self._settings)
 
+    @property
+    def email_queue(self):
+        return _get_setting('QUEUE_EMAIL_QUEUE', 'EmailQueue', self._settings or {}) or 'email_jobs'
+
+    @property
+    def email_consumer(self):
+        return _get_bool_setting('QUEUE_EMAIL_CONSUMER', 'EmailConsumer', self._settings, False)
+
+    @property
+    def email_attempts(self):
+        return _get_int_setting('QUEUE_EMAIL_ATTEMPTS', 'EmailAttempts', self._settings, 3)
+
+    @property
+    def email_retry_delay(self):
+        return _get_float_setting('QUEUE_EMAIL_RETRY_DELAY', 'EmailRetryDelay', self._settings, 1.0)
+
+    @property
+    def consumer_workers(self):
+        return _get_int_setting('QUEUE_CONSUMER_WORKERS', 'ConsumerWorkers', self._settings, 4)
+
+    @property
+    def prefetch_count(self):
+        return _get_int_setting('QUEUE_PREFETCH_COUNT', 'PrefetchCount', self._settings, self.consumer_workers * 2)
+
+    @property
+    def ordered_consumer(self):
+        return _get_bool_setting('QUEUE_ORDERED_CONSUMER', 'OrderedConsumer', self._settings, False)
+
+    @property
+    def drain_seconds(self):
+        return _get_int_setting('QUEUE_DRAIN_SECONDS', 'DrainSeconds', self._settings, 10)
+
+    @property
+    def reconnect_delay(self):
+        return _get_float_setting('QUEUE_RECONNECT_DELAY', 'ReconnectDelay', self._settings, 1.0)
+
+    @property
+    def max_reconnect_delay(self):
+        return _get_float_setting('QUEUE_MAX_RECONNECT_DELAY', 'MaxReconnectDelay', self._settings, 30.0)
+
+
 class BaseUrls:
 
     def __init__(self, settings):
@@ -117,6 +188,133 @@ class BaseUrls:
         return self._settings.get('Email')
 
 
+class Cache:
+
+    def __init__(self, settings):
+        self._settings = settings.get('Cache') if settings is not None else None
+
+    @property
+    def name(self):
+        return (self._settings or {}).get('Name', 'home_automation')
+
+    @property
+    def max_size(self):
+        return _get_int_setting('CACHE_MAX_SIZE', 'MaxSize', self._settings, 1024)
+
+    @property
+    def default_ttl(self):
+        return _get_int_setting('CACHE_DEFAULT_TTL', 'DefaultTtl', self._settings, 60)
+
+    @property
+    def token_max_size(self):
+        return _get_int_setting('CACHE_TOKEN_MAX_SIZE', 'TokenMaxSize', self._settings, 512)
+
+    @property
+    def preference_ttl(self):
+        return _get_int_setting('CACHE_PREFERENCE_TTL', 'PreferenceTtl', self._settings, 300)
+
+    @property
+    def role_ttl(self):
+        return _get_int_setting('CACHE_ROLE_TTL', 'RoleTtl', self._settings, 300)
+
+    @property
+    def weather_ttl(self):
+        return _get_int_setting('CACHE_WEATHER_TTL', 'WeatherTtl', self._settings, 600)
+
+    @property
+    def weather_stale_ttl(self):
+        return _get_int_setting('CACHE_WEATHER_STALE_TTL', 'WeatherStaleTtl', self._settings, 86400)
+
+    @property
+    def coordinates_ttl(self):
+        return _get_int_setting('CACHE_COORDINATES_TTL', 'CoordinatesTtl', self._settings, 2592000)
+
+    @property
+    def light_group_ttl(self):
+        return _get_int_setting('CACHE_LIGHT_GROUP_TTL', 'LightGroupTtl', self._settings, 5)
+
+    @property
+    def light_group_stale_ttl(self):
+        return _get_int_setting('CACHE_LIGHT_GROUP_STALE_TTL', 'LightGroupStaleTtl', self._settings, 60)
+
+    @property
+    def garage_url_ttl(self):
+        return _get_int_setting('CACHE_GARAGE_URL_TTL', 'GarageUrlTtl', self._settings, 3600)
+
+    @property
+    def garage_status_ttl(self):
+        return _get_float_setting('CACHE_GARAGE_STATUS_TTL', 'GarageStatusTtl', self._settings, 0.0)
+
+    @property
+    def email_status_ttl(self):
+        return _get_int_setting('CACHE_EMAIL_STATUS_TTL', 'EmailStatusTtl', self._settings, 86400)
+
+    @property
+    def owner_ttl(self):
+        return _get_int_setting('CACHE_OWNER_TTL', 'OwnerTtl', self._settings, 86400)
+
+
+class Http:
+    DEFAULT_TIMEOUTS = {'lights': 10, 'garage': 5, 'weather': 5, 'email': 10}
+    DEFAULT_DEADLINES = {'lights': 3, 'garage': 3, 'weather': 3}
+
+    def __init__(self, settings):
+        self._settings = settings.get('Http') if settings is not None else None
+
+    @property
+    def pool_size(self):
+        return _get_int_setting('HTTP_POOL_SIZE', 'PoolSize', self._settings, 10)
+
+    @property
+    def pool_connections(self):
+        return _get_int_setting('HTTP_POOL_CONNECTIONS', 'PoolConnections', self._settings, 10)
+
+    @property
+    def max_workers(self):
+        return _get_int_setting('HTTP_MAX_WORKERS', 'MaxWorkers', self._settings, 16)
+
+    @property
+    def batch_workers(self):
+        return _get_int_setting('HTTP_BATCH_WORKERS', 'BatchWorkers', self._settings, 8)
+
+    @property
+    def failure_threshold(self):
+        return _get_int_setting('HTTP_FAILURE_THRESHOLD', 'FailureThreshold', self._settings, 3)
+
+    @property
+    def open_seconds(self):
+        return _get_int_setting('HTTP_OPEN_SECONDS', 'OpenSeconds', self._settings, 30)
+
+    @property
+    def coalesce_window(self):
+        return _get_float_setting('HTTP_COALESCE_WINDOW', 'CoalesceWindow', self._settings, 0.1)
+
+    def timeout(self, dependency):
+        timeouts = (self._settings or {}).get('Timeouts', {})
+        return timeouts.get(dependency.capitalize(), self.DEFAULT_TIMEOUTS.get(dependency, 10))
+
+    def deadline(self, dependency):
+        deadlines = (self._settings or {}).get('Deadlines', {})
+        return deadlines.get(dependency.capitalize(), self.DEFAULT_DEADLINES.get(dependency, 3))
+
+
 def _get_setting(env_var, setting_key, settings):
     env_var_value = os.environ.get(env_var)
-    return env_var_value if env_var_value is not None else settings.get(setting_key)
\ No newline at end of file
+    return env_var_value if env_var_value is not None else settings.get(setting_key)
+
+
+def _get_int_setting(env_var, setting_key, settings, default):
+    value = _get_setting(env_var, setting_key, settings or {})
+    return default if value is None else int(value)
+
+
+def _get_bool_setting(env_var, setting_key, settings, default):
+    value = _get_setting(env_var, setting_key, settings or {})
+    if value is None:
+        return default
+    return value if isinstance(value, bool) else str(value).lower() == 'true'
+
+
+def _get_float_setting(env_var, setting_key, settings, default):
+    value = _get_setting(env_var, setting_key, settings or {})
+    return default if value is None else float(value)
\ No newline at end of file
@@ -34,8 +34,34 @@ class Time:
     TEN_MINUTE = 600
 
 
+class CacheNamespace:
+    PREFERENCES = 'preferences'
+    ROLES = 'roles'
+    GARAGE_URLS = 'garage_urls'
+    WEATHER = 'weather'
+    COORDINATES = 'coordinates'
+    LIGHT_GROUPS = 'light_groups'
+    EMAIL_JOBS = 'email_jobs'
+    OWNERS = 'owners'
+
+
+class EmailStatus:
+    QUEUED = 'queued'
+    RETRYING = 'retrying'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+
+class Dependency:
+    LIGHTS = 'lights'
+    GARAGE = 'garage'
+    WEATHER = 'weather'
+    EMAIL = 'email'
+
+
 class Automation:
     APP_NAME = "Soaring Leaf Home Automation"
     HVAC = Hvac
     TIME = Time
     GARAGE = Garage
+    CACHE = CacheNamespace
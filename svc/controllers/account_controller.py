@@ -3,8 +3,8 @@ import json
 from werkzeug.exceptions import BadRequest
 
 from svc.db.methods.user_credentials import UserDatabaseManager
+from svc.services import email_jobs
 from svc.utilities import jwt_utils
-from svc.utilities.api_utils import send_new_account_email
 from svc.utilities.string_utils import generate_password
 
 
@@ -31,17 +31,23 @@ def create_child_account_by_user(bearer_token, user_id, request_data):
     new_pass = generate_password(10)
     with UserDatabaseManager() as database:
         child_accounts = database.create_child_account(user_id, email, roles, new_pass)
-    send_new_account_email(request['email'], new_pass)
-    return child_accounts
+    email_jobs.queue_new_account_email(request['email'], new_pass)
+    return __with_email_status(child_accounts)
 
 
 def get_child_accounts_by_user(bearer_token, user_id):
     jwt_utils.is_jwt_valid(bearer_token)
     with UserDatabaseManager() as database:
-        return database.get_user_child_accounts(user_id)
+        child_accounts = database.get_user_child_accounts(user_id)
+    return __with_email_status(child_accounts)
 
 
 def delete_child_account(bearer_token, user_id, child_user_id):
     jwt_utils.is_jwt_valid(bearer_token)
     with UserDatabaseManager() as database:
-        database.delete_child_user_account(user_id, child_user_id)
\ No newline at end of file
+        database.delete_child_user_account(user_id, child_user_id)
+
+
+def __with_email_status(child_accounts):
+    statuses = [email_jobs.get_email_status(child['user_name']) for child in child_accounts]
+    return [{**child, 'email_status': status['status'] if status else None} for child, status in zip(child_accounts, statuses)]
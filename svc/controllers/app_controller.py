@@ -3,8 +3,11 @@ import json
 
 import pytz
 
+from svc.db.engine import DatabaseEngine
 from svc.db.methods.user_credentials import UserDatabaseManager
 from svc.utilities import jwt_utils
+from svc.utilities.cache_utils import SharedCache
+from svc.utilities.circuit_breaker_utils import CircuitBreakers
 
 
 def get_login(client_id, client_secret):
@@ -61,3 +64,10 @@ def update_user_task(bearer_token, user_id, task):
     request = json.loads(task.decode('UTF-8'))
     with UserDatabaseManager() as database:
         return database.update_schedule_task_by_user_id(user_id, request)
+
+
+def get_metrics(bearer_token):
+    jwt_utils.is_jwt_valid(bearer_token)
+    return {'database': DatabaseEngine.get_instance().get_stats(),
+            'cache': SharedCache.get_instance().get_stats(),
+            'circuitBreakers': CircuitBreakers.get_instance().get_stats()}
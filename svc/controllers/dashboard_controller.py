@@ -0,0 +1,56 @@
+import logging
+import time
+from concurrent.futures import TimeoutError
+
+from werkzeug.exceptions import HTTPException, GatewayTimeout, InternalServerError
+
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import Dependency
+from svc.controllers import sump_controller, thermostat_controller
+from svc.db.methods.user_credentials import UserDatabaseManager
+from svc.services import light_groups, temperature
+from svc.utilities import api_utils, worker_pool_utils
+from svc.utilities.jwt_utils import is_jwt_valid
+from svc.utilities.single_flight_utils import GarageStatusFlight
+from svc.utilities.user_garage_utils import read_garage_url
+
+
+def get_dashboard(bearer_token, user_id, garage_id):
+    is_jwt_valid(bearer_token)
+    started = time.monotonic()
+    errors = {}
+    pending = {'lights': (Dependency.LIGHTS, worker_pool_utils.submit(light_groups.get_light_groups, Settings.get_instance().light_api_key))}
+    with UserDatabaseManager() as database:
+        preferences = database.get_preferences_by_user(user_id)
+        pending['forecast'] = (Dependency.WEATHER, worker_pool_utils.submit(temperature.get_external_temp, preferences))
+        if garage_id is not None:
+            garage_url = __load_section(errors, 'garage', read_garage_url, database, user_id)
+            if garage_url is not None:
+                pending['garage'] = (Dependency.GARAGE, worker_pool_utils.submit(GarageStatusFlight.get_instance().get_status, garage_url, garage_id,
+                                                                                 api_utils.get_garage_door_status, bearer_token, garage_url, garage_id))
+        dashboard = {'preferences': preferences,
+                     'temperature': __load_section(errors, 'temperature', thermostat_controller.read_user_temp, preferences),
+                     'sump': __load_section(errors, 'sump', sump_controller.read_sump_level, database, user_id)}
+
+    deadlines = Settings.get_instance().Http
+    for section, (dependency, future) in pending.items():
+        remaining = started + deadlines.deadline(dependency) - time.monotonic()
+        dashboard[section] = __load_section(errors, section, future.result, timeout=max(remaining, 0.0))
+    if garage_id is not None and 'garage' not in pending:
+        dashboard['garage'] = None
+    dashboard = {section: value.to_dict(encode_json=True) if hasattr(value, 'to_dict') else value for section, value in dashboard.items()}
+    return {**dashboard, 'errors': errors}
+
+
+def __load_section(errors, section, function, *args, **kwargs):
+    try:
+        return function(*args, **kwargs)
+    except TimeoutError:
+        error = GatewayTimeout()
+    except HTTPException as http_error:
+        error = http_error
+    except Exception:
+        logging.exception(f'Dashboard section {section} failed')
+        error = InternalServerError()
+    errors[section] = {'status': error.code, 'message': error.name}
+    return None
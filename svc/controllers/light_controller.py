@@ -1,7 +1,11 @@
-from werkzeug.exceptions import BadRequest
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import BadRequest, HTTPException, InternalServerError
 
 from svc.config.settings_state import Settings
+from svc.services import light_groups
 from svc.utilities import api_utils
+from svc.utilities.coalesce_utils import LightStateCoalescer
 from svc.utilities.jwt_utils import is_jwt_valid
 
 
@@ -9,23 +13,40 @@ def get_assigned_light_groups(bearer_token):
     is_jwt_valid(bearer_token)
     api_key = Settings.get_instance().light_api_key
 
-    return api_utils.get_light_groups(api_key)
+    return light_groups.get_light_groups(api_key)
 
 
 def set_assigned_light_groups(bearer_token, request):
     is_jwt_valid(bearer_token)
     api_key = Settings.get_instance().light_api_key
     try:
-        api_utils.set_light_groups(api_key, request['groupId'], request['on'], request.get('brightness'))
+        group_id, on = request['groupId'], request['on']
     except KeyError:
         raise BadRequest()
+    update = LightStateCoalescer.get_instance().set_group(light_groups.set_light_groups, api_key, group_id, on, request.get('brightness'))
+    if request.get('wait'):
+        update.result()
 
 
 def set_assigned_light(bearer_token, request_data):
     is_jwt_valid(bearer_token)
     api_key = Settings.get_instance().light_api_key
 
-    api_utils.set_light_state(api_key, request_data.get('lightId'), request_data.get('brightness'))
+    update = LightStateCoalescer.get_instance().set_light(light_groups.set_light_state, api_key, request_data.get('lightId'), request_data.get('brightness'))
+    if request_data.get('wait'):
+        update.result()
+
+
+def set_light_batch(bearer_token, request):
+    is_jwt_valid(bearer_token)
+    api_key = Settings.get_instance().light_api_key
+    if not isinstance(request, list):
+        raise BadRequest()
+    if not request:
+        return []
+    workers = min(len(request), Settings.get_instance().Http.batch_workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='light-batch') as executor:
+        return list(executor.map(lambda item: __apply_batch_item(api_key, item), request))
 
 
 def get_unassigned_lights(bearer_token):
@@ -44,4 +65,23 @@ def register_unassigned_light(bearer_token, request):
 
     settings = Settings.get_instance()
     api_key = settings.light_api_key
-    api_utils.assign_light_group(api_key, group_id, light_id, name, switch_type_id)
+    light_groups.assign_light_group(api_key, group_id, light_id, name, switch_type_id)
+
+
+def __apply_batch_item(api_key, item):
+    result = {key: item[key] for key in ('groupId', 'lightId') if isinstance(item, dict) and key in item}
+    try:
+        if 'groupId' in result:
+            LightStateCoalescer.get_instance().set_group(light_groups.set_light_groups, api_key, item['groupId'], item['on'], item.get('brightness'), window=0).result()
+        elif 'lightId' in result:
+            LightStateCoalescer.get_instance().set_light(light_groups.set_light_state, api_key, item['lightId'], item.get('brightness'), window=0).result()
+        else:
+            raise BadRequest()
+        return {**result, 'status': 200}
+    except KeyError:
+        error = BadRequest()
+    except HTTPException as http_error:
+        error = http_error
+    except Exception:
+        error = InternalServerError()
+    return {**result, 'status': error.code, 'message': error.name}
@@ -1,4 +1,12 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import HTTPException, InternalServerError
+
+from svc.config.settings_state import Settings
 from svc.db.methods.user_credentials import UserDatabaseManager
+from svc.services import light_groups
+from svc.utilities.coalesce_utils import LightStateCoalescer
 from svc.utilities.jwt_utils import is_jwt_valid
 
 
@@ -12,3 +20,31 @@ def delete_created_scene(bearer_token, user_id, scene_id):
     is_jwt_valid(bearer_token)
     with UserDatabaseManager() as database:
         database.delete_scene_by_user(user_id, scene_id)
+
+
+def activate_scene(bearer_token, user_id, scene_id):
+    is_jwt_valid(bearer_token)
+    with UserDatabaseManager() as database:
+        details = database.get_scene_details_by_user(user_id, scene_id)
+    if not details:
+        return []
+    api_key = Settings.get_instance().light_api_key
+    workers = min(len(details), Settings.get_instance().Http.batch_workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scene-activate') as executor:
+        return list(executor.map(lambda detail: __activate_group(api_key, detail), details))
+
+
+def __activate_group(api_key, detail):
+    result = {'groupId': detail['group_id'], 'groupName': detail['group_name']}
+    brightness = detail['brightness']
+    started = time.perf_counter()
+    try:
+        LightStateCoalescer.get_instance().set_group(light_groups.set_light_groups, api_key, detail['group_id'], bool(brightness), brightness, window=0).result()
+        result['status'] = 200
+    except HTTPException as http_error:
+        result.update({'status': http_error.code, 'message': http_error.name})
+    except Exception:
+        error = InternalServerError()
+        result.update({'status': error.code, 'message': error.name})
+    result['elapsedMs'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
@@ -1,19 +1,50 @@
 import json
+from datetime import datetime
+
+from werkzeug.exceptions import BadRequest
 
 from models.sump import SumpLevel
+from svc.config.settings_state import Settings
 from svc.db.methods.user_credentials import UserDatabaseManager
 from svc.utilities.conversion_utils import convert_to_imperial
+from svc.utilities.depth_utils import downsample_depths
 from svc.utilities.jwt_utils import is_jwt_valid
 
+DEFAULT_POINTS = 200
+MAX_POINTS = 2000
+
 
 def get_sump_level(user_id, bearer_token):
     is_jwt_valid(bearer_token)
     with UserDatabaseManager() as database:
-        current_data = database.get_current_sump_level_by_user(user_id)
-        average_data = database.get_average_sump_level_by_user(user_id)
-        preferences = database.get_preferences_by_user(user_id)
+        return read_sump_level(database, user_id)
+
 
-        return __map_response(current_data, average_data, preferences['is_imperial'])
+def read_sump_level(database, user_id):
+    summary = database.get_sump_summary_by_user(user_id)
+
+    return __map_response(summary, summary['is_imperial'])
+
+
+def get_sump_levels(user_id, bearer_token, start, end, points):
+    is_jwt_valid(bearer_token)
+    try:
+        start, end = datetime.fromisoformat(start), datetime.fromisoformat(end)
+        points = DEFAULT_POINTS if points is None else int(points)
+    except (TypeError, ValueError):
+        raise BadRequest()
+    if start.tzinfo is not None or end.tzinfo is not None or start >= end or not 0 < points <= MAX_POINTS:
+        raise BadRequest()
+    with UserDatabaseManager() as database:
+        is_imperial = database.get_preferences_by_user(user_id)['is_imperial']
+        buckets = downsample_depths(database.get_sump_levels_by_user(user_id, start, end), start, end, points)
+    return {'depthUnit': 'in' if is_imperial else 'cm',
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'levels': [{**bucket, 'date': bucket['date'].isoformat(),
+                        'minDepth': convert_to_imperial(bucket['minDepth'], is_imperial),
+                        'maxDepth': convert_to_imperial(bucket['maxDepth'], is_imperial),
+                        'averageDepth': convert_to_imperial(bucket['averageDepth'], is_imperial)} for bucket in buckets]}
 
 
 def save_current_level(user_id, bearer_token, request):
@@ -23,11 +54,32 @@ def save_current_level(user_id, bearer_token, request):
         database.insert_current_sump_level(user_id, depth_info)
 
 
-def __map_response(current_data, average_data, is_imperial):
+def save_current_levels(user_id, bearer_token, request):
+    is_jwt_valid(bearer_token)
+    try:
+        readings = json.loads(request)
+    except ValueError:
+        raise BadRequest()
+    with UserDatabaseManager() as database:
+        return database.insert_sump_levels(user_id, readings)
+
+
+def backfill_average_levels(user_id=None):
+    with UserDatabaseManager() as database:
+        return database.backfill_average_sump_levels(user_id)
+
+
+def maintain_partitions():
+    settings = Settings.get_instance().Database
+    with UserDatabaseManager() as database:
+        return database.maintain_sump_partitions(settings.sump_partitions_ahead, settings.sump_retention_days)
+
+
+def __map_response(summary, is_imperial):
     return SumpLevel(
-        currentDepth=convert_to_imperial(current_data.get('currentDepth'), is_imperial),
-        averageDepth=convert_to_imperial(average_data.get('averageDepth'), is_imperial),
+        currentDepth=convert_to_imperial(summary.get('currentDepth'), is_imperial),
+        averageDepth=convert_to_imperial(summary.get('averageDepth'), is_imperial),
         depthUnit='in' if is_imperial else 'cm',
-        warningLevel=current_data.get('warningLevel'),
-        latest_date=average_data.get('latestDate')
+        warningLevel=summary.get('warningLevel'),
+        latest_date=summary.get('latestDate')
     )
\ No newline at end of file
@@ -12,9 +12,12 @@ def get_user_temp(user_id, bearer_token):
     is_jwt_valid(bearer_token)
     with UserDatabaseManager() as database:
         preference = database.get_preferences_by_user(user_id)
-        internal_temp = temperature.get_internal_temp(preference)
+        return read_user_temp(preference)
 
-        return __create_response(internal_temp, preference['is_fahrenheit'])
+
+def read_user_temp(preference):
+    internal_temp = temperature.get_internal_temp(preference)
+    return __create_response(internal_temp, preference['is_fahrenheit'])
 
 
 def get_user_forecast(user_id, bearer_token):
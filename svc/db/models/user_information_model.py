@@ -171,5 +171,9 @@ class AverageSumpPumpLevel(Base):
     user_id = Column(UUID, ForeignKey(UserInformation.id))
     distance = Column(DECIMAL, nullable=False)
     create_day = Column(DATE, nullable=False)
+    reading_count = Column(Integer, nullable=False)
+    distance_sum = Column(DECIMAL, nullable=False)
+    distance_min = Column(DECIMAL)
+    distance_max = Column(DECIMAL)
 
     user = relationship('UserInformation', foreign_keys='AverageSumpPumpLevel.user_id')
@@ -4,7 +4,7 @@ from flask import Blueprint, request, Response
 from werkzeug.exceptions import Unauthorized
 
 from svc.constants.home_automation import Mime
-from svc.controllers import app_controller
+from svc.controllers import app_controller, dashboard_controller
 
 APP_BLUEPRINT = Blueprint('app_routes', __name__)
 
@@ -14,6 +14,13 @@ def health_check():
     return Response("Success", status=200)
 
 
+@APP_BLUEPRINT.route('/metrics', methods=['GET'])
+def get_metrics():
+    bearer_token = request.headers.get('Authorization')
+    metrics = app_controller.get_metrics(bearer_token)
+    return Response(json.dumps(metrics), status=200, mimetype=Mime.JSON)
+
+
 @APP_BLUEPRINT.route('/token', methods=['POST'])
 def get_token():
     body = json.loads(request.data)
@@ -33,6 +40,13 @@ def get_user_preferences_by_user_id(user_id):
     return Response(json.dumps(preferences), status=200)
 
 
+@APP_BLUEPRINT.route('/userId/<user_id>/dashboard', methods=['GET'])
+def get_dashboard_by_user_id(user_id):
+    bearer_token = request.headers.get('Authorization')
+    dashboard = dashboard_controller.get_dashboard(bearer_token, user_id, request.args.get('garageId'))
+    return Response(json.dumps(dashboard), status=200, mimetype=Mime.JSON)
+
+
 @APP_BLUEPRINT.route('/userId/<user_id>/preferences/update', methods=['POST'])
 def update_user_preferences_by_user_id(user_id):
     bearer_token = request.headers.get('Authorization')
@@ -32,6 +32,13 @@ def set_light_state():
     return Response(status=200, mimetype=Mime.JSON)
 
 
+@LIGHT_BLUEPRINT.route('/batch', methods=['POST'])
+def set_light_batch():
+    bearer_token = request.headers.get('Authorization')
+    results = light_controller.set_light_batch(bearer_token, json.loads(request.data.decode('UTF-8')))
+    return Response(json.dumps(results), status=200, mimetype=Mime.JSON)
+
+
 @LIGHT_BLUEPRINT.route('/unregistered', methods=['GET'])
 def get_unregistered_devices():
     bearer_token = request.headers.get('Authorization')
@@ -21,3 +21,10 @@ def delete_scene_by_user(user_id, scene_id):
     bearer_token = request.headers.get('Authorization')
     scene_controller.delete_created_scene(bearer_token, user_id, scene_id)
     return Response(status=200, mimetype=Mime.JSON)
+
+
+@SCENE_BLUEPRINT.route('/userId/<user_id>/scene/<scene_id>/activate', methods=['POST'])
+def activate_scene_by_user(user_id, scene_id):
+    bearer_token = request.headers.get('Authorization')
+    groups = scene_controller.activate_scene(bearer_token, user_id, scene_id)
+    return Response(json.dumps(groups), status=200, mimetype=Mime.JSON)
@@ -1,7 +1,10 @@
+import json
+
 from flask import Blueprint, request, Response
 
 from svc.constants.home_automation import Mime
-from svc.controllers.sump_controller import get_sump_level, save_current_level
+from svc.controllers.sump_controller import get_sump_level, save_current_level, save_current_levels, \
+    get_sump_levels
 
 SUMP_BLUEPRINT = Blueprint('sump_pump_blueprint', __name__, url_prefix='/sumpPump')
 
@@ -19,3 +22,16 @@ def save_current_level_by_user(user_id):
     depth_info = request.data
     save_current_level(user_id, bear_token, depth_info)
 
+
+@SUMP_BLUEPRINT.route('/user/<user_id>/depths', methods=['POST'])
+def save_current_levels_by_user(user_id):
+    bearer_token = request.headers.get('Authorization')
+    result = save_current_levels(user_id, bearer_token, request.data)
+    return Response(json.dumps(result), status=200, mimetype=Mime.JSON)
+
+
+@SUMP_BLUEPRINT.route('/user/<user_id>/depths', methods=['GET'])
+def get_sump_levels_by_user(user_id):
+    bearer_token = request.headers.get('Authorization')
+    levels = get_sump_levels(user_id, bearer_token, request.args.get('from'), request.args.get('to'), request.args.get('points'))
+    return Response(json.dumps(levels), status=200, mimetype=Mime.JSON)
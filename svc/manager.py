@@ -1,8 +1,10 @@
+import click
 from flask import Flask
 from flask_cors import CORS
 
 from svc.config.security_headers_middleware import add_security_headers
 from svc.config.settings_state import Settings
+from svc.controllers.sump_controller import backfill_average_levels, maintain_partitions
 from svc.endpoints.account_routes import ACCOUNT_BLUEPRINT
 from svc.endpoints.app_routes import APP_BLUEPRINT
 from svc.endpoints.device_routes import DEVICES_BLUEPRINT
@@ -11,6 +13,13 @@ from svc.endpoints.light_routes import LIGHT_BLUEPRINT
 from svc.endpoints.scene_routes import SCENE_BLUEPRINT
 from svc.endpoints.sump_routes import SUMP_BLUEPRINT
 from svc.endpoints.thermostat_routes import THERMOSTAT_BLUEPRINT
+from svc.services import email_jobs
+
+try:
+    from uwsgidecorators import postfork, cron
+except ImportError:
+    postfork = None
+    cron = None
 
 app = Flask(__name__)
 
@@ -26,3 +35,20 @@ app.register_blueprint(DEVICES_BLUEPRINT)
 app.register_blueprint(SCENE_BLUEPRINT)
 app.after_request(add_security_headers)
 
+if postfork is not None and Settings.get_instance().Queue.email_consumer:
+    postfork(email_jobs.start_email_consumer)
+
+if cron is not None:
+    cron(15, 3, -1, -1, -1)(lambda signum: maintain_partitions())
+
+
+@app.cli.command('backfill-sump-averages')
+@click.option('--user-id', default=None, help='Only rebuild the daily averages of this user')
+def backfill_sump_averages(user_id):
+    click.echo(f"Rebuilt {backfill_average_levels(user_id)['days']} daily sump averages")
+
+
+@app.cli.command('maintain-sump-partitions')
+def maintain_sump_partitions():
+    result = maintain_partitions()
+    click.echo(f"Created {result['created']} and dropped {result['dropped']} daily sump level partitions")
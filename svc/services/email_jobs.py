@@ -0,0 +1,61 @@
+import json
+import logging
+import time
+
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import CacheNamespace, EmailStatus
+from svc.utilities import api_utils, worker_pool_utils
+from svc.utilities.cache_utils import SharedCache
+from svc.utilities.rabbitmq_client import get_client
+
+
+def queue_new_account_email(email, password):
+    job = {'email': email, 'password': password}
+    __record_status(email, EmailStatus.QUEUED, 0)
+    worker_pool_utils.submit(publish_new_account_email, job)
+
+
+def publish_new_account_email(job):
+    try:
+        get_client(Settings.get_instance().Queue.email_queue).publish(Settings.get_instance().Queue.email_queue, job)
+    except Exception:
+        logging.exception('Email job could not be queued, sending it directly')
+        deliver_new_account_email(job)
+
+
+def deliver_new_account_email(job):
+    settings = Settings.get_instance().Queue
+    for attempt in range(1, settings.email_attempts + 1):
+        try:
+            api_utils.send_new_account_email(job['email'], job['password'])
+            __record_status(job['email'], EmailStatus.SENT, attempt)
+            return True
+        except Exception:
+            logging.info(f'New account email attempt {attempt} failed!')
+            if attempt < settings.email_attempts:
+                __record_status(job['email'], EmailStatus.RETRYING, attempt)
+                time.sleep(settings.email_retry_delay * 2 ** (attempt - 1))
+    __record_status(job['email'], EmailStatus.FAILED, settings.email_attempts)
+    return False
+
+
+def handle_email_job(channel, method, properties, body):
+    try:
+        deliver_new_account_email(json.loads(body))
+    except (ValueError, KeyError):
+        logging.exception('Discarding malformed email job')
+    channel.basic_ack(delivery_tag=method.delivery_tag)
+
+
+def start_email_consumer():
+    get_client(Settings.get_instance().Queue.email_queue).start_consumer(handle_email_job)
+
+
+def get_email_status(email):
+    return SharedCache.get_instance().get(CacheNamespace.EMAIL_JOBS, email)
+
+
+def __record_status(email, status, attempts):
+    logging.info(f'New account email {status} after {attempts} attempt(s)')
+    entry = {'status': status, 'attempts': attempts}
+    SharedCache.get_instance().set(CacheNamespace.EMAIL_JOBS, email, entry, Settings.get_instance().Cache.email_status_ttl)
@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+import uuid
+from threading import Thread
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+from svc.constants.home_automation import CacheNamespace
+from svc.utilities import api_utils
+from svc.utilities.cache_utils import SharedCache, BackgroundRefresh
+
+
+def get_light_groups(api_key):
+    cached = SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, __cache_key())
+    if cached is None:
+        return _fetch_light_groups(api_key)
+    is_stale = time.time() - cached['fetched'] >= Settings.get_instance().Cache.light_group_ttl
+    if is_stale and BackgroundRefresh.get_instance().begin(CacheNamespace.LIGHT_GROUPS, __cache_key()):
+        Thread(target=_refresh_light_groups, args=(api_key, cached['version']), daemon=True).start()
+    return cached['groups']
+
+
+def set_light_groups(api_key, group_id, on, brightness):
+    try:
+        api_utils.set_light_groups(api_key, group_id, on, brightness)
+    except Exception:
+        invalidate_light_groups()
+        raise
+    with ProcessLightGroupWriteLock.get_instance():
+        cached = SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, __cache_key())
+        if cached is None:
+            return
+        for group in cached['groups']:
+            if str(group.get('groupId')) == str(group_id):
+                group['on'] = False if brightness == 0 else on
+                if brightness != 0 and brightness is not None:
+                    group['brightness'] = brightness
+        __store(cached['groups'], cached['fetched'])
+
+
+def set_light_state(api_key, light_id, brightness):
+    try:
+        api_utils.set_light_state(api_key, light_id, brightness)
+    finally:
+        invalidate_light_groups()
+
+
+def create_light_group(api_key, group_name):
+    try:
+        api_utils.create_light_group(api_key, group_name)
+    finally:
+        invalidate_light_groups()
+
+
+def delete_light_group(group_id):
+    try:
+        api_utils.delete_light_group(group_id)
+    finally:
+        invalidate_light_groups()
+
+
+def assign_light_group(api_key, group_id, light_id, name, switch_type):
+    try:
+        api_utils.assign_light_group(api_key, group_id, light_id, name, switch_type)
+    finally:
+        invalidate_light_groups()
+
+
+def invalidate_light_groups():
+    SharedCache.get_instance().invalidate(CacheNamespace.LIGHT_GROUPS, __cache_key())
+
+
+def _refresh_light_groups(api_key, version):
+    try:
+        groups = api_utils.get_light_groups(api_key)
+        with ProcessLightGroupWriteLock.get_instance():
+            cached = SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, __cache_key())
+            if cached is not None and cached['version'] == version:
+                __store(groups, time.time())
+    except Exception:
+        logging.info('Light group refresh failed!')
+    finally:
+        BackgroundRefresh.get_instance().end(CacheNamespace.LIGHT_GROUPS, __cache_key())
+
+
+def _fetch_light_groups(api_key):
+    groups = api_utils.get_light_groups(api_key)
+    __store(groups, time.time())
+    return groups
+
+
+@Singleton
+class ProcessLightGroupWriteLock:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._lock.release()
+
+
+def __store(groups, fetched):
+    entry = {'groups': groups, 'fetched': fetched, 'version': uuid.uuid4().hex}
+    SharedCache.get_instance().set(CacheNamespace.LIGHT_GROUPS, __cache_key(), entry, Settings.get_instance().Cache.light_group_stale_ttl)
+
+
+def __cache_key():
+    return Settings.get_instance().BaseUrls.lights
@@ -1,22 +1,66 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
 
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, Timeout
 
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import CacheNamespace
 from svc.utilities.api_utils import get_weather_by_city, get_forecast_by_coords
+from svc.utilities.cache_utils import SharedCache, BackgroundRefresh
 
 
 def get_weather(city, unit, app_id):
+    cached = SharedCache.get_instance().get(CacheNamespace.WEATHER, f'{city}:{unit}')
+    if cached is None:
+        return _fetch_weather(city, unit, app_id)
+    is_stale = time.time() - cached['fetched'] >= Settings.get_instance().Cache.weather_ttl
+    if is_stale and BackgroundRefresh.get_instance().begin(CacheNamespace.WEATHER, f'{city}:{unit}'):
+        Thread(target=_refresh_weather, args=(city, unit, app_id), daemon=True).start()
+    return cached['weather']
+
+
+def _refresh_weather(city, unit, app_id):
+    try:
+        _fetch_weather(city, unit, app_id)
+    finally:
+        BackgroundRefresh.get_instance().end(CacheNamespace.WEATHER, f'{city}:{unit}')
+
+
+def _fetch_weather(city, unit, app_id):
     weather = {}
     try:
-        weather = get_weather_by_city(city, unit, app_id)
-        forecast = get_forecast_by_coords(weather['coord'], unit, app_id)
+        coords = SharedCache.get_instance().get(CacheNamespace.COORDINATES, city)
+        if coords is None:
+            weather = get_weather_by_city(city, unit, app_id)
+            __cache_coordinates(city, weather['coord'])
+            forecast = get_forecast_by_coords(weather['coord'], unit, app_id)
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending_forecast = executor.submit(get_forecast_by_coords, coords, unit, app_id)
+                weather = get_weather_by_city(city, unit, app_id)
+                forecast = pending_forecast.result()
         daily_forecast = forecast['daily'][0]['temp']
-        return __build_response(weather, daily_forecast)
-    except (ConnectionError, KeyError, IndexError):
+        response = __build_response(weather, daily_forecast)
+        __cache_weather(city, unit, response)
+        return response
+    except (ConnectionError, Timeout, KeyError, IndexError):
         logging.info('Weather API connection error!')
         return __build_response(weather, {})
 
 
+def __cache_coordinates(city, coords):
+    ttl = Settings.get_instance().Cache.coordinates_ttl
+    SharedCache.get_instance().set(CacheNamespace.COORDINATES, city, {'lat': coords['lat'], 'lon': coords['lon']}, ttl)
+
+
+def __cache_weather(city, unit, response):
+    settings = Settings.get_instance().Cache
+    entry = {'weather': response, 'fetched': time.time()}
+    SharedCache.get_instance().set(CacheNamespace.WEATHER, f'{city}:{unit}', entry, settings.weather_stale_ttl)
+
+
 def __build_response(weather, daily_forecast):
     main = weather.get('main', {})
     current_temp = main.get('temp', 0.0)
@@ -1,17 +1,18 @@
 import json
 
-import requests
 from werkzeug.exceptions import FailedDependency, BadRequest, Unauthorized
 
 from svc.models.garage import GarageStatus, GarageState
-from svc.constants.home_automation import Mime
+from svc.constants.home_automation import Mime, Dependency
 from svc.config.settings_state import Settings
+from svc.utilities.circuit_breaker_utils import CircuitBreakers
+from svc.utilities.http_session_utils import get_session
 
 
 def get_weather_by_city(city, unit, app_id):
     args = {'q': city, 'units': unit, 'APPID': app_id}
     base_url = Settings.get_instance().BaseUrls.weather
-    response = requests.get(f'{base_url}/weather', params=args)
+    response = get_session(Dependency.WEATHER).get(f'{base_url}/weather', params=args)
     __validate_response(response)
     return response.json()
 
@@ -19,7 +20,7 @@ def get_weather_by_city(city, unit, app_id):
 def get_forecast_by_coords(coords, unit, app_id):
     args = {'lat': coords['lat'], 'lon': coords['lon'], 'units': unit, 'appid': app_id, 'exclude': 'alerts,current,hourly,minutely'}
     base_url = Settings.get_instance().BaseUrls.weather
-    response = requests.get(f'{base_url}/onecall', params=args)
+    response = get_session(Dependency.WEATHER).get(f'{base_url}/onecall', params=args)
     __validate_response(response)
     return response.json()
 
@@ -27,7 +28,7 @@ def get_forecast_by_coords(coords, unit, app_id):
 def get_garage_door_status(bearer_token, base_url, garage_id):
     header = {'Authorization': f'Bearer {bearer_token}'}
     try:
-        response = requests.get(f'{base_url}/garageDoor/{garage_id}/status', headers=header, timeout=5)
+        response = __send(Dependency.GARAGE, base_url, 'get', f'{base_url}/garageDoor/{garage_id}/status', headers=header, timeout=5)
     except Exception:
         raise FailedDependency()
     __validate_garage_response(response)
@@ -37,7 +38,7 @@ def get_garage_door_status(bearer_token, base_url, garage_id):
 def toggle_garage_door_state(bearer_token, base_url, garage_id):
     header = {'Authorization': f'Bearer {bearer_token}'}
     try:
-        response = requests.get(f'{base_url}/garageDoor/{garage_id}/toggle', headers=header, timeout=5)
+        response = __send(Dependency.GARAGE, base_url, 'get', f'{base_url}/garageDoor/{garage_id}/toggle', headers=header, timeout=5)
     except Exception:
         raise BadRequest(description='Garage node returned a failure')
     __validate_garage_response(response)
@@ -46,7 +47,7 @@ def toggle_garage_door_state(bearer_token, base_url, garage_id):
 def update_garage_door_state(bearer_token, base_url, garage_id, request):
     header = {'Authorization': f'Bearer {bearer_token}'}
     try:
-        response = requests.post(f'{base_url}/garageDoor/{garage_id}/state', headers=header, data=request, timeout=5)
+        response = __send(Dependency.GARAGE, base_url, 'post', f'{base_url}/garageDoor/{garage_id}/state', headers=header, data=request, timeout=5)
     except Exception:
         raise BadRequest(description='Garage node returned a failure')
     __validate_garage_response(response)
@@ -56,7 +57,7 @@ def update_garage_door_state(bearer_token, base_url, garage_id, request):
 def get_light_groups(api_key):
     base_url = Settings.get_instance().BaseUrls.lights
     try:
-        response = requests.get(f'{base_url}/groups', headers={'LightApiKey': api_key}, timeout=10)
+        response = __send(Dependency.LIGHTS, base_url, 'get', f'{base_url}/groups', headers={'LightApiKey': api_key}, timeout=10)
     except Exception:
         raise FailedDependency()
     __validate_response(response)
@@ -71,20 +72,20 @@ def set_light_groups(api_key, group_id, on, brightness):
         request['brightness'] = brightness
 
     __validate_response(
-        requests.post(f'{base_url}/group/state', data=json.dumps(request), headers={'LightApiKey': api_key}))
+        __send(Dependency.LIGHTS, base_url, 'post', f'{base_url}/group/state', data=json.dumps(request), headers={'LightApiKey': api_key}))
 
 
 def create_light_group(api_key, group_name):
     base_url = Settings.get_instance().BaseUrls.lights
 
     request = {'name': group_name}
-    requests.post(f'{base_url}/group/create', data=json.dumps(request), headers={'LightApiKey': api_key})
+    __send(Dependency.LIGHTS, base_url, 'post', f'{base_url}/group/create', data=json.dumps(request), headers={'LightApiKey': api_key})
 
 
 def delete_light_group(group_id):
     base_url = Settings.get_instance().BaseUrls.lights
 
-    requests.delete(f'{base_url}/group/{group_id}')
+    __send(Dependency.LIGHTS, base_url, 'delete', f'{base_url}/group/{group_id}')
 
 
 def set_light_state(api_key, light_id, brightness):
@@ -94,14 +95,14 @@ def set_light_state(api_key, light_id, brightness):
     # if brightness != 0:
     #     request['brightness'] = brightness
 
-    __validate_response(requests.post(f'{base_url}/light/state', data=json.dumps(request), headers={'LightApiKey': api_key}))
+    __validate_response(__send(Dependency.LIGHTS, base_url, 'post', f'{base_url}/light/state', data=json.dumps(request), headers={'LightApiKey': api_key}))
 
 
 def get_unregistered_lights(api_key):
     base_url = Settings.get_instance().BaseUrls.lights
 
     try:
-        response = requests.get(f'{base_url}/unregistered', headers={'LightApiKey': api_key}, timeout=10)
+        response = __send(Dependency.LIGHTS, base_url, 'get', f'{base_url}/unregistered', headers={'LightApiKey': api_key}, timeout=10)
         __validate_response(response)
         return response.json()
     except Exception:
@@ -112,7 +113,7 @@ def assign_light_group(api_key, group_id, light_id, name, switch_type):
     base_url = Settings.get_instance().BaseUrls.lights
 
     request = {'name': name, 'groupId': group_id, 'lightId': light_id, 'switchTypeId': switch_type}
-    requests.post(f'{base_url}/group/assign', data=json.dumps(request), headers={'LightApiKey': api_key})
+    __send(Dependency.LIGHTS, base_url, 'post', f'{base_url}/group/assign', data=json.dumps(request), headers={'LightApiKey': api_key})
 
 
 def send_new_account_email(email, password):
@@ -127,7 +128,23 @@ def send_new_account_email(email, password):
         'subject': 'Home Automation: New Account Registration',
         'htmlContent': f'<html><head></head><body><p>Hello,</p><p>A new Home Automation account has been setup for you.</p><p>Password: {password}</p></body></html>'
     }
-    requests.post(settings.BaseUrls.email, data=json.dumps(request), headers=headers)
+    response = get_session(Dependency.EMAIL).post(settings.BaseUrls.email, data=json.dumps(request), headers=headers)
+    __validate_response(response)
+
+
+def __send(dependency, base_url, method, url, **kwargs):
+    breaker = CircuitBreakers.get_instance().get(dependency, base_url)
+    breaker.before_call()
+    try:
+        response = getattr(get_session(dependency), method)(url, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
 
 
 def __validate_response(response):
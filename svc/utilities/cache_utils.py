@@ -0,0 +1,163 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+
+try:
+    import uwsgi
+except ImportError:
+    uwsgi = None
+
+
+class TtlCache:
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+@Singleton
+class TokenCache(TtlCache):
+
+    def __init__(self):
+        settings = Settings.get_instance().Cache
+        super().__init__(settings.token_max_size, settings.default_ttl)
+        self.secret = None
+
+    def is_verified(self, token_digest, secret):
+        if secret != self.secret:
+            self.clear()
+            self.secret = secret
+            return False
+        return self.get(token_digest) is not None
+
+    def add(self, token_digest, expiration, secret):
+        if secret != self.secret:
+            return
+        ttl = self.ttl if expiration is None else expiration - time.time()
+        if ttl > 0:
+            self.set(token_digest, True, ttl)
+
+
+@Singleton
+class BackgroundRefresh:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = set()
+
+    def begin(self, namespace, key):
+        with self._lock:
+            if (namespace, key) in self._in_flight:
+                return False
+            self._in_flight.add((namespace, key))
+            return True
+
+    def end(self, namespace, key):
+        with self._lock:
+            self._in_flight.discard((namespace, key))
+
+    def clear(self):
+        with self._lock:
+            self._in_flight.clear()
+
+
+class UwsgiCache:
+
+    def __init__(self, cache_name):
+        self.cache_name = cache_name
+
+    def get(self, key):
+        payload = uwsgi.cache_get(key, self.cache_name)
+        if payload is None:
+            return None
+        expires, value = payload.split(b'|', 1)
+        return value if float(expires) > time.time() else None
+
+    def set(self, key, value, ttl):
+        payload = f'{time.time() + ttl}|'.encode('UTF-8') + value
+        if not uwsgi.cache_update(key, payload, int(ttl) + 1, self.cache_name):
+            logging.warning(f'uWSGI cache {self.cache_name} rejected {key} ({len(payload)} bytes), it will not be cached')
+            uwsgi.cache_del(key, self.cache_name)
+
+    def invalidate(self, key):
+        uwsgi.cache_del(key, self.cache_name)
+
+    def clear(self):
+        uwsgi.cache_clear(self.cache_name)
+
+
+@Singleton
+class SharedCache:
+
+    def __init__(self):
+        settings = Settings.get_instance().Cache
+        self.backend_name = 'uwsgi' if uwsgi is not None else 'local'
+        self._backend = UwsgiCache(settings.name) if uwsgi is not None else TtlCache(settings.max_size, settings.default_ttl)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def get(self, namespace, key):
+        payload = self._backend.get(f'{namespace}:{key}')
+        self.__record(namespace, 'hits' if payload is not None else 'misses')
+        return None if payload is None else json.loads(payload)
+
+    def set(self, namespace, key, value, ttl):
+        self._backend.set(f'{namespace}:{key}', json.dumps(value).encode('UTF-8'), ttl)
+
+    def invalidate(self, namespace, key):
+        self._backend.invalidate(f'{namespace}:{key}')
+
+    def clear(self):
+        self._backend.clear()
+        with self._lock:
+            self._stats = {}
+
+    def get_stats(self):
+        with self._lock:
+            return {'backend': self.backend_name, **{namespace: dict(counts) for namespace, counts in self._stats.items()}}
+
+    def __record(self, namespace, counter):
+        with self._lock:
+            counts = self._stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+            counts[counter] += 1
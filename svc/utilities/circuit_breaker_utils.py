@@ -0,0 +1,79 @@
+import threading
+import time
+
+from werkzeug.exceptions import FailedDependency
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+
+
+class CircuitOpen(FailedDependency):
+    description = 'Dependency is unavailable and is not being called until it recovers.'
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, open_seconds):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state = self.HALF_OPEN
+                return
+            if self.state != self.CLOSED:
+                self.rejected += 1
+                raise CircuitOpen()
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def get_stats(self):
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures, 'rejected': self.rejected}
+
+
+@Singleton
+class CircuitBreakers:
+
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, dependency, base_url):
+        key = f'{dependency}:{base_url}'
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                settings = Settings.get_instance().Http
+                breaker = CircuitBreaker(settings.failure_threshold, settings.open_seconds)
+                self._breakers[key] = breaker
+            return breaker
+
+    def get_stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.get_stats() for key, breaker in breakers.items()}
+
+    def reset(self):
+        with self._lock:
+            self._breakers = {}
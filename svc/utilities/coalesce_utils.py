@@ -0,0 +1,93 @@
+import logging
+import threading
+from concurrent.futures import Future
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+
+
+class Coalescer:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._busy = set()
+        self._submitted = 0
+        self._applied = 0
+
+    def submit(self, key, window, function, *args):
+        with self._lock:
+            self._submitted += 1
+            if key in self._pending:
+                self._pending[key].update(function=function, args=args, window=window)
+                return self._pending[key]['future']
+            entry = {'future': Future(), 'function': function, 'args': args, 'window': window}
+            if key in self._busy:
+                self._pending[key] = entry
+                return entry['future']
+            if window > 0:
+                self._pending[key] = entry
+                self.__start_timer(key, window)
+                return entry['future']
+            self._busy.add(key)
+        self.__apply(key, entry)
+        return entry['future']
+
+    def get_stats(self):
+        with self._lock:
+            return {'submitted': self._submitted, 'applied': self._applied, 'pending': len(self._pending)}
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._busy.clear()
+            self._submitted = 0
+            self._applied = 0
+
+    def __flush(self, key):
+        with self._lock:
+            if key in self._busy or key not in self._pending:
+                return
+            entry = self._pending.pop(key)
+            self._busy.add(key)
+        self.__apply(key, entry)
+
+    def __apply(self, key, entry):
+        while entry is not None:
+            with self._lock:
+                self._applied += 1
+            try:
+                entry['future'].set_result(entry['function'](*entry['args']))
+            except BaseException as error:
+                logging.info('Coalesced update failed!')
+                entry['future'].set_exception(error)
+            with self._lock:
+                entry = self.__next_entry(key)
+
+    def __next_entry(self, key):
+        entry = self._pending.get(key)
+        if entry is not None and entry['window'] <= 0:
+            return self._pending.pop(key)
+        self._busy.discard(key)
+        if entry is not None:
+            self.__start_timer(key, entry['window'])
+        return None
+
+    def __start_timer(self, key, window):
+        timer = threading.Timer(window, self.__flush, args=(key,))
+        timer.daemon = True
+        timer.start()
+
+
+@Singleton
+class LightStateCoalescer(Coalescer):
+
+    def set_group(self, function, api_key, group_id, on, brightness, window=None):
+        return self.submit(('group', str(group_id)), self.__window(window), function, api_key, group_id, on, brightness)
+
+    def set_light(self, function, api_key, light_id, brightness, window=None):
+        return self.submit(('light', str(light_id)), self.__window(window), function, api_key, light_id, brightness)
+
+    @staticmethod
+    def __window(window):
+        return Settings.get_instance().Http.coalesce_window if window is None else window
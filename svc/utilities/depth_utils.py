@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 SPEED_OF_SOUND = 34300
 
 
@@ -8,3 +10,21 @@ def get_depth_by_intervals(start, stop):
     distance = (interval * SPEED_OF_SOUND) / 2
 
     return distance
+
+
+def downsample_depths(readings, start, end, points):
+    span = (end - start).total_seconds() / points
+    buckets = {}
+    for create_date, distance in readings:
+        index = min(max(int((create_date - start).total_seconds() / span), 0), points - 1)
+        distance = float(distance)
+        bucket = buckets.get(index)
+        if bucket is None:
+            buckets[index] = [distance, distance, distance, 1]
+        else:
+            bucket[0] = min(bucket[0], distance)
+            bucket[1] = max(bucket[1], distance)
+            bucket[2] += distance
+            bucket[3] += 1
+    return [{'date': start + timedelta(seconds=span * index), 'minDepth': low, 'maxDepth': high, 'averageDepth': total / count, 'count': count}
+            for index, (low, high, total, count) in sorted(buckets.items())]
@@ -0,0 +1,61 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+
+
+def get_session(dependency):
+    return HttpSessions.get_instance().get(dependency)
+
+
+class TimeoutSession(requests.Session):
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+@Singleton
+class HttpSessions:
+
+    def __init__(self):
+        self._sessions = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self, dependency):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._sessions = {}
+                self._pid = os.getpid()
+            session = self._sessions.get(dependency)
+            if session is None:
+                session = self.__create_session(dependency)
+                self._sessions[dependency] = session
+            return session
+
+    def reset(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                for session in self._sessions.values():
+                    session.close()
+            self._sessions = {}
+            self._pid = None
+
+    @staticmethod
+    def __create_session(dependency):
+        settings = Settings.get_instance().Http
+        session = TimeoutSession(settings.timeout(dependency))
+        adapter = HTTPAdapter(pool_connections=settings.pool_connections, pool_maxsize=settings.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
@@ -1,3 +1,4 @@
+import hashlib
 import uuid
 from datetime import timedelta, datetime
 
@@ -7,12 +8,20 @@ from jwt import DecodeError, ExpiredSignatureError, InvalidSignatureError
 from werkzeug.exceptions import Unauthorized
 
 from svc.config.settings_state import Settings
+from svc.utilities.cache_utils import TokenCache
 
 
 def is_jwt_valid(jwt_token):
     if jwt_token is None:
         raise Unauthorized
-    _parse_jwt_token(jwt_token)
+    stripped_token = jwt_token.replace('Bearer ', '')
+    secret = Settings.get_instance().jwt_secret
+    cache = TokenCache.get_instance()
+    token_digest = hashlib.sha256(stripped_token.encode('UTF-8')).hexdigest()
+    if cache.is_verified(token_digest, secret):
+        return
+    claims = _parse_jwt_token(stripped_token, secret)
+    cache.add(token_digest, claims.get('exp'), secret)
 
 
 def create_jwt_token(user_info, refresh_token):
@@ -27,10 +36,8 @@ def generate_refresh_token():
     return str(uuid.uuid4())
 
 
-def _parse_jwt_token(jwt_token):
+def _parse_jwt_token(stripped_token, secret):
     try:
-        stripped_token = jwt_token.replace('Bearer ', '')
-        settings = Settings.get_instance()
-        jwt.decode(stripped_token, settings.jwt_secret, algorithms=["HS256"])
+        return jwt.decode(stripped_token, secret, algorithms=["HS256"])
     except (InvalidSignatureError, ExpiredSignatureError, DecodeError, KeyError) as er:
         raise Unauthorized
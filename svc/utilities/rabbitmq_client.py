@@ -1,82 +1,262 @@
 import json
+import logging
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import pika
 
 from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
 from utilities.event_client import MyThread
 
 
+def get_client(queue_name):
+    return RabbitMQClients.get_instance().get(queue_name)
+
+
 class RabbitMQClient:
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, queue_name: str = 'my_queue', connection_factory=None):
         self.settings = settings.Queue
-        self.queue_name = 'my_queue'
+        self.queue_name = queue_name
         self.exchange = 'home_automation'
+        self._connection_factory = connection_factory
         self._connection = None
         self._channel = None
+        self._consumer_pool = None
+        self._publisher = None
+        self._publisher_channel = None
+        self._publisher_bindings = set()
+        self._returned = []
+        self._publish_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._consuming = False
 
     def publish(self, routing_key: str, payload: dict, persistent: bool = False):
-        try:
-            connection = self._open_connection()
-        except Exception as exc:
-            raise Exception(f'Broker Unavailable: \n {str(exc)}')
-        try:
-            channel = connection.channel()
-            channel.exchange_declare(exchange=self.exchange, exchange_type='direct', durable=False)
-            body = json.dumps(payload).encode('utf-8')
-            props = pika.BasicProperties(content_type='application/json', delivery_mode=2 if persistent else 1)
-            channel.basic_publish(exchange=self.exchange, routing_key=routing_key, body=body, properties=props)
-        finally:
-            self._close(connection)
+        self.publish_batch(routing_key, [payload], persistent)
 
-    def start_consumer(self, worker_function):
+    def publish_batch(self, routing_key: str, payloads: list, persistent: bool = False):
+        props = pika.BasicProperties(content_type='application/json', delivery_mode=2 if persistent else 1)
+        bodies = [json.dumps(payload).encode('utf-8') for payload in payloads]
+        with self._publish_lock:
+            try:
+                self.__publish_bodies(routing_key, bodies, props)
+            except Exception:
+                self.__close_publisher()
+                try:
+                    self.__publish_bodies(routing_key, bodies, props)
+                except Exception as exc:
+                    self.__close_publisher()
+                    raise Exception(f'Broker Unavailable: \n {str(exc)}')
+
+    def close_publisher(self):
+        with self._publish_lock:
+            self.__close_publisher()
+
+    def start_consumer(self, worker_function, routing_keys=None):
+        self._stopping.clear()
         t = MyThread.get_instance()
-        bound_worker = partial(self._consume, worker_function)
+        bound_worker = partial(self._consume, worker_function, routing_keys)
         t.initialize(bound_worker)
         t.start()
 
     def stop_consumer(self):
-        if not self._connection or not self._channel:
+        self._stopping.set()
+        connection = self._connection
+        channel = self._channel
+        if connection is None or channel is None:
             return
 
         try:
-            self._connection.add_callback_threadsafe(lambda: self._channel.stop_consuming())
+            connection.add_callback_threadsafe(lambda: channel.stop_consuming())
         except Exception:
             try:
-                self._connection.add_callback_threadsafe(lambda: self._connection.close())
+                connection.add_callback_threadsafe(lambda: connection.close())
             except Exception:
                 pass
 
         t = MyThread.get_instance()
         t.stop()
         try:
-            t.join(5)
+            t.join(self.settings.drain_seconds + 5)
         except RuntimeError:
             pass
 
     def _open_connection(self):
+        if self._connection_factory is not None:
+            return self._connection_factory()
         credentials = pika.PlainCredentials(self.settings.user_name, self.settings.password)
         params = pika.ConnectionParameters(host=self.settings.host, port=self.settings.port,
                                            virtual_host=self.settings.vhost, credentials=credentials, socket_timeout=2)
         return pika.BlockingConnection(params)
 
-    def _consume(self, worker_function):
-        try:
-            self._connection = self._open_connection()
-        except Exception as exc:
-            raise Exception(f'Broker Unavailable: \n {str(exc)}')
+    def _consume(self, worker_function, routing_keys=None):
+        delay = self.settings.reconnect_delay
+        while not self._stopping.is_set():
+            self._consuming = False
+            try:
+                self.__consume_connection(worker_function, routing_keys)
+            except Exception:
+                logging.exception('Consumer lost its broker connection')
+            if self._consuming:
+                delay = self.settings.reconnect_delay
+            if not self._stopping.is_set():
+                logging.info(f'Reconnecting consumer in {delay} seconds')
+                self._stopping.wait(delay)
+                delay = min(delay * 2, self.settings.max_reconnect_delay)
+
+    def __consume_connection(self, worker_function, routing_keys):
+        self._connection = self._open_connection()
         try:
             self._channel = self._connection.channel()
-            self._channel.basic_consume(queue=self.queue_name, on_message_callback=worker_function, auto_ack=False)
+            self._channel.exchange_declare(exchange=self.exchange, exchange_type='direct', durable=False)
+            self._channel.queue_declare(queue=self.queue_name, durable=True)
+            for routing_key in routing_keys or [self.queue_name]:
+                self._channel.queue_bind(queue=self.queue_name, exchange=self.exchange, routing_key=routing_key)
+            self._channel.basic_qos(prefetch_count=self.settings.prefetch_count)
+            self._consumer_pool = ConsumerPool(self._connection, self._channel, worker_function,
+                                               self.settings.consumer_workers, self.settings.ordered_consumer)
+            self._channel.basic_consume(queue=self.queue_name, on_message_callback=self._consumer_pool.dispatch, auto_ack=False)
+            self._consuming = True
             self._channel.start_consuming()
+            self._consumer_pool.drain(self.settings.drain_seconds)
         finally:
+            if self._consumer_pool is not None:
+                self._consumer_pool.shutdown()
             self._close()
             self._connection = None
             self._channel = None
+            self._consumer_pool = None
+
+    def __publish_bodies(self, routing_key, bodies, props):
+        channel = self.__get_publisher_channel(routing_key)
+        self._returned = []
+        for body in bodies:
+            channel.basic_publish(exchange=self.exchange, routing_key=routing_key, body=body, properties=props, mandatory=True)
+        channel.tx_commit()
+        self._publisher.process_data_events(time_limit=0)
+        if self._returned:
+            raise Exception(f'{len(self._returned)} message(s) to {routing_key} were returned as unroutable')
+
+    def __get_publisher_channel(self, routing_key):
+        if self._publisher is None or self._publisher.is_closed or self._publisher_channel.is_closed:
+            self.__close_publisher()
+            self._publisher = self._open_connection()
+            self._publisher_channel = self._publisher.channel()
+            self._publisher_channel.exchange_declare(exchange=self.exchange, exchange_type='direct', durable=False)
+            self._publisher_channel.queue_declare(queue=self.queue_name, durable=True)
+            self._publisher_channel.add_on_return_callback(self.__on_returned)
+            self._publisher_channel.tx_select()
+        if routing_key not in self._publisher_bindings:
+            self._publisher_channel.queue_bind(queue=self.queue_name, exchange=self.exchange, routing_key=routing_key)
+            self._publisher_bindings.add(routing_key)
+        return self._publisher_channel
+
+    def __on_returned(self, channel, method, properties, body):
+        self._returned.append(method.routing_key)
+
+    def __close_publisher(self):
+        if self._publisher is not None:
+            self._close(self._publisher)
+        self._publisher = None
+        self._publisher_channel = None
+        self._publisher_bindings = set()
 
     def _close(self, connection=None):
         try:
             connection.close() if connection else self._connection.close()
         except Exception:
             pass
+
+
+class ConsumerPool:
+
+    def __init__(self, connection, channel, worker_function, workers, ordered):
+        self._connection = connection
+        self._channel = ThreadsafeChannel(connection, channel)
+        self._worker_function = worker_function
+        self._lanes = [ThreadPoolExecutor(max_workers=1, thread_name_prefix='consumer') for _ in range(workers)] if ordered \
+            else [ThreadPoolExecutor(max_workers=workers, thread_name_prefix='consumer')]
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self):
+        with self._condition:
+            return self._in_flight
+
+    def dispatch(self, channel, method, properties, body):
+        with self._condition:
+            self._in_flight += 1
+        lane = self._lanes[zlib.crc32(method.routing_key.encode('utf-8')) % len(self._lanes)]
+        lane.submit(self.__run, method, properties, body)
+
+    def drain(self, timeout):
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            self._connection.process_data_events(time_limit=0.05)
+        self._connection.process_data_events(time_limit=0)
+        if self.in_flight:
+            logging.warning(f'Consumer stopped with {self.in_flight} message(s) still in flight')
+
+    def shutdown(self):
+        for lane in self._lanes:
+            lane.shutdown(wait=False)
+
+    def __run(self, method, properties, body):
+        try:
+            self._worker_function(self._channel, method, properties, body)
+        except Exception:
+            logging.exception('Consumer worker failed')
+            self._channel.basic_nack(delivery_tag=method.delivery_tag, requeue=not method.redelivered)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+
+
+class ThreadsafeChannel:
+
+    def __init__(self, connection, channel):
+        self._connection = connection
+        self._channel = channel
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        self.__call_on_connection_thread(self._channel.basic_ack, delivery_tag=delivery_tag, multiple=multiple)
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        self.__call_on_connection_thread(self._channel.basic_nack, delivery_tag=delivery_tag, multiple=multiple, requeue=requeue)
+
+    def __call_on_connection_thread(self, function, **kwargs):
+        try:
+            self._connection.add_callback_threadsafe(partial(function, **kwargs))
+        except Exception:
+            logging.warning('Connection closed before the message was settled, it will be redelivered')
+
+
+@Singleton
+class RabbitMQClients:
+
+    def __init__(self):
+        self._clients = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self, queue_name):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._clients = {}
+                self._pid = os.getpid()
+            client = self._clients.get(queue_name)
+            if client is None:
+                client = RabbitMQClient(Settings.get_instance(), queue_name)
+                self._clients[queue_name] = client
+            return client
+
+    def reset(self):
+        with self._lock:
+            self._clients = {}
+            self._pid = None
@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import Future
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+from svc.utilities.cache_utils import TtlCache
+
+
+class SingleFlight:
+
+    def __init__(self, max_size):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._generations = {}
+        self._results = TtlCache(max_size, 0)
+
+    def do(self, key, ttl, function, *args):
+        with self._lock:
+            result = self._results.get(key) if ttl > 0 else None
+            if result is not None:
+                return result
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+                generation = self._generations.get(key, 0)
+        if is_leader:
+            self.__call(key, ttl, generation, future, function, args)
+        return future.result()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._in_flight.pop(key, None)
+            self._results.invalidate(key)
+
+    def clear(self):
+        with self._lock:
+            self._in_flight.clear()
+            self._generations.clear()
+            self._results.clear()
+
+    def __call(self, key, ttl, generation, future, function, args):
+        try:
+            result = function(*args)
+        except BaseException as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if ttl > 0 and not future.exception() and self._generations.get(key, 0) == generation:
+                self._results.set(key, future.result(), ttl)
+
+
+@Singleton
+class GarageStatusFlight(SingleFlight):
+
+    def __init__(self):
+        super().__init__(Settings.get_instance().Cache.max_size)
+
+    def get_status(self, base_url, garage_id, function, *args):
+        ttl = Settings.get_instance().Cache.garage_status_ttl
+        return self.do((base_url, str(garage_id)), ttl, function, *args)
+
+    def invalidate_door(self, base_url, garage_id):
+        self.invalidate((base_url, str(garage_id)))
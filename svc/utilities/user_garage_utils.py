@@ -1,7 +1,24 @@
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import CacheNamespace
 from svc.db.methods.user_credentials import UserDatabaseManager
+from svc.utilities.cache_utils import SharedCache
 
 
 def get_garage_url_by_user(user_id):
+    base_url = SharedCache.get_instance().get(CacheNamespace.GARAGE_URLS, user_id)
+    if base_url is not None:
+        return base_url
     with UserDatabaseManager() as database:
-        ip = database.get_user_garage_ip(user_id)
-        return f'http://{ip}'
+        return __load_garage_url(database, user_id)
+
+
+def read_garage_url(database, user_id):
+    base_url = SharedCache.get_instance().get(CacheNamespace.GARAGE_URLS, user_id)
+    return base_url if base_url is not None else __load_garage_url(database, user_id)
+
+
+def __load_garage_url(database, user_id):
+    ip = database.get_user_garage_ip(user_id)
+    base_url = f'http://{ip}'
+    SharedCache.get_instance().set(CacheNamespace.GARAGE_URLS, user_id, base_url, Settings.get_instance().Cache.garage_url_ttl)
+    return base_url
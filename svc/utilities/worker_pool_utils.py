@@ -0,0 +1,37 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from svc.config.settings_state import Settings
+from svc.config.singleton import Singleton
+
+
+def submit(function, *args, **kwargs):
+    return WorkerPool.get_instance().submit(function, *args, **kwargs)
+
+
+@Singleton
+class WorkerPool:
+
+    def __init__(self):
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, **kwargs):
+        return self.__get_executor().submit(function, *args, **kwargs)
+
+    def reset(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._pid = None
+
+    def __get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                max_workers = Settings.get_instance().Http.max_workers
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='worker-pool')
+                self._pid = os.getpid()
+            return self._executor
@@ -4,9 +4,11 @@ import uuid
 import pytest
 import pytz
 from mock import patch
+from sqlalchemy import event
 from werkzeug.exceptions import BadRequest, Unauthorized, Forbidden
 
-from svc.db.methods.user_credentials import UserDatabaseManager
+from svc.db.engine import DatabaseEngine
+from svc.db.methods.user_credentials import UserDatabase, UserDatabaseManager
 from svc.db.models.user_information_model import UserInformation, DailySumpPumpLevel, AverageSumpPumpLevel, \
     UserCredentials, Roles, UserPreference, UserRoles, RoleDevices, RoleDeviceNodes, ChildAccounts, ScheduleTasks, \
     ScheduledTaskTypes, Scenes, SceneDetails, RefreshToken
@@ -467,7 +469,7 @@ class TestDbSumpIntegration:
         self.FIRST_SUMP_DAILY = DailySumpPumpLevel(id=88, distance=11.0, user_id=self.FIRST_USER_ID, warning_level=2, create_date=self.DATE)
         self.SECOND_SUMP_DAILY = DailySumpPumpLevel(id=99, distance=self.DEPTH, user_id=self.SECOND_USER_ID, warning_level=1, create_date=self.DATE)
         self.THIRD_SUMP_DAILY = DailySumpPumpLevel(id=100, distance=12.0, user_id=self.SECOND_USER_ID, warning_level=2, create_date=self.DATE)
-        self.FIRST_SUMP_AVG = AverageSumpPumpLevel(id=34, user_id=self.FIRST_USER_ID, distance=12.0, create_day=self.DAY)
+        self.FIRST_SUMP_AVG = AverageSumpPumpLevel(id=34, user_id=self.FIRST_USER_ID, distance=12.0, create_day=self.DAY - datetime.timedelta(days=1))
         self.SECOND_SUMP_AVG = AverageSumpPumpLevel(id=35, user_id=self.FIRST_USER_ID, distance=self.DEPTH, create_day=self.DAY)
         self.CHILD_ACCOUNT = ChildAccounts(parent_user_id=self.FIRST_USER_ID, child_user_id=self.CHILD_USER_ID)
 
@@ -920,6 +922,50 @@ class TestUserDuplication:
 
             assert actual == [{'user_name': 'Steve Rogers', 'user_id': self.CHILD_USER_ID, 'roles': []}]
 
+    def test_create_child_account__should_issue_same_statements_regardless_of_child_count(self, mock_uuid):
+        mock_uuid.uuid4.side_effect = uuid.uuid4
+        connection = DatabaseEngine.get_instance().connect()
+        session = DatabaseEngine.get_instance().session_factory(bind=connection)
+        database = UserDatabase(session)
+        statements = []
+        event.listen(connection, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        try:
+            counts = []
+            for index in range(5):
+                statements.clear()
+                database.create_child_account(self.USER_ID, f'child{index}@stark.com', [self.ROLE_NAME], self.PASSWORD)
+                counts.append(len(statements))
+
+            assert len(database.get_user_child_accounts(self.USER_ID)) == 5
+            assert len(set(counts[1:])) == 1
+        finally:
+            session.rollback()
+            session.close()
+            connection.close()
+
+    def test_get_user_child_accounts__should_issue_same_statements_regardless_of_child_count(self, mock_uuid):
+        mock_uuid.uuid4.side_effect = uuid.uuid4
+        connection = DatabaseEngine.get_instance().connect()
+        session = DatabaseEngine.get_instance().session_factory(bind=connection)
+        database = UserDatabase(session)
+        statements = []
+        event.listen(connection, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        try:
+            counts = []
+            for index in range(5):
+                database.create_child_account(self.USER_ID, f'child{index}@stark.com', [self.ROLE_NAME], self.PASSWORD)
+                session.flush()
+                session.expire_all()
+                statements.clear()
+                database.get_user_child_accounts(self.USER_ID)
+                counts.append(len(statements))
+
+            assert counts == [2] * 5
+        finally:
+            session.rollback()
+            session.close()
+            connection.close()
+
     def test_delete_child_user_account__should_remove_existing_child_account(self, mock_uuid):
         user = UserInformation(id=self.CHILD_USER_ID, first_name='Steve', last_name='Rogers')
         with UserDatabaseManager() as database:
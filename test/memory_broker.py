@@ -0,0 +1,303 @@
+import itertools
+import threading
+import time
+from collections import deque
+from functools import partial
+
+import pika
+from pika.exceptions import AMQPConnectionError, ChannelWrongStateError, ConnectionWrongStateError
+
+
+class MemoryBroker:
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.available = True
+        self.condition = threading.Condition()
+        self.exchanges = {}
+        self.queues = {}
+        self.bindings = {}
+        self.connections = []
+        self.stats = {'connections': 0, 'channels': 0, 'declarations': 0, 'published': 0, 'commits': 0, 'acked': 0, 'nacked': 0}
+
+    def connect(self, *args, **kwargs):
+        self.round_trip()
+        with self.condition:
+            if not self.available:
+                raise AMQPConnectionError('Memory broker unavailable')
+            connection = MemoryConnection(self)
+            self.connections.append(connection)
+            self.stats['connections'] += 1
+            return connection
+
+    def disconnect_all(self):
+        for connection in list(self.connections):
+            connection.close()
+
+    def queue_depth(self, queue):
+        with self.condition:
+            return len(self.queues.get(queue, ()))
+
+    def round_trip(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def route(self, exchange, routing_key, message):
+        with self.condition:
+            if exchange not in self.exchanges and exchange != '':
+                return False
+            targets = [queue for queue, keys in self.bindings.items() if (exchange, routing_key) in keys]
+            if exchange == '' and routing_key in self.queues:
+                targets = [routing_key]
+            for queue in targets:
+                self.queues[queue].append(message)
+            self.stats['published'] += 1
+            self.condition.notify_all()
+            return bool(targets)
+
+
+class MemoryConnection:
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_open = True
+        self._channels = []
+        self._callbacks = deque()
+        self._channel_ids = itertools.count(1)
+
+    @property
+    def is_closed(self):
+        return not self.is_open
+
+    def channel(self):
+        self.__check_open()
+        self.broker.round_trip()
+        channel = MemoryChannel(self, next(self._channel_ids))
+        with self.broker.condition:
+            self._channels.append(channel)
+            self.broker.stats['channels'] += 1
+        return channel
+
+    def add_callback_threadsafe(self, callback):
+        self.__check_open()
+        with self.broker.condition:
+            self._callbacks.append(callback)
+            self.broker.condition.notify_all()
+
+    def process_data_events(self, time_limit=0):
+        self.__check_open()
+        deadline = time.monotonic() + (time_limit or 0)
+        while True:
+            work = self.__next_work(max(deadline - time.monotonic(), 0))
+            if work is None:
+                return
+            work()
+
+    def sleep(self, duration):
+        self.process_data_events(duration)
+
+    def close(self):
+        with self.broker.condition:
+            if not self.is_open:
+                return
+            self.is_open = False
+            channels = list(self._channels)
+            if self in self.broker.connections:
+                self.broker.connections.remove(self)
+        for channel in channels:
+            channel.close()
+        with self.broker.condition:
+            self.broker.condition.notify_all()
+
+    def run_until_stopped(self, channel):
+        while self.is_open and channel.consuming:
+            work = self.__next_work(0.05, channel)
+            if work is not None:
+                work()
+
+    def __next_work(self, timeout, stopping_channel=None):
+        condition = self.broker.condition
+        with condition:
+            end = time.monotonic() + timeout
+            while True:
+                if self._callbacks:
+                    return self._callbacks.popleft()
+                if stopping_channel is not None and not stopping_channel.consuming:
+                    return None
+                for channel in self._channels:
+                    delivery = channel.next_delivery()
+                    if delivery is not None:
+                        return delivery
+                remaining = end - time.monotonic()
+                if remaining <= 0 or not self.is_open:
+                    return None
+                condition.wait(remaining)
+
+    def __check_open(self):
+        if not self.is_open:
+            raise ConnectionWrongStateError('Connection is closed')
+
+
+class MemoryChannel:
+
+    def __init__(self, connection, channel_number):
+        self.connection = connection
+        self.channel_number = channel_number
+        self.is_open = True
+        self.consuming = False
+        self._broker = connection.broker
+        self._consumers = []
+        self._unacked = {}
+        self._delivery_tags = itertools.count(1)
+        self._prefetch = 0
+        self._confirming = False
+        self._transaction = None
+        self._consumer_tags = itertools.count(1)
+        self._return_callbacks = []
+
+    @property
+    def is_closed(self):
+        return not self.is_open
+
+    def exchange_declare(self, exchange, exchange_type='direct', durable=False, **kwargs):
+        self.__declare(lambda: self._broker.exchanges.setdefault(exchange, exchange_type))
+
+    def queue_declare(self, queue, durable=False, **kwargs):
+        self.__declare(lambda: self._broker.queues.setdefault(queue, deque()))
+
+    def queue_bind(self, queue, exchange, routing_key=None, **kwargs):
+        self.__declare(lambda: self._broker.bindings.setdefault(queue, set()).add((exchange, routing_key or queue)))
+
+    def add_on_return_callback(self, callback):
+        self._return_callbacks.append(callback)
+
+    def confirm_delivery(self):
+        self.__check_open()
+        self._broker.round_trip()
+        self._confirming = True
+
+    def tx_select(self):
+        self.__check_open()
+        self._broker.round_trip()
+        self._transaction = []
+
+    def tx_commit(self):
+        self.__check_open()
+        self._broker.round_trip()
+        messages, self._transaction = self._transaction or [], []
+        for message in messages:
+            self.__route(message)
+        with self._broker.condition:
+            self._broker.stats['commits'] += 1
+
+    def tx_rollback(self):
+        self.__check_open()
+        self._broker.round_trip()
+        self._transaction = []
+
+    def basic_qos(self, prefetch_size=0, prefetch_count=0, global_qos=False):
+        self.__check_open()
+        self._broker.round_trip()
+        self._prefetch = prefetch_count
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self.__check_open()
+        if self._confirming:
+            self._broker.round_trip()
+        message = {'body': body, 'properties': properties or pika.BasicProperties(), 'exchange': exchange, 'routing_key': routing_key,
+                   'redelivered': False, 'mandatory': mandatory}
+        if self._transaction is not None:
+            self._transaction.append(message)
+        else:
+            self.__route(message)
+
+    def basic_consume(self, queue, on_message_callback, auto_ack=False, **kwargs):
+        self.__check_open()
+        self._broker.round_trip()
+        consumer_tag = f'ctag{self.channel_number}.{next(self._consumer_tags)}'
+        with self._broker.condition:
+            self._consumers.append((queue, on_message_callback, auto_ack, consumer_tag))
+        return consumer_tag
+
+    def start_consuming(self):
+        self.__check_open()
+        self.consuming = True
+        try:
+            self.connection.run_until_stopped(self)
+        finally:
+            self.consuming = False
+
+    def stop_consuming(self):
+        with self._broker.condition:
+            self.consuming = False
+            self._consumers = []
+            self._broker.condition.notify_all()
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        self.__check_open()
+        with self._broker.condition:
+            for tag in self.__settled_tags(delivery_tag, multiple):
+                self._unacked.pop(tag)
+                self._broker.stats['acked'] += 1
+            self._broker.condition.notify_all()
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        self.__check_open()
+        with self._broker.condition:
+            for tag in self.__settled_tags(delivery_tag, multiple):
+                queue, message = self._unacked.pop(tag)
+                self._broker.stats['nacked'] += 1
+                if requeue:
+                    self._broker.queues[queue].appendleft({**message, 'redelivered': True})
+            self._broker.condition.notify_all()
+
+    def close(self):
+        with self._broker.condition:
+            if not self.is_open:
+                return
+            self.is_open = False
+            self.consuming = False
+            self._transaction = None
+            for queue, message in reversed(list(self._unacked.values())):
+                self._broker.queues[queue].appendleft({**message, 'redelivered': True})
+            self._unacked.clear()
+            self._broker.condition.notify_all()
+
+    def next_delivery(self):
+        if not self.is_open or (self._prefetch and len(self._unacked) >= self._prefetch):
+            return None
+        for queue, callback, auto_ack, consumer_tag in self._consumers:
+            messages = self._broker.queues.get(queue)
+            if messages:
+                message = messages.popleft()
+                delivery_tag = next(self._delivery_tags)
+                if not auto_ack:
+                    self._unacked[delivery_tag] = (queue, message)
+                method = pika.spec.Basic.Deliver(consumer_tag, delivery_tag, message['redelivered'], message['exchange'], message['routing_key'])
+                return lambda: callback(self, method, message['properties'], message['body'])
+        return None
+
+    def __settled_tags(self, delivery_tag, multiple):
+        if multiple:
+            return [tag for tag in list(self._unacked) if delivery_tag == 0 or tag <= delivery_tag]
+        if delivery_tag not in self._unacked:
+            raise ChannelWrongStateError(f'Unknown delivery tag {delivery_tag}')
+        return [delivery_tag]
+
+    def __route(self, message):
+        if self._broker.route(message['exchange'], message['routing_key'], message) or not message['mandatory']:
+            return
+        method = pika.spec.Basic.Return(312, 'NO_ROUTE', message['exchange'], message['routing_key'])
+        for callback in self._return_callbacks:
+            self.connection.add_callback_threadsafe(partial(callback, self, method, message['properties'], message['body']))
+
+    def __declare(self, declaration):
+        self.__check_open()
+        self._broker.round_trip()
+        with self._broker.condition:
+            declaration()
+            self._broker.stats['declarations'] += 1
+
+    def __check_open(self):
+        if not self.is_open or not self.connection.is_open:
+            raise ChannelWrongStateError('Channel is closed')
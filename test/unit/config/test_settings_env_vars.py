@@ -1,6 +1,8 @@
 import os
 import uuid
 
+from mock import patch
+
 from svc.config.settings_state import Settings
 
 
@@ -48,6 +50,17 @@ class TestSettingsEnvVars:
     def test_database_name__should_return_value(self):
         assert self.SETTINGS.Database.name == self.ENV_VARS['SQL_DBNAME']
 
+    @patch.dict(os.environ, {'SQL_POOL_SIZE': '6', 'SQL_MAX_OVERFLOW': '1', 'SQL_POOL_PRE_PING': 'false'})
+    def test_database_pool__should_return_values(self):
+        assert self.SETTINGS.Database.pool_size == 6
+        assert self.SETTINGS.Database.max_overflow == 1
+        assert self.SETTINGS.Database.pool_pre_ping is False
+
+    @patch.dict(os.environ, {'SQL_SUMP_PARTITIONS_AHEAD': '2', 'SQL_SUMP_RETENTION_DAYS': '90'})
+    def test_database_sump_partitions__should_return_values(self):
+        assert self.SETTINGS.Database.sump_partitions_ahead == 2
+        assert self.SETTINGS.Database.sump_retention_days == 90
+
     def test_database_user__should_favor_environment_variables_above_settings(self):
         self.SETTINGS.Database._settings = {'User': 'ImANewUser'}
         assert self.SETTINGS.Database.user == self.ENV_VARS['SQL_USERNAME']
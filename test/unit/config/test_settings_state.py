@@ -44,6 +44,136 @@ class TestSettings:
     def test_db_name__should_pull_from_settings(self):
         assert self.SETTINGS.Database.name == self.db_settings['Name']
 
+    def test_db_pool_size__should_pull_from_settings(self):
+        self.SETTINGS.Database._settings = {**self.db_settings, 'PoolSize': 8}
+        assert self.SETTINGS.Database.pool_size == 8
+
+    def test_db_pool_size__should_default_when_missing(self):
+        assert self.SETTINGS.Database.pool_size == 2
+
+    def test_db_max_overflow__should_default_when_missing(self):
+        assert self.SETTINGS.Database.max_overflow == 3
+
+    def test_db_pool_recycle__should_pull_from_settings(self):
+        self.SETTINGS.Database._settings = {**self.db_settings, 'PoolRecycle': 60}
+        assert self.SETTINGS.Database.pool_recycle == 60
+
+    def test_db_pool_pre_ping__should_default_to_true(self):
+        assert self.SETTINGS.Database.pool_pre_ping is True
+
+    def test_db_pool_pre_ping__should_pull_from_settings(self):
+        self.SETTINGS.Database._settings = {**self.db_settings, 'PoolPrePing': False}
+        assert self.SETTINGS.Database.pool_pre_ping is False
+
+    def test_db_sump_partitions__should_default_when_missing(self):
+        assert self.SETTINGS.Database.sump_partitions_ahead == 3
+        assert self.SETTINGS.Database.sump_retention_days == 0
+
+    def test_db_sump_partitions__should_pull_from_settings(self):
+        self.SETTINGS.Database._settings = {**self.db_settings, 'SumpPartitionsAhead': 6, 'SumpRetentionDays': 365}
+        assert self.SETTINGS.Database.sump_partitions_ahead == 6
+        assert self.SETTINGS.Database.sump_retention_days == 365
+
+    def test_cache_preference_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'PreferenceTtl': 42}
+        assert self.SETTINGS.Cache.preference_ttl == 42
+
+    def test_cache_max_size__should_default_when_missing(self):
+        self.SETTINGS.Cache._settings = None
+        assert self.SETTINGS.Cache.max_size == 1024
+
+    def test_cache_name__should_default_when_missing(self):
+        self.SETTINGS.Cache._settings = None
+        assert self.SETTINGS.Cache.name == 'home_automation'
+
+    def test_cache_role_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'RoleTtl': 12}
+        assert self.SETTINGS.Cache.role_ttl == 12
+
+    def test_cache_weather_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'WeatherTtl': 120}
+        assert self.SETTINGS.Cache.weather_ttl == 120
+
+    def test_cache_weather_stale_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'WeatherStaleTtl': 3600}
+        assert self.SETTINGS.Cache.weather_stale_ttl == 3600
+
+    def test_cache_light_group_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'LightGroupTtl': 2}
+        assert self.SETTINGS.Cache.light_group_ttl == 2
+
+    def test_cache_light_group_stale_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'LightGroupStaleTtl': 20}
+        assert self.SETTINGS.Cache.light_group_stale_ttl == 20
+
+    def test_cache_owner_ttl__should_default_when_missing(self):
+        self.SETTINGS.Cache._settings = None
+        assert self.SETTINGS.Cache.owner_ttl == 86400
+
+    def test_cache_owner_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'OwnerTtl': 120}
+        assert self.SETTINGS.Cache.owner_ttl == 120
+
+    def test_cache_garage_url_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'GarageUrlTtl': 30}
+        assert self.SETTINGS.Cache.garage_url_ttl == 30
+
+    def test_cache_garage_status_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'GarageStatusTtl': 0.5}
+        assert self.SETTINGS.Cache.garage_status_ttl == 0.5
+
+    def test_cache_garage_status_ttl__should_default_to_disabled(self):
+        self.SETTINGS.Cache._settings = {}
+        assert self.SETTINGS.Cache.garage_status_ttl == 0.0
+
+    def test_cache_coordinates_ttl__should_pull_from_settings(self):
+        self.SETTINGS.Cache._settings = {'CoordinatesTtl': 60}
+        assert self.SETTINGS.Cache.coordinates_ttl == 60
+
+    def test_http_pool_size__should_pull_from_settings(self):
+        self.SETTINGS.Http._settings = {'PoolSize': 3}
+        assert self.SETTINGS.Http.pool_size == 3
+
+    def test_http_batch_workers__should_pull_from_settings(self):
+        self.SETTINGS.Http._settings = {'BatchWorkers': 2}
+        assert self.SETTINGS.Http.batch_workers == 2
+
+    def test_http_failure_threshold__should_pull_from_settings(self):
+        self.SETTINGS.Http._settings = {'FailureThreshold': 7}
+        assert self.SETTINGS.Http.failure_threshold == 7
+
+    def test_http_open_seconds__should_pull_from_settings(self):
+        self.SETTINGS.Http._settings = {'OpenSeconds': 45}
+        assert self.SETTINGS.Http.open_seconds == 45
+
+    def test_http_coalesce_window__should_pull_from_settings(self):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.25}
+        assert self.SETTINGS.Http.coalesce_window == 0.25
+
+    def test_http_coalesce_window__should_default_when_missing(self):
+        self.SETTINGS.Http._settings = {}
+        assert self.SETTINGS.Http.coalesce_window == 0.1
+
+    def test_http_max_workers__should_pull_from_settings(self):
+        self.SETTINGS.Http._settings = {'MaxWorkers': 4}
+        assert self.SETTINGS.Http.max_workers == 4
+
+    def test_http_deadline__should_pull_dependency_deadline_from_settings(self):
+        self.SETTINGS.Http._settings = {'Deadlines': {'Garage': 1}}
+        assert self.SETTINGS.Http.deadline('garage') == 1
+
+    def test_http_deadline__should_default_when_dependency_missing(self):
+        self.SETTINGS.Http._settings = {}
+        assert self.SETTINGS.Http.deadline('weather') == 3
+
+    def test_http_timeout__should_pull_dependency_timeout_from_settings(self):
+        self.SETTINGS.Http._settings = {'Timeouts': {'Lights': 2}}
+        assert self.SETTINGS.Http.timeout('lights') == 2
+
+    def test_http_timeout__should_default_when_missing(self):
+        self.SETTINGS.Http._settings = None
+        assert self.SETTINGS.Http.timeout('garage') == 5
+
     def test_email_app_id__should_pull_from_settings(self):
         assert self.SETTINGS.email_app_id == self.test_settings['EmailAppId']
 
@@ -74,9 +204,67 @@ class TestSettings:
     def test_queue_port__should_pull_from_settings(self):
         assert self.SETTINGS.Queue.port == self.q_settings['Port']
 
+    def test_queue_email_queue__should_default_when_missing(self):
+        assert self.SETTINGS.Queue.email_queue == 'email_jobs'
+
+    def test_queue_email_queue__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'EmailQueue': 'welcome_emails'}
+        assert self.SETTINGS.Queue.email_queue == 'welcome_emails'
+
+    def test_queue_email_consumer__should_default_off_when_queue_configured(self):
+        assert self.SETTINGS.Queue.email_consumer is False
+
+    def test_queue_email_consumer__should_default_off_without_queue_settings(self):
+        self.SETTINGS.Queue._settings = None
+        assert self.SETTINGS.Queue.email_consumer is False
+
+    def test_queue_email_consumer__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'EmailConsumer': True}
+        assert self.SETTINGS.Queue.email_consumer is True
+
+    def test_queue_email_attempts__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'EmailAttempts': 5}
+        assert self.SETTINGS.Queue.email_attempts == 5
+
+    def test_queue_email_retry_delay__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'EmailRetryDelay': 2.5}
+        assert self.SETTINGS.Queue.email_retry_delay == 2.5
+
+    def test_queue_consumer_workers__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'ConsumerWorkers': 6}
+        assert self.SETTINGS.Queue.consumer_workers == 6
+
+    def test_queue_prefetch_count__should_default_to_twice_the_workers(self):
+        self.SETTINGS.Queue._settings = {'ConsumerWorkers': 6}
+        assert self.SETTINGS.Queue.prefetch_count == 12
+
+    def test_queue_prefetch_count__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'PrefetchCount': 3}
+        assert self.SETTINGS.Queue.prefetch_count == 3
+
+    def test_queue_ordered_consumer__should_default_to_false(self):
+        self.SETTINGS.Queue._settings = {}
+        assert self.SETTINGS.Queue.ordered_consumer is False
+
+    def test_queue_drain_seconds__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'DrainSeconds': 20}
+        assert self.SETTINGS.Queue.drain_seconds == 20
+
+    def test_queue_reconnect_delay__should_pull_from_settings(self):
+        self.SETTINGS.Queue._settings = {'ReconnectDelay': 0.5}
+        assert self.SETTINGS.Queue.reconnect_delay == 0.5
+
+    def test_queue_max_reconnect_delay__should_default_to_thirty_seconds(self):
+        self.SETTINGS.Queue._settings = {}
+        assert self.SETTINGS.Queue.max_reconnect_delay == 30.0
+
     def test_allowed_origins__should_pull_from_settings(self):
         assert self.SETTINGS.allowed_origins == self.test_settings['AllowedOrigins']
 
+    def test_allowed_origins__should_default_to_no_origins(self):
+        self.SETTINGS._settings = {}
+        assert self.SETTINGS.allowed_origins == []
+
     def test_base_url_lights__should_pull_from_settings(self):
         assert self.SETTINGS.BaseUrls.lights == self.urls['Lights']
 
@@ -9,7 +9,7 @@ from svc.controllers.account_controller import change_password, get_roles, creat
     get_child_accounts_by_user, delete_child_account
 
 
-@patch('svc.controllers.account_controller.send_new_account_email')
+@patch('svc.controllers.account_controller.email_jobs')
 @patch('svc.controllers.account_controller.UserDatabaseManager')
 @patch('svc.controllers.account_controller.jwt_utils')
 class TestAccountController:
@@ -104,21 +104,29 @@ class TestAccountController:
         mock_db.return_value.__enter__.return_value.create_child_account.assert_called_with(ANY, ANY, ANY, password)
 
     @patch('svc.controllers.account_controller.generate_password')
-    def test_create_child_account_by_user__should_make_call_to_send_new_account_email(self, mock_pass, mock_jwt, mock_db, mock_email):
+    def test_create_child_account_by_user__should_queue_new_account_email(self, mock_pass, mock_jwt, mock_db, mock_email):
         email = 'test@test.com'
         password = 'brandNewPassword'
         mock_pass.return_value = password
         request = json.dumps({'email': email, 'roles': ['stuff']}).encode('UTF-8')
         create_child_account_by_user(self.BEARER_TOKEN, self.USER_ID, request)
 
-        mock_email.assert_called_with(email, password)
+        mock_email.queue_new_account_email.assert_called_with(email, password)
 
     def test_create_child_account_by_user__should_return_response_from_database_method(self, mock_jwt, mock_db, mock_email):
         request = json.dumps({'email': 'test', 'roles': ['stuff']}).encode('UTF-8')
-        response = {'user_data': 'doesnt matter'}
+        response = [{'user_name': 'test', 'user_id': 'fake_child_id', 'roles': ['stuff']}]
         mock_db.return_value.__enter__.return_value.create_child_account.return_value = response
+        mock_email.get_email_status.return_value = {'status': 'queued', 'attempts': 0}
         actual = create_child_account_by_user(self.BEARER_TOKEN, self.USER_ID, request)
-        assert actual == response
+        assert actual == [{**response[0], 'email_status': 'queued'}]
+
+    def test_create_child_account_by_user__should_queue_email_after_database_commit(self, mock_jwt, mock_db, mock_email):
+        request = json.dumps({'email': 'test', 'roles': ['stuff']}).encode('UTF-8')
+        mock_email.queue_new_account_email.side_effect = lambda *args: mock_db.return_value.__exit__.assert_called()
+        create_child_account_by_user(self.BEARER_TOKEN, self.USER_ID, request)
+
+        mock_email.queue_new_account_email.assert_called_once()
 
     def test_get_child_accounts_by_user__should_validate_bearer_token(self, mock_jwt, mock_db, mock_email):
         get_child_accounts_by_user(self.BEARER_TOKEN, self.USER_ID)
@@ -131,11 +139,21 @@ class TestAccountController:
         mock_db.return_value.__enter__.return_value.get_user_child_accounts.assert_called_with(self.USER_ID)
 
     def test_get_child_accounts_by_user__should_return_response_from_database(self, mock_jwt, mock_db, mock_email):
-        response = {'response': 'response data'}
+        response = [{'user_name': 'child@test.com', 'user_id': 'fake_child_id', 'roles': ['lighting']}]
+        mock_db.return_value.__enter__.return_value.get_user_child_accounts.return_value = response
+        mock_email.get_email_status.return_value = None
+        actual = get_child_accounts_by_user(self.BEARER_TOKEN, self.USER_ID)
+
+        assert actual == [{**response[0], 'email_status': None}]
+
+    def test_get_child_accounts_by_user__should_include_email_status_by_user_name(self, mock_jwt, mock_db, mock_email):
+        response = [{'user_name': 'child@test.com', 'user_id': 'fake_child_id', 'roles': ['lighting']}]
         mock_db.return_value.__enter__.return_value.get_user_child_accounts.return_value = response
+        mock_email.get_email_status.return_value = {'status': 'failed', 'attempts': 3}
         actual = get_child_accounts_by_user(self.BEARER_TOKEN, self.USER_ID)
 
-        assert actual == response
+        mock_email.get_email_status.assert_called_with('child@test.com')
+        assert actual[0]['email_status'] == 'failed'
 
     def test_delete_child_account__should_validate_bearer_token(self, mock_jwt, mock_db, mock_email):
         child_user_id = '123asdf'
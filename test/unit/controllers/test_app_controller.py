@@ -7,7 +7,7 @@ import pytz
 from mock import patch, ANY
 
 from svc.controllers.app_controller import get_login, get_user_preferences, save_user_preferences, get_user_tasks, \
-    delete_user_task, insert_user_task, update_user_task, refresh_bearer_token
+    delete_user_task, insert_user_task, update_user_task, refresh_bearer_token, get_metrics
 
 
 @patch('svc.controllers.app_controller.UserDatabaseManager')
@@ -233,3 +233,40 @@ class TestLoginController:
         actual = update_user_task(self.BEARER_TOKEN, self.USER_ID, request_data)
 
         assert actual == response
+
+
+@patch('svc.controllers.app_controller.SharedCache')
+@patch('svc.controllers.app_controller.DatabaseEngine')
+@patch('svc.controllers.app_controller.jwt_utils')
+class TestMetricsController:
+    BEARER_TOKEN = jwt.encode({}, 'fake_jwt_secret', algorithm='HS256').decode('UTF-8')
+
+    def test_get_metrics__should_validate_bearer_token(self, mock_jwt, mock_engine, mock_cache):
+        get_metrics(self.BEARER_TOKEN)
+
+        mock_jwt.is_jwt_valid.assert_called_with(self.BEARER_TOKEN)
+
+    def test_get_metrics__should_return_database_pool_stats(self, mock_jwt, mock_engine, mock_cache):
+        stats = {'checkouts': 3, 'poolSize': 2}
+        mock_engine.get_instance.return_value.get_stats.return_value = stats
+
+        actual = get_metrics(self.BEARER_TOKEN)
+
+        assert actual['database'] == stats
+
+    def test_get_metrics__should_return_shared_cache_stats(self, mock_jwt, mock_engine, mock_cache):
+        stats = {'backend': 'local', 'preferences': {'hits': 4, 'misses': 1}}
+        mock_cache.get_instance.return_value.get_stats.return_value = stats
+
+        actual = get_metrics(self.BEARER_TOKEN)
+
+        assert actual['cache'] == stats
+
+    @patch('svc.controllers.app_controller.CircuitBreakers')
+    def test_get_metrics__should_return_circuit_breaker_states(self, mock_breakers, mock_jwt, mock_engine, mock_cache):
+        stats = {'garage:http://1.1.1.1': {'state': 'open', 'failures': 3, 'rejected': 7}}
+        mock_breakers.get_instance.return_value.get_stats.return_value = stats
+
+        actual = get_metrics(self.BEARER_TOKEN)
+
+        assert actual['circuitBreakers'] == stats
@@ -0,0 +1,149 @@
+import threading
+from datetime import datetime
+
+from mock import patch
+from werkzeug.exceptions import FailedDependency, BadRequest
+
+from models.sump import SumpLevel
+from svc.config.settings_state import Settings
+from svc.controllers.dashboard_controller import get_dashboard
+from svc.models.garage import GarageStatus, Coordinates
+from svc.utilities.single_flight_utils import GarageStatusFlight
+
+
+@patch('svc.controllers.dashboard_controller.light_groups')
+@patch('svc.controllers.dashboard_controller.read_garage_url')
+@patch('svc.controllers.dashboard_controller.sump_controller')
+@patch('svc.controllers.dashboard_controller.thermostat_controller')
+@patch('svc.controllers.dashboard_controller.temperature')
+@patch('svc.controllers.dashboard_controller.api_utils')
+@patch('svc.controllers.dashboard_controller.UserDatabaseManager')
+@patch('svc.controllers.dashboard_controller.is_jwt_valid')
+class TestDashboardController:
+    BEARER_TOKEN = 'fakeBearerToken'
+    USER_ID = 'fakeUserId'
+    GARAGE_ID = '1'
+    GARAGE_URL = 'http://1.1.1.1'
+    PREFERENCES = {'city': 'Prague', 'temp_unit': 'celsius', 'is_fahrenheit': False}
+    FORECAST = {'temp': 12.3, 'minTemp': 8.1, 'maxTemp': 15.6, 'description': 'clear sky'}
+    GROUPS = [{'groupId': '1', 'groupName': 'Living Room', 'on': True, 'brightness': 200}]
+
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'Deadlines': {'Lights': 0.2, 'Garage': 0.2, 'Weather': 0.2}}
+        GarageStatusFlight.get_instance().clear()
+        self.SUMP = SumpLevel(currentDepth=12.0, warningLevel=1, averageDepth=10.0)
+        self.GARAGE = GarageStatus(isGarageOpen=True, statusDuration=datetime(2021, 1, 1, 12, 0), coordinates=Coordinates(1.0, 2.0))
+
+    def teardown_method(self):
+        Settings.get_instance().Http._settings = None
+        Settings.get_instance().Cache._settings = None
+
+    def test_get_dashboard__should_validate_jwt_once(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        mock_jwt.assert_called_once_with(self.BEARER_TOKEN)
+
+    def test_get_dashboard__should_open_one_database_session(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        database = mock_db.return_value.__enter__.return_value
+        mock_db.assert_called_once()
+        mock_sump.read_sump_level.assert_called_with(database, self.USER_ID)
+        mock_url.assert_called_with(database, self.USER_ID)
+
+    def test_get_dashboard__should_return_all_sections(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual['preferences'] == self.PREFERENCES
+        assert actual['temperature'] == {'currentTemp': 21.0}
+        assert actual['forecast'] == self.FORECAST
+        assert actual['sump'] == self.SUMP.to_dict(encode_json=True)
+        assert actual['garage'] == {'isGarageOpen': True, 'statusDuration': '2021-01-01T12:00:00', 'coordinates': {'latitude': 1.0, 'longitude': 2.0}}
+        assert actual['lights'] == self.GROUPS
+        assert actual['errors'] == {}
+
+    def test_get_dashboard__should_call_upstreams_with_request_values(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        mock_api.get_garage_door_status.assert_called_with(self.BEARER_TOKEN, self.GARAGE_URL, self.GARAGE_ID)
+        mock_lights.get_light_groups.assert_called_with(Settings.get_instance().light_api_key)
+        mock_temp.get_external_temp.assert_called_with(self.PREFERENCES)
+        mock_thermostat.read_user_temp.assert_called_with(self.PREFERENCES)
+
+    def test_get_dashboard__should_reuse_recent_garage_status(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        Settings.get_instance().Cache._settings = {'GarageStatusTtl': 5}
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual['garage']['isGarageOpen'] is True
+        mock_api.get_garage_door_status.assert_called_once()
+
+    def test_get_dashboard__should_skip_garage_when_no_garage_id(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, None)
+
+        assert 'garage' not in actual
+        mock_url.assert_not_called()
+        mock_api.get_garage_door_status.assert_not_called()
+
+    def test_get_dashboard__should_mark_failed_dependency(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        mock_lights.get_light_groups.side_effect = FailedDependency()
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual['lights'] is None
+        assert actual['errors'] == {'lights': {'status': 424, 'message': 'Failed Dependency'}}
+        assert actual['forecast'] == self.FORECAST
+
+    def test_get_dashboard__should_mark_missing_sump_data(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        mock_sump.read_sump_level.side_effect = BadRequest()
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual['sump'] is None
+        assert actual['errors'] == {'sump': {'status': 400, 'message': 'Bad Request'}}
+
+    def test_get_dashboard__should_mark_garage_without_device(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        mock_url.side_effect = BadRequest()
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual['garage'] is None
+        assert actual['errors'] == {'garage': {'status': 400, 'message': 'Bad Request'}}
+        mock_api.get_garage_door_status.assert_not_called()
+
+    def test_get_dashboard__should_mark_unexpected_errors(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        mock_thermostat.read_user_temp.side_effect = FileNotFoundError()
+        actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual['temperature'] is None
+        assert actual['errors'] == {'temperature': {'status': 500, 'message': 'Internal Server Error'}}
+
+    def test_get_dashboard__should_mark_slow_dependency_as_timed_out(self, mock_jwt, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        self.__arrange(mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights)
+        release = threading.Event()
+        mock_api.get_garage_door_status.side_effect = lambda *args: release.wait(5)
+        try:
+            actual = get_dashboard(self.BEARER_TOKEN, self.USER_ID, self.GARAGE_ID)
+        finally:
+            release.set()
+
+        assert actual['garage'] is None
+        assert actual['errors'] == {'garage': {'status': 504, 'message': 'Gateway Timeout'}}
+        assert actual['lights'] == self.GROUPS
+        assert actual['forecast'] == self.FORECAST
+
+    def __arrange(self, mock_db, mock_api, mock_temp, mock_thermostat, mock_sump, mock_url, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_preferences_by_user.return_value = self.PREFERENCES
+        mock_lights.get_light_groups.return_value = self.GROUPS
+        mock_api.get_garage_door_status.return_value = self.GARAGE
+        mock_temp.get_external_temp.return_value = self.FORECAST
+        mock_thermostat.read_user_temp.return_value = {'currentTemp': 21.0}
+        mock_sump.read_sump_level.return_value = self.SUMP
+        mock_url.return_value = self.GARAGE_URL
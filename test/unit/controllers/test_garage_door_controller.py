@@ -1,9 +1,13 @@
 import os
 
 import jwt
+import pytest
 from mock import patch
+from werkzeug.exceptions import BadRequest
 
+from svc.config.settings_state import Settings
 from svc.controllers.garage_door_controller import get_status, toggle_door, update_state
+from svc.utilities.single_flight_utils import GarageStatusFlight
 
 
 @patch('svc.controllers.garage_door_controller.api_utils')
@@ -19,9 +23,11 @@ class TestGarageController:
 
     def setup_method(self):
         os.environ.update({'JWT_SECRET': self.JWT_SECRET})
+        GarageStatusFlight.get_instance().clear()
 
     def teardown_method(self):
         os.environ.pop('JWT_SECRET')
+        Settings.get_instance().Cache._settings = None
 
     def test_get_status__should_call_is_jwt_valid(self, mock_jwt, mock_url, mock_util):
         mock_util.get_garage_door_status.return_value = (self.SUCCESS_STATE, {})
@@ -102,3 +108,58 @@ class TestGarageController:
         toggle_door(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
 
         mock_util.toggle_garage_door_state.assert_called_with(self.JWT_TOKEN, expected_url, self.GARAGE_ID)
+
+    def test_get_status__should_reuse_status_within_micro_ttl(self, mock_jwt, mock_url, mock_util):
+        Settings.get_instance().Cache._settings = {'GarageStatusTtl': 5}
+        mock_url.return_value = 'http://www.fakeurl.com'
+        mock_util.get_garage_door_status.return_value = {'isGarageOpen': True}
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        actual = get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert actual == {'isGarageOpen': True}
+        mock_util.get_garage_door_status.assert_called_once()
+
+    def test_get_status__should_call_node_every_time_without_micro_ttl(self, mock_jwt, mock_url, mock_util):
+        mock_url.return_value = 'http://www.fakeurl.com'
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert mock_util.get_garage_door_status.call_count == 2
+
+    def test_toggle_garage_door_state__should_invalidate_cached_status(self, mock_jwt, mock_url, mock_util):
+        Settings.get_instance().Cache._settings = {'GarageStatusTtl': 5}
+        mock_url.return_value = 'http://www.fakeurl.com'
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        toggle_door(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert mock_util.get_garage_door_status.call_count == 2
+
+    def test_toggle_garage_door_state__should_invalidate_cached_status_when_node_fails(self, mock_jwt, mock_url, mock_util):
+        Settings.get_instance().Cache._settings = {'GarageStatusTtl': 5}
+        mock_url.return_value = 'http://www.fakeurl.com'
+        mock_util.toggle_garage_door_state.side_effect = BadRequest()
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        with pytest.raises(BadRequest):
+            toggle_door(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert mock_util.get_garage_door_status.call_count == 2
+
+    def test_update_state__should_invalidate_cached_status(self, mock_jwt, mock_url, mock_util):
+        Settings.get_instance().Cache._settings = {'GarageStatusTtl': 5}
+        mock_url.return_value = 'http://www.fakeurl.com'
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        update_state(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID, {})
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        assert mock_util.get_garage_door_status.call_count == 2
+
+    def test_update_state__should_not_invalidate_other_doors(self, mock_jwt, mock_url, mock_util):
+        Settings.get_instance().Cache._settings = {'GarageStatusTtl': 5}
+        mock_url.return_value = 'http://www.fakeurl.com'
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+        update_state(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID + 1, {})
+        get_status(self.JWT_TOKEN, self.USER_ID, self.GARAGE_ID)
+
+        mock_util.get_garage_door_status.assert_called_once()
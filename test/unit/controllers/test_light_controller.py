@@ -1,13 +1,17 @@
+import threading
+
 import pytest
 from mock import patch, ANY
-from werkzeug.exceptions import BadRequest
+from werkzeug.exceptions import BadRequest, FailedDependency
 
 from svc.config.settings_state import Settings
-from svc.controllers.light_controller import get_assigned_light_groups, set_assigned_light_groups, set_assigned_light
+from svc.controllers.light_controller import get_assigned_light_groups, set_assigned_light_groups, set_assigned_light, \
+    set_light_batch
+from svc.utilities.coalesce_utils import LightStateCoalescer
 
 
 @patch('svc.controllers.light_controller.is_jwt_valid')
-@patch('svc.controllers.light_controller.api_utils')
+@patch('svc.controllers.light_controller.light_groups')
 class TestLightRequest:
     LIGHT_USERNAME = 'fakeUsername'
     LIGHT_PASSWORD = 'fakePassword'
@@ -20,6 +24,11 @@ class TestLightRequest:
         self.REQUEST = {'on': self.STATE, 'groupId': self.GROUP_ID}
         self.SETTINGS = Settings.get_instance()
         self.SETTINGS._settings = {'LightApiKey': self.API_KEY}
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0}
+        LightStateCoalescer.get_instance().clear()
+
+    def teardown_method(self):
+        self.SETTINGS.Http._settings = None
 
     def test_set_assigned_light_groups__should_call_is_jwt_valid(self, mock_api, mock_jwt):
         set_assigned_light_groups(self.BEARER_TOKEN, self.REQUEST)
@@ -53,6 +62,52 @@ class TestLightRequest:
         with pytest.raises(BadRequest):
             set_assigned_light_groups(self.BEARER_TOKEN, request)
 
+    def test_set_assigned_light_groups__should_only_apply_latest_state_within_window(self, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.05}
+        for brightness in [10, 80, 150]:
+            set_assigned_light_groups(self.BEARER_TOKEN, {'groupId': self.GROUP_ID, 'on': True, 'brightness': brightness})
+        set_assigned_light_groups(self.BEARER_TOKEN, {'groupId': self.GROUP_ID, 'on': True, 'brightness': 220, 'wait': True})
+
+        mock_api.set_light_groups.assert_called_once_with(self.API_KEY, self.GROUP_ID, True, 220)
+
+    def test_set_assigned_light_groups__should_acknowledge_before_apply_when_not_waiting(self, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.05}
+        applied = threading.Event()
+        mock_api.set_light_groups.side_effect = lambda *args: applied.set()
+        set_assigned_light_groups(self.BEARER_TOKEN, self.REQUEST)
+
+        mock_api.set_light_groups.assert_not_called()
+        assert applied.wait(5)
+
+    def test_set_assigned_light_groups__should_keep_groups_separate(self, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.05}
+        applied = threading.Semaphore(0)
+        mock_api.set_light_groups.side_effect = lambda *args: applied.release()
+        set_assigned_light_groups(self.BEARER_TOKEN, {'groupId': '1', 'on': True, 'brightness': 40})
+        set_assigned_light_groups(self.BEARER_TOKEN, {'groupId': '2', 'on': True, 'brightness': 90})
+        set_assigned_light_groups(self.BEARER_TOKEN, {'groupId': '1', 'on': True, 'brightness': 50})
+
+        assert applied.acquire(timeout=5) and applied.acquire(timeout=5)
+        assert mock_api.set_light_groups.call_count == 2
+        mock_api.set_light_groups.assert_any_call(self.API_KEY, '1', True, 50)
+        mock_api.set_light_groups.assert_any_call(self.API_KEY, '2', True, 90)
+
+    def test_set_assigned_light_groups__should_raise_apply_error_when_waiting(self, mock_api, mock_jwt):
+        mock_api.set_light_groups.side_effect = FailedDependency()
+        with pytest.raises(FailedDependency):
+            set_assigned_light_groups(self.BEARER_TOKEN, {**self.REQUEST, 'wait': True})
+
+    def test_set_assigned_light_groups__should_not_raise_apply_error_when_not_waiting(self, mock_api, mock_jwt):
+        mock_api.set_light_groups.side_effect = FailedDependency()
+        set_assigned_light_groups(self.BEARER_TOKEN, self.REQUEST)
+
+    def test_set_assigned_light__should_only_apply_latest_state_within_window(self, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.05}
+        set_assigned_light(self.BEARER_TOKEN, {'lightId': '4', 'brightness': 30})
+        set_assigned_light(self.BEARER_TOKEN, {'lightId': '4', 'brightness': 179, 'wait': True})
+
+        mock_api.set_light_state.assert_called_once_with(self.API_KEY, '4', 179)
+
     def test_set_assigned_light__should_call_is_jwt_valid(self, mock_api, mock_jwt):
         request_data = {'lightId': '4', 'on': True, 'brightness': 179}
         set_assigned_light(self.BEARER_TOKEN, request_data)
@@ -77,4 +132,76 @@ class TestLightRequest:
 
         mock_api.get_light_groups.assert_called_with(self.API_KEY)
 
+    def test_set_light_batch__should_validate_jwt_once(self, mock_api, mock_jwt):
+        set_light_batch(self.BEARER_TOKEN, [{'groupId': '1', 'on': True}, {'lightId': '2', 'brightness': 10}])
+
+        mock_jwt.assert_called_once_with(self.BEARER_TOKEN)
+
+    def test_set_light_batch__should_set_each_group(self, mock_api, mock_jwt):
+        set_light_batch(self.BEARER_TOKEN, [{'groupId': '1', 'on': True, 'brightness': 50}, {'groupId': '2', 'on': False}])
+
+        mock_api.set_light_groups.assert_any_call(self.API_KEY, '1', True, 50)
+        mock_api.set_light_groups.assert_any_call(self.API_KEY, '2', False, None)
+
+    def test_set_light_batch__should_set_each_light(self, mock_api, mock_jwt):
+        set_light_batch(self.BEARER_TOKEN, [{'lightId': '3', 'brightness': 0}])
+
+        mock_api.set_light_state.assert_called_with(self.API_KEY, '3', 0)
+
+    def test_set_light_batch__should_return_results_in_request_order(self, mock_api, mock_jwt):
+        actual = set_light_batch(self.BEARER_TOKEN, [{'groupId': '1', 'on': True}, {'lightId': '3', 'brightness': 10}])
+
+        assert actual == [{'groupId': '1', 'status': 200}, {'lightId': '3', 'status': 200}]
+
+    def test_set_light_batch__should_report_failed_items_without_failing_others(self, mock_api, mock_jwt):
+        mock_api.set_light_groups.side_effect = lambda api_key, group_id, on, brightness: self.__fail_group('2', group_id)
+        actual = set_light_batch(self.BEARER_TOKEN, [{'groupId': '1', 'on': True}, {'groupId': '2', 'on': True}])
+
+        assert actual == [{'groupId': '1', 'status': 200}, {'groupId': '2', 'status': 424, 'message': 'Failed Dependency'}]
+
+    def test_set_light_batch__should_report_invalid_items(self, mock_api, mock_jwt):
+        actual = set_light_batch(self.BEARER_TOKEN, [{'groupId': '1'}, {'brightness': 10}])
+
+        assert actual == [{'groupId': '1', 'status': 400, 'message': 'Bad Request'}, {'status': 400, 'message': 'Bad Request'}]
+
+    def test_set_light_batch__should_report_unexpected_errors(self, mock_api, mock_jwt):
+        mock_api.set_light_state.side_effect = ConnectionError()
+        actual = set_light_batch(self.BEARER_TOKEN, [{'lightId': '3', 'brightness': 10}])
+
+        assert actual == [{'lightId': '3', 'status': 500, 'message': 'Internal Server Error'}]
+
+    def test_set_light_batch__should_replace_pending_group_update(self, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.05}
+        set_assigned_light_groups(self.BEARER_TOKEN, {'groupId': '1', 'on': True, 'brightness': 20})
+        set_light_batch(self.BEARER_TOKEN, [{'groupId': '1', 'on': True, 'brightness': 90}])
+
+        mock_api.set_light_groups.assert_called_once_with(self.API_KEY, '1', True, 90)
+
+    def test_set_light_batch__should_replace_pending_light_update(self, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'CoalesceWindow': 0.05}
+        set_assigned_light(self.BEARER_TOKEN, {'lightId': '3', 'brightness': 20})
+        set_light_batch(self.BEARER_TOKEN, [{'lightId': '3', 'brightness': 0}])
+
+        mock_api.set_light_state.assert_called_once_with(self.API_KEY, '3', 0)
+
+    def test_set_light_batch__should_return_empty_results_for_empty_batch(self, mock_api, mock_jwt):
+        assert set_light_batch(self.BEARER_TOKEN, []) == []
+
+    def test_set_light_batch__should_raise_bad_request_when_not_a_list(self, mock_api, mock_jwt):
+        with pytest.raises(BadRequest):
+            set_light_batch(self.BEARER_TOKEN, {'groupId': '1', 'on': True})
+
+    @patch('svc.controllers.light_controller.ThreadPoolExecutor')
+    def test_set_light_batch__should_bound_worker_pool(self, mock_executor, mock_api, mock_jwt):
+        self.SETTINGS.Http._settings = {'BatchWorkers': 3}
+        mock_executor.return_value.__enter__.return_value.map.return_value = []
+        set_light_batch(self.BEARER_TOKEN, [{'lightId': str(light), 'brightness': 0} for light in range(10)])
+
+        mock_executor.assert_called_with(max_workers=3, thread_name_prefix='light-batch')
+
+    @staticmethod
+    def __fail_group(failing_id, group_id):
+        if group_id == failing_id:
+            raise FailedDependency()
+
     # TODO: test register unassigned light
@@ -1,36 +1,112 @@
 import uuid
 
 from mock import patch
+from werkzeug.exceptions import FailedDependency
 
-from svc.controllers.scene_controller import get_created_scenes, delete_created_scene
+from svc.config.settings_state import Settings
+from svc.controllers.scene_controller import get_created_scenes, delete_created_scene, activate_scene
+from svc.utilities.coalesce_utils import LightStateCoalescer
 
 
+@patch('svc.controllers.scene_controller.light_groups')
 @patch('svc.controllers.scene_controller.UserDatabaseManager')
 @patch('svc.controllers.scene_controller.is_jwt_valid')
 class TestSceneController:
     USER_ID = str(uuid.uuid4())
     SCENE_ID = str(uuid.uuid4())
     BEARER_TOKEN = 'fake bearer token'
+    DETAILS = [{'group_id': '1', 'group_name': 'Living Room', 'brightness': 200},
+               {'group_id': '2', 'group_name': 'Bedroom', 'brightness': 0}]
 
-    def test_get_created_scenes__should_validate_jwt(self, mock_jwt, mock_db):
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'CoalesceWindow': 0.05}
+        LightStateCoalescer.get_instance().clear()
+
+    def teardown_method(self):
+        Settings.get_instance().Http._settings = None
+
+    def test_get_created_scenes__should_validate_jwt(self, mock_jwt, mock_db, mock_lights):
         get_created_scenes(self.BEARER_TOKEN, self.USER_ID)
         mock_jwt.assert_called_with(self.BEARER_TOKEN)
 
-    def test_get_created_scenes__should_query_database_for_records(self, mock_jwt, mock_db):
+    def test_get_created_scenes__should_query_database_for_records(self, mock_jwt, mock_db, mock_lights):
         get_created_scenes(self.BEARER_TOKEN, self.USER_ID)
         mock_db.return_value.__enter__.return_value.get_scenes_by_user.assert_called_with(self.USER_ID)
 
-    def test_get_created_scenes__should_return_response_from_database(self, mock_jwt, mock_db):
+    def test_get_created_scenes__should_return_response_from_database(self, mock_jwt, mock_db, mock_lights):
         response = {'test_record': 'doesnt matter'}
         mock_db.return_value.__enter__.return_value.get_scenes_by_user.return_value = response
         actual = get_created_scenes(self.BEARER_TOKEN, self.USER_ID)
 
         assert actual == response
 
-    def test_delete_created_scene__should_validate_jwt(self, mock_jwt, mock_db):
+    def test_delete_created_scene__should_validate_jwt(self, mock_jwt, mock_db, mock_lights):
         delete_created_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
         mock_jwt.assert_called_with(self.BEARER_TOKEN)
 
-    def test_delete_created_scene__should_query_database_to_delete_record(self, mock_jwt, mock_db):
+    def test_delete_created_scene__should_query_database_to_delete_record(self, mock_jwt, mock_db, mock_lights):
         delete_created_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
-        mock_db.return_value.__enter__.return_value.delete_scene_by_user.assert_called_with(self.USER_ID, self.SCENE_ID)
\ No newline at end of file
+        mock_db.return_value.__enter__.return_value.delete_scene_by_user.assert_called_with(self.USER_ID, self.SCENE_ID)
+
+    def test_activate_scene__should_validate_jwt(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS
+        activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+        mock_jwt.assert_called_with(self.BEARER_TOKEN)
+
+    def test_activate_scene__should_load_scene_details(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS
+        activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.assert_called_with(self.USER_ID, self.SCENE_ID)
+
+    def test_activate_scene__should_set_every_group_in_scene(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS
+        activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+        api_key = Settings.get_instance().light_api_key
+        assert mock_lights.set_light_groups.call_count == 2
+        mock_lights.set_light_groups.assert_any_call(api_key, '1', True, 200)
+        mock_lights.set_light_groups.assert_any_call(api_key, '2', False, 0)
+
+    def test_activate_scene__should_return_status_and_timing_per_group(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS
+        actual = activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+        assert [(group['groupId'], group['groupName'], group['status']) for group in actual] == [('1', 'Living Room', 200), ('2', 'Bedroom', 200)]
+        assert all(group['elapsedMs'] >= 0 for group in actual)
+
+    def test_activate_scene__should_report_failed_groups_without_stopping(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS
+        mock_lights.set_light_groups.side_effect = lambda api_key, group_id, on, brightness: self.__fail_group(group_id)
+        actual = activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+        assert actual[0]['status'] == 424
+        assert actual[0]['message'] == 'Failed Dependency'
+        assert actual[1]['status'] == 200
+
+    def test_activate_scene__should_report_unexpected_errors(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS[:1]
+        mock_lights.set_light_groups.side_effect = ValueError()
+        actual = activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+        assert actual[0]['status'] == 500
+        assert actual[0]['message'] == 'Internal Server Error'
+
+    def test_activate_scene__should_replace_pending_group_update(self, mock_jwt, mock_db, mock_lights):
+        api_key = Settings.get_instance().light_api_key
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = self.DETAILS[:1]
+        LightStateCoalescer.get_instance().set_group(mock_lights.set_light_groups, api_key, '1', True, 20)
+        activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+        mock_lights.set_light_groups.assert_called_once_with(api_key, '1', True, 200)
+
+    def test_activate_scene__should_return_empty_list_for_scene_without_groups(self, mock_jwt, mock_db, mock_lights):
+        mock_db.return_value.__enter__.return_value.get_scene_details_by_user.return_value = []
+        actual = activate_scene(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+        assert actual == []
+        mock_lights.set_light_groups.assert_not_called()
+
+    @staticmethod
+    def __fail_group(group_id):
+        if group_id == '1':
+            raise FailedDependency()
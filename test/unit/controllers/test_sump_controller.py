@@ -1,20 +1,33 @@
 import json
 import uuid
+from datetime import datetime
 
+import pytest
 from mock import patch
+from werkzeug.exceptions import BadRequest
 
 from models.sump import SumpLevel
-from svc.controllers.sump_controller import get_sump_level, save_current_level
+from svc.config.settings_state import Settings
+from svc.controllers.sump_controller import get_sump_level, save_current_level, save_current_levels, \
+    backfill_average_levels, get_sump_levels, maintain_partitions
 
 
 @patch('svc.controllers.sump_controller.is_jwt_valid')
 @patch('svc.controllers.sump_controller.UserDatabaseManager')
-def test_get_sump_level__should_call_get_current_sump_level_by_user(mock_database, mock_jwt):
+def test_get_sump_level__should_call_get_sump_summary_by_user(mock_database, mock_jwt):
     user_id = uuid.uuid4().hex
     bearer_token = 'abdsadf2345'
     get_sump_level(user_id, bearer_token)
 
-    mock_database.return_value.__enter__.return_value.get_current_sump_level_by_user.assert_called_with(user_id)
+    mock_database.return_value.__enter__.return_value.get_sump_summary_by_user.assert_called_with(user_id)
+
+
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+def test_get_sump_level__should_make_one_database_call(mock_database, mock_jwt):
+    get_sump_level('fake1234', 'lkhasdhlufiou0892390784')
+
+    assert [call[0] for call in mock_database.return_value.__enter__.return_value.method_calls] == ['get_sump_summary_by_user']
 
 
 @patch('svc.controllers.sump_controller.is_jwt_valid')
@@ -23,9 +36,8 @@ def test_get_sump_level__should_return_response_with_distance(mock_database, moc
     distance = 3.14159
     bearer_token = 'asdflkhsad98778236'
     user_id = 'fake12354'
-    mock_database.return_value.__enter__.return_value.get_preferences_by_user.return_value = {'is_imperial': False}
-    mock_database.return_value.__enter__.return_value.get_current_sump_level_by_user.return_value = {'currentDepth': distance, 'warningLevel': 0}
-    mock_database.return_value.__enter__.return_value.get_average_sump_level_by_user.return_value = {'averageDepth': distance, 'testItem': 123}
+    mock_database.return_value.__enter__.return_value.get_sump_summary_by_user.return_value = \
+        {'currentDepth': distance, 'warningLevel': 0, 'averageDepth': distance, 'latestDate': None, 'is_imperial': False}
 
     actual = get_sump_level(user_id, bearer_token)
 
@@ -39,9 +51,8 @@ def test_get_sump_level__should_return_response_with_distance_converted_to_imper
     average_distance = 5.08
     bearer_token = 'asdflkhsad98778236'
     user_id = 'fake12354'
-    mock_database.return_value.__enter__.return_value.get_preferences_by_user.return_value = {'is_imperial': True}
-    mock_database.return_value.__enter__.return_value.get_current_sump_level_by_user.return_value = {'currentDepth': current_distance, 'warningLevel': 0}
-    mock_database.return_value.__enter__.return_value.get_average_sump_level_by_user.return_value = {'averageDepth': average_distance, 'testItem': 123}
+    mock_database.return_value.__enter__.return_value.get_sump_summary_by_user.return_value = \
+        {'currentDepth': current_distance, 'warningLevel': 0, 'averageDepth': average_distance, 'latestDate': None, 'is_imperial': True}
 
     actual = get_sump_level(user_id, bearer_token)
 
@@ -59,48 +70,160 @@ def test_get_sump_level__should_call_is_jwt_valid(mock_database, mock_jwt):
     mock_jwt.assert_called_with(bearer_token)
 
 
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
 @patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_save_current_level__should_call_is_jwt_valid(mock_jwt, mock_db):
+    user_id = 1234
+    bearer_token = 'fake_token'
+    request = json.dumps({'depth': 'test'})
+
+    save_current_level(user_id, bearer_token, request)
+
+    mock_jwt.assert_called_with(bearer_token)
+
+
 @patch('svc.controllers.sump_controller.UserDatabaseManager')
-def test_get_sump_level__should_call_get_preferences_by_user(mock_database, mock_jwt):
-    user_id = 'fake1234'
-    bearer_token = 'lkhasdhlufiou0892390784'
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_save_current_level__should_call_save_current_sump_level(mock_jwt, mock_db):
+    user_id = 1234
+    bearer_token = 'fake_token'
+    depth_info = {'depth': 'test'}
+    request = json.dumps(depth_info)
 
-    get_sump_level(user_id, bearer_token)
+    save_current_level(user_id, bearer_token, request)
 
-    mock_database.return_value.__enter__.return_value.get_preferences_by_user.assert_called_with(user_id)
+    mock_db.return_value.__enter__.return_value.insert_current_sump_level.assert_called_with(user_id, depth_info)
 
 
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_save_current_levels__should_call_is_jwt_valid(mock_jwt, mock_db):
+    bearer_token = 'fake_token'
+
+    save_current_levels(1234, bearer_token, json.dumps([]))
+
+    mock_jwt.assert_called_with(bearer_token)
+
+
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_save_current_levels__should_return_insert_sump_levels_result(mock_jwt, mock_db):
+    user_id = 1234
+    readings = [{'depth': 1.2, 'warning_level': 0, 'datetime': '2021-01-01 10:00:00'}]
+    expected = {'inserted': 1, 'errors': []}
+    mock_db.return_value.__enter__.return_value.insert_sump_levels.return_value = expected
+
+    actual = save_current_levels(user_id, 'fake_token', json.dumps(readings))
+
+    assert actual == expected
+    mock_db.return_value.__enter__.return_value.insert_sump_levels.assert_called_with(user_id, readings)
+
+
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
 @patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_save_current_levels__should_raise_bad_request_when_body_is_not_json(mock_jwt, mock_db):
+    with pytest.raises(BadRequest):
+        save_current_levels(1234, 'fake_token', b'not json')
+    mock_db.assert_not_called()
+
+
 @patch('svc.controllers.sump_controller.UserDatabaseManager')
-def test_get_sump_level__should_call_get_average_sump_level_by_user(mock_database, mock_jwt):
+def test_backfill_average_levels__should_call_backfill_average_sump_levels(mock_db):
     user_id = 'fake1234'
-    bearer_token = 'lkhasdhlufiou0892390784'
+    mock_db.return_value.__enter__.return_value.backfill_average_sump_levels.return_value = {'days': 4}
 
-    get_sump_level(user_id, bearer_token)
+    actual = backfill_average_levels(user_id)
+
+    assert actual == {'days': 4}
+    mock_db.return_value.__enter__.return_value.backfill_average_sump_levels.assert_called_with(user_id)
 
-    mock_database.return_value.__enter__.return_value.get_average_sump_level_by_user.assert_called_with(user_id)
 
 
 @patch('svc.controllers.sump_controller.UserDatabaseManager')
 @patch('svc.controllers.sump_controller.is_jwt_valid')
-def test_save_current_level__should_call_is_jwt_valid(mock_jwt, mock_db):
-    user_id = 1234
+def test_get_sump_levels__should_call_is_jwt_valid(mock_jwt, mock_db):
     bearer_token = 'fake_token'
-    request = json.dumps({'depth': 'test'})
+    mock_db.return_value.__enter__.return_value.get_sump_levels_by_user.return_value = []
 
-    save_current_level(user_id, bearer_token, request)
+    get_sump_levels('fake1234', bearer_token, '2021-01-01', '2021-01-02', '10')
 
     mock_jwt.assert_called_with(bearer_token)
 
 
 @patch('svc.controllers.sump_controller.UserDatabaseManager')
 @patch('svc.controllers.sump_controller.is_jwt_valid')
-def test_save_current_level__should_call_save_current_sump_level(mock_jwt, mock_db):
-    user_id = 1234
-    bearer_token = 'fake_token'
-    depth_info = {'depth': 'test'}
-    request = json.dumps(depth_info)
+def test_get_sump_levels__should_query_readings_in_range(mock_jwt, mock_db):
+    user_id = 'fake1234'
+    mock_db.return_value.__enter__.return_value.get_sump_levels_by_user.return_value = []
 
-    save_current_level(user_id, bearer_token, request)
+    get_sump_levels(user_id, 'fake_token', '2021-01-01', '2021-01-02T12:00:00', '10')
 
-    mock_db.return_value.__enter__.return_value.insert_current_sump_level.assert_called_with(user_id, depth_info)
+    mock_db.return_value.__enter__.return_value.get_sump_levels_by_user.assert_called_with(user_id, datetime(2021, 1, 1), datetime(2021, 1, 2, 12))
+
+
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_get_sump_levels__should_return_downsampled_levels(mock_jwt, mock_db):
+    database = mock_db.return_value.__enter__.return_value
+    database.get_preferences_by_user.return_value = {'is_imperial': False}
+    database.get_sump_levels_by_user.return_value = [(datetime(2021, 1, 1, 1), 10.0), (datetime(2021, 1, 1, 2), 14.0), (datetime(2021, 1, 1, 13), 20.0)]
+
+    actual = get_sump_levels('fake1234', 'fake_token', '2021-01-01', '2021-01-02', '2')
+
+    assert actual == {'depthUnit': 'cm', 'from': '2021-01-01T00:00:00', 'to': '2021-01-02T00:00:00',
+                      'levels': [{'date': '2021-01-01T00:00:00', 'minDepth': 10.0, 'maxDepth': 14.0, 'averageDepth': 12.0, 'count': 2},
+                                 {'date': '2021-01-01T12:00:00', 'minDepth': 20.0, 'maxDepth': 20.0, 'averageDepth': 20.0, 'count': 1}]}
+
+
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_get_sump_levels__should_convert_levels_to_imperial(mock_jwt, mock_db):
+    database = mock_db.return_value.__enter__.return_value
+    database.get_preferences_by_user.return_value = {'is_imperial': True}
+    database.get_sump_levels_by_user.return_value = [(datetime(2021, 1, 1, 1), 2.54), (datetime(2021, 1, 1, 2), 7.62)]
+
+    actual = get_sump_levels('fake1234', 'fake_token', '2021-01-01', '2021-01-02', '1')
+
+    assert actual['depthUnit'] == 'in'
+    assert actual['levels'][0]['minDepth'] == 1.0
+    assert actual['levels'][0]['maxDepth'] == 3.0
+    assert actual['levels'][0]['averageDepth'] == 2.0
+
+
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_get_sump_levels__should_default_points(mock_jwt, mock_db):
+    database = mock_db.return_value.__enter__.return_value
+    database.get_sump_levels_by_user.return_value = [(datetime(2021, 1, 1, 0, minute), 1.0) for minute in range(60)]
+
+    actual = get_sump_levels('fake1234', 'fake_token', '2021-01-01T00:00:00', '2021-01-01T01:00:00', None)
+
+    assert len(actual['levels']) == 60
+
+
+@pytest.mark.parametrize('start, end, points', [(None, '2021-01-02', '10'),
+                                                ('yesterday', '2021-01-02', '10'),
+                                                ('2021-01-02', '2021-01-01', '10'),
+                                                ('2021-01-01T00:00:00+00:00', '2021-01-02T00:00:00+00:00', '10'),
+                                                ('2021-01-01T00:00:00-05:00', '2021-01-02', '10'),
+                                                ('2021-01-01', '2021-01-02', 'many'),
+                                                ('2021-01-01', '2021-01-02', '0'),
+                                                ('2021-01-01', '2021-01-02', '100000')])
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+@patch('svc.controllers.sump_controller.is_jwt_valid')
+def test_get_sump_levels__should_raise_bad_request_for_invalid_range(mock_jwt, mock_db, start, end, points):
+    with pytest.raises(BadRequest):
+        get_sump_levels('fake1234', 'fake_token', start, end, points)
+    mock_db.assert_not_called()
+
+
+
+@patch('svc.controllers.sump_controller.UserDatabaseManager')
+def test_maintain_partitions__should_use_database_settings(mock_db):
+    Settings.get_instance().Database._settings = {'SumpPartitionsAhead': 2, 'SumpRetentionDays': 180}
+    try:
+        maintain_partitions()
+    finally:
+        Settings.get_instance().Database._settings = None
+
+    mock_db.return_value.__enter__.return_value.maintain_sump_partitions.assert_called_with(2, 180)
@@ -1,16 +1,20 @@
 import uuid
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 
 import pytest
 import pytz
 from mock import mock, patch
 from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
 from werkzeug.exceptions import BadRequest, Unauthorized, Forbidden
 
-from svc.db.methods.user_credentials import UserDatabase
+from svc.db.methods.user_credentials import UserDatabase, PENDING_INVALIDATIONS
 from svc.db.models.user_information_model import UserPreference, UserCredentials, DailySumpPumpLevel, \
     AverageSumpPumpLevel, Roles, UserInformation, UserRoles, RoleDevices, RoleDeviceNodes, ChildAccounts, ScheduleTasks, \
     ScheduledTaskTypes, Scenes, SceneDetails, RefreshToken
+from svc.constants.home_automation import CacheNamespace
+from svc.utilities.cache_utils import SharedCache
 
 
 class TestUserDatabase:
@@ -28,6 +32,7 @@ class TestUserDatabase:
     def setup_method(self, _):
         self.SESSION = mock.create_autospec(orm.scoped_session)
         self.DATABASE = UserDatabase(self.SESSION)
+        SharedCache.get_instance().clear()
 
     def test_validate_credentials__should_query_database_by_user_name(self):
         user = self.__create_database_user()
@@ -255,6 +260,153 @@ class TestUserDatabase:
 
         assert actual['roles'] == [{'role_name': self.ROLE_NAME }]
 
+    def test_get_roles_by_user__should_only_query_database_once_for_repeated_calls(self):
+        user = self.__create_database_user()
+        user.user_roles = [UserRoles(role=Roles(role_name=self.ROLE_NAME))]
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = user
+        self.DATABASE.get_roles_by_user(self.USER_ID)
+
+        actual = self.DATABASE.get_roles_by_user(self.USER_ID)
+
+        assert self.SESSION.query.call_count == 1
+        assert actual == {'roles': [{'role_name': self.ROLE_NAME}]}
+
+    def test_add_new_role_device__should_invalidate_cached_roles(self):
+        SharedCache.get_instance().set(CacheNamespace.ROLES, self.USER_ID, {'roles': []}, 60)
+        user_role = UserRoles(id=self.ROLE_ID, role=Roles(role_name=self.ROLE_NAME))
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+        self.SESSION.query.return_value.filter_by.return_value.all.return_value = [user_role]
+        self.DATABASE.add_new_role_device(self.USER_ID, self.ROLE_NAME, '192.168.1.1')
+
+        assert SharedCache.get_instance().get(CacheNamespace.ROLES, self.USER_ID) is None
+
+    def test_delete_child_user_account__should_invalidate_cached_child_data(self):
+        child_id = str(uuid.uuid4())
+        SharedCache.get_instance().set(CacheNamespace.ROLES, child_id, {'roles': []}, 60)
+        SharedCache.get_instance().set(CacheNamespace.PREFERENCES, child_id, {'city': 'Ames'}, 60)
+        self.DATABASE.delete_child_user_account(self.USER_ID, child_id)
+
+        assert SharedCache.get_instance().get(CacheNamespace.ROLES, child_id) is None
+        assert SharedCache.get_instance().get(CacheNamespace.PREFERENCES, child_id) is None
+
+    def test_delete_child_user_account__should_invalidate_child_caches_again_after_commit(self):
+        child_id = str(uuid.uuid4())
+        self.SESSION.info = {}
+        self.DATABASE.delete_child_user_account(self.USER_ID, child_id)
+
+        assert {(CacheNamespace.ROLES, child_id), (CacheNamespace.OWNERS, child_id)} <= self.SESSION.info[PENDING_INVALIDATIONS]
+
+    def test_invalidate_committed_caches__should_drop_entries_cached_before_commit(self):
+        session = orm.Session()
+        session.info[PENDING_INVALIDATIONS] = {(CacheNamespace.ROLES, self.USER_ID)}
+        SharedCache.get_instance().set(CacheNamespace.ROLES, self.USER_ID, {'roles': []}, 60)
+        session.commit()
+
+        assert SharedCache.get_instance().get(CacheNamespace.ROLES, self.USER_ID) is None
+        assert PENDING_INVALIDATIONS not in session.info
+
+    def test_invalidate_committed_caches__should_wait_for_outer_transaction(self):
+        session = orm.Session(autocommit=True)
+        session.begin()
+        session.begin(subtransactions=True)
+        session.info[PENDING_INVALIDATIONS] = {(CacheNamespace.ROLES, self.USER_ID)}
+        SharedCache.get_instance().set(CacheNamespace.ROLES, self.USER_ID, {'roles': []}, 60)
+        session.commit()
+
+        assert SharedCache.get_instance().get(CacheNamespace.ROLES, self.USER_ID) is not None
+        session.commit()
+        assert SharedCache.get_instance().get(CacheNamespace.ROLES, self.USER_ID) is None
+
+    def test_delete_child_user_account__should_invalidate_cached_owner(self):
+        child_id = str(uuid.uuid4())
+        SharedCache.get_instance().set(CacheNamespace.OWNERS, child_id, self.USER_ID, 60)
+        self.DATABASE.delete_child_user_account(self.USER_ID, child_id)
+
+        assert SharedCache.get_instance().get(CacheNamespace.OWNERS, child_id) is None
+
+    def test_get_owner_id__should_return_user_id_when_not_a_child(self):
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+
+        assert self.DATABASE.get_owner_id(self.USER_ID) == self.USER_ID
+        self.SESSION.query.return_value.filter_by.assert_called_with(child_user_id=self.USER_ID)
+
+    def test_get_owner_id__should_return_parent_id_for_child(self):
+        parent_id = str(uuid.uuid4())
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = ChildAccounts(parent_user_id=parent_id, child_user_id=self.USER_ID)
+
+        assert self.DATABASE.get_owner_id(self.USER_ID) == parent_id
+
+    def test_get_owner_id__should_cache_owner(self):
+        parent_id = str(uuid.uuid4())
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = ChildAccounts(parent_user_id=parent_id, child_user_id=self.USER_ID)
+        self.DATABASE.get_owner_id(self.USER_ID)
+        actual = UserDatabase(self.SESSION).get_owner_id(self.USER_ID)
+
+        assert actual == parent_id
+        assert self.SESSION.query.call_count == 1
+
+    def test_get_current_sump_level_by_user__should_use_cached_owner(self):
+        parent_id = str(uuid.uuid4())
+        SharedCache.get_instance().set(CacheNamespace.OWNERS, self.USER_ID, parent_id, 60)
+        self.SESSION.query.return_value.filter_by.return_value.order_by.return_value.first.return_value = DailySumpPumpLevel(distance=1.0, warning_level=1)
+        self.DATABASE.get_current_sump_level_by_user(self.USER_ID)
+
+        self.SESSION.query.assert_called_once_with(DailySumpPumpLevel)
+        self.SESSION.query.return_value.filter_by.assert_called_with(user_id=parent_id)
+
+    def test_get_sump_summary_by_user__should_return_current_average_and_unit(self):
+        summary_query = self.SESSION.query.return_value.select_from.return_value.outerjoin.return_value.outerjoin.return_value.filter.return_value
+        summary_query.first.return_value = (Decimal('12.5'), 2, Decimal('11.25'), self.NOW.date(), True)
+        SharedCache.get_instance().set(CacheNamespace.OWNERS, self.USER_ID, self.USER_ID, 60)
+
+        actual = self.DATABASE.get_sump_summary_by_user(self.USER_ID)
+
+        assert actual == {'currentDepth': 12.5, 'warningLevel': 2, 'averageDepth': 11.25, 'latestDate': self.NOW.date(), 'is_imperial': True}
+
+    def test_get_sump_summary_by_user__should_make_one_round_trip_with_cached_owner(self):
+        summary_query = self.SESSION.query.return_value.select_from.return_value.outerjoin.return_value.outerjoin.return_value.filter.return_value
+        summary_query.first.return_value = (12.5, 2, 11.25, self.NOW.date(), True)
+        SharedCache.get_instance().set(CacheNamespace.OWNERS, self.USER_ID, self.USER_ID, 60)
+
+        self.DATABASE.get_sump_summary_by_user(self.USER_ID)
+
+        summary_query.first.assert_called_once()
+        self.SESSION.query.return_value.filter_by.assert_not_called()
+        self.SESSION.execute.assert_not_called()
+
+    def test_get_sump_summary_by_user__should_raise_bad_request_when_no_preferences(self):
+        summary_query = self.SESSION.query.return_value.select_from.return_value.outerjoin.return_value.outerjoin.return_value.filter.return_value
+        summary_query.first.return_value = None
+        with pytest.raises(BadRequest):
+            self.DATABASE.get_sump_summary_by_user(self.USER_ID)
+
+    def test_get_sump_summary_by_user__should_raise_bad_request_when_no_readings(self):
+        summary_query = self.SESSION.query.return_value.select_from.return_value.outerjoin.return_value.outerjoin.return_value.filter.return_value
+        summary_query.first.return_value = (None, None, None, None, False)
+        with pytest.raises(BadRequest):
+            self.DATABASE.get_sump_summary_by_user(self.USER_ID)
+
+    def test_get_sump_summary_by_user__should_raise_bad_request_when_user_id_is_none(self):
+        with pytest.raises(BadRequest):
+            self.DATABASE.get_sump_summary_by_user(None)
+        self.SESSION.query.assert_not_called()
+
+    def test_add_new_role_device__should_invalidate_cached_garage_url(self):
+        SharedCache.get_instance().set(CacheNamespace.GARAGE_URLS, self.USER_ID, 'http://192.168.1.2', 60)
+        user_role = UserRoles(id=self.ROLE_ID, role=Roles(role_name=self.ROLE_NAME))
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+        self.SESSION.query.return_value.filter_by.return_value.all.return_value = [user_role]
+        self.DATABASE.add_new_role_device(self.USER_ID, self.ROLE_NAME, '192.168.1.1')
+
+        assert SharedCache.get_instance().get(CacheNamespace.GARAGE_URLS, self.USER_ID) is None
+
+    def test_delete_child_user_account__should_invalidate_cached_garage_url(self):
+        child_id = str(uuid.uuid4())
+        SharedCache.get_instance().set(CacheNamespace.GARAGE_URLS, child_id, 'http://192.168.1.2', 60)
+        self.DATABASE.delete_child_user_account(self.USER_ID, child_id)
+
+        assert SharedCache.get_instance().get(CacheNamespace.GARAGE_URLS, child_id) is None
+
     def test_get_preferences_by_user__should_return_user_temp_preferences(self):
         user = TestUserDatabase.__create_database_user()
         preference = TestUserDatabase.__create_user_preference(user)
@@ -347,6 +499,44 @@ class TestUserDatabase:
 
         assert actual['garage_door'] == 'Jons'
 
+    def test_get_preferences_by_user__should_only_query_database_once_for_repeated_calls(self):
+        user = TestUserDatabase.__create_database_user()
+        preference = TestUserDatabase.__create_user_preference(user)
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = preference
+        self.DATABASE.get_preferences_by_user(self.USER_ID)
+        self.DATABASE.get_preferences_by_user(self.USER_ID)
+
+        assert self.SESSION.query.call_count == 1
+
+    def test_get_preferences_by_user__should_return_cached_preferences(self):
+        user = TestUserDatabase.__create_database_user()
+        preference = TestUserDatabase.__create_user_preference(user, 'Fake City')
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = preference
+        expected = self.DATABASE.get_preferences_by_user(self.USER_ID)
+
+        actual = self.DATABASE.get_preferences_by_user(self.USER_ID)
+
+        assert actual == expected
+
+    def test_get_preferences_by_user__should_record_cache_hits_and_misses(self):
+        user = TestUserDatabase.__create_database_user()
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = TestUserDatabase.__create_user_preference(user)
+        self.DATABASE.get_preferences_by_user(self.USER_ID)
+        self.DATABASE.get_preferences_by_user(self.USER_ID)
+
+        stats = SharedCache.get_instance().get_stats()
+        assert stats[CacheNamespace.PREFERENCES] == {'hits': 1, 'misses': 1}
+
+    def test_insert_preferences_by_user__should_invalidate_cached_preferences(self):
+        user = TestUserDatabase.__create_database_user()
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = TestUserDatabase.__create_user_preference(user)
+        self.DATABASE.get_preferences_by_user(self.USER_ID)
+        self.DATABASE.insert_preferences_by_user(self.USER_ID, {'city': 'Ames'})
+
+        actual = self.DATABASE.get_preferences_by_user(self.USER_ID)
+
+        assert actual['city'] == 'Ames'
+
     def test_insert_preferences_by_user__should_call_query(self):
         preference_info = {'isFahrenheit': True, 'isImperial': True, 'city': 'Des Moines', 'lightAlarm': {}}
         user_id = str(uuid.uuid4())
@@ -437,15 +627,80 @@ class TestUserDatabase:
             self.DATABASE.get_average_sump_level_by_user(None)
         self.SESSION.query.assert_not_called()
 
+    def test_get_sump_levels_by_user__should_stream_readings_in_date_order(self):
+        start, end = datetime(2021, 1, 1), datetime(2021, 1, 8)
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+        self.DATABASE.get_sump_levels_by_user(self.USER_ID, start, end)
+
+        self.SESSION.query.assert_called_with(DailySumpPumpLevel.create_date, DailySumpPumpLevel.distance)
+        self.SESSION.query.return_value.filter.return_value.order_by.return_value.yield_per.assert_called_with(UserDatabase.STREAM_BATCH_SIZE)
+
+    def test_get_sump_levels_by_user__should_filter_by_user_and_range(self):
+        start, end = datetime(2021, 1, 1), datetime(2021, 1, 8)
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+        self.DATABASE.get_sump_levels_by_user(self.USER_ID, start, end)
+
+        criteria = self.SESSION.query.return_value.filter.call_args.args
+        assert [(criterion.left.name, criterion.operator.__name__, criterion.right.value) for criterion in criteria] == \
+            [('user_id', 'eq', self.USER_ID), ('create_date', 'ge', start), ('create_date', 'lt', end)]
+
+    def test_get_sump_levels_by_user__should_query_parent_readings_for_child(self):
+        parent_id = str(uuid.uuid4())
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = ChildAccounts(parent_user_id=parent_id, child_user_id=self.USER_ID)
+        self.DATABASE.get_sump_levels_by_user(self.USER_ID, datetime(2021, 1, 1), datetime(2021, 1, 8))
+
+        assert self.SESSION.query.return_value.filter.call_args.args[0].right.value == parent_id
+
+    def test_get_sump_levels_by_user__should_raise_bad_request_when_user_id_is_none(self):
+        with pytest.raises(BadRequest):
+            self.DATABASE.get_sump_levels_by_user(None, datetime(2021, 1, 1), datetime(2021, 1, 8))
+        self.SESSION.query.assert_not_called()
+
+    def test_maintain_sump_partitions__should_create_and_drop_partitions(self):
+        self.SESSION.execute.return_value.scalar.side_effect = [2, 1]
+        actual = self.DATABASE.maintain_sump_partitions(3, 365)
+
+        assert actual == {'created': 2, 'dropped': 1}
+        calls = self.SESSION.execute.call_args_list
+        assert str(calls[0].args[0]) == 'SELECT create_daily_sump_level_partitions(current_date, :months_ahead)'
+        assert calls[0].args[1] == {'months_ahead': 3}
+        assert str(calls[1].args[0]) == 'SELECT drop_daily_sump_level_partitions(:retention_days)'
+        assert calls[1].args[1] == {'retention_days': 365}
+
+    def test_maintain_sump_partitions__should_keep_partitions_when_retention_disabled(self):
+        self.SESSION.execute.return_value.scalar.return_value = 0
+        actual = self.DATABASE.maintain_sump_partitions(3, 0)
+
+        assert actual == {'created': 0, 'dropped': 0}
+        assert self.SESSION.execute.call_count == 1
+
     def test_insert_current_sump_level__should_call_add(self):
         user_id = 1234
-        depth_info = {'datetime': None,
+        depth_info = {'datetime': '2021-01-01 10:00:00.123456',
                       'warning_level': 1,
-                      'depth': None}
+                      'depth': 12.3}
         self.DATABASE.insert_current_sump_level(user_id, depth_info)
 
         self.SESSION.add.assert_called()
 
+    def test_insert_current_sump_level__should_update_daily_average(self):
+        depth_info = {'datetime': '2021-01-01 10:00:00', 'warning_level': 1, 'depth': 12.5}
+        self.DATABASE.insert_current_sump_level(self.USER_ID, depth_info)
+
+        statement = self.SESSION.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert 'ON CONFLICT (user_id, create_day) DO UPDATE' in str(statement)
+        assert statement.params['create_day_m0'] == date(2021, 1, 1)
+        assert statement.params['reading_count_m0'] == 1
+        assert statement.params['distance_sum_m0'] == 12.5
+        assert statement.params['distance_m0'] == 12.5
+
+    def test_insert_current_sump_level__should_raise_bad_request_when_depth_invalid(self):
+        depth_info = {'datetime': '2021-01-01 10:00:00', 'warning_level': 1, 'depth': 'deep'}
+        with pytest.raises(BadRequest):
+            self.DATABASE.insert_current_sump_level(self.USER_ID, depth_info)
+        self.SESSION.add.assert_not_called()
+        self.SESSION.execute.assert_not_called()
+
     def test_insert_current_sump_level__should_raise_bad_request_when_depth_info_none(self):
         depth_info = None
         user_id = 1234
@@ -466,6 +721,87 @@ class TestUserDatabase:
         with pytest.raises(BadRequest):
             self.DATABASE.insert_current_sump_level(user_id, depth_info)
 
+    def test_insert_sump_levels__should_insert_all_valid_readings_in_one_statement(self):
+        readings = [{'depth': 12.3, 'warning_level': 1, 'datetime': '2021-01-01 10:00:00.123456'},
+                    {'depth': '11.1', 'warning_level': '2', 'datetime': '2021-01-01 10:05:00'}]
+        actual = self.DATABASE.insert_sump_levels(self.USER_ID, readings)
+
+        assert actual == {'inserted': 2, 'errors': []}
+        assert self.SESSION.execute.call_count == 2
+        self.SESSION.add.assert_not_called()
+
+    def test_insert_sump_levels__should_convert_reading_values(self):
+        readings = [{'depth': '12.3', 'warning_level': '1', 'datetime': '2021-01-01 10:00:00'}]
+        self.DATABASE.insert_sump_levels(self.USER_ID, readings)
+
+        statement = self.SESSION.execute.call_args_list[0].args[0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params['distance_m0'] == 12.3
+        assert params['warning_level_m0'] == 1
+        assert params['create_date_m0'] == datetime(2021, 1, 1, 10, 0, 0)
+        assert params['user_id_m0'] == self.USER_ID
+
+    def test_insert_sump_levels__should_report_invalid_rows_and_insert_the_rest(self):
+        readings = [{'depth': 12.3, 'warning_level': 1, 'datetime': '2021-01-01 10:00:00'},
+                    {'warning_level': 1, 'datetime': '2021-01-01 10:05:00'},
+                    {'depth': 'deep', 'warning_level': 1, 'datetime': '2021-01-01 10:10:00'},
+                    None]
+        actual = self.DATABASE.insert_sump_levels(self.USER_ID, readings)
+
+        assert actual == {'inserted': 1, 'errors': [{'index': 1, 'message': 'missing depth'},
+                                                    {'index': 2, 'message': 'invalid reading'},
+                                                    {'index': 3, 'message': 'invalid reading'}]}
+
+    def test_insert_sump_levels__should_not_execute_when_no_valid_rows(self):
+        actual = self.DATABASE.insert_sump_levels(self.USER_ID, [{'depth': 1}])
+
+        assert actual['inserted'] == 0
+        self.SESSION.execute.assert_not_called()
+
+    def test_insert_sump_levels__should_chunk_large_batches(self):
+        readings = [{'depth': 1, 'warning_level': 0, 'datetime': '2021-01-01 10:00:00'}] * (UserDatabase.BULK_INSERT_CHUNK + 1)
+        self.DATABASE.insert_sump_levels(self.USER_ID, readings)
+
+        assert self.SESSION.execute.call_count == 3
+
+    def test_insert_sump_levels__should_update_one_average_per_day(self):
+        readings = [{'depth': 10, 'warning_level': 0, 'datetime': '2021-01-01 10:00:00'},
+                    {'depth': 14, 'warning_level': 0, 'datetime': '2021-01-01 22:00:00'},
+                    {'depth': 20, 'warning_level': 1, 'datetime': '2021-01-02 01:00:00'}]
+        self.DATABASE.insert_sump_levels(self.USER_ID, readings)
+
+        params = self.SESSION.execute.call_args.args[0].compile(dialect=postgresql.dialect()).params
+        assert (params['create_day_m0'], params['reading_count_m0'], params['distance_m0']) == (date(2021, 1, 1), 2, 12.0)
+        assert (params['distance_min_m0'], params['distance_max_m0']) == (10.0, 14.0)
+        assert (params['create_day_m1'], params['reading_count_m1'], params['distance_m1']) == (date(2021, 1, 2), 1, 20.0)
+        assert 'create_day_m2' not in params
+
+    def test_backfill_average_sump_levels__should_upsert_aggregates_from_readings(self):
+        self.SESSION.execute.return_value.rowcount = 3
+        actual = self.DATABASE.backfill_average_sump_levels()
+
+        statement = str(self.SESSION.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert actual == {'days': 3}
+        assert 'GROUP BY daily_sump_level.user_id, CAST(daily_sump_level.create_date AS DATE)' in statement
+        assert 'ON CONFLICT (user_id, create_day) DO UPDATE' in statement
+        assert 'WHERE' not in statement
+
+    def test_backfill_average_sump_levels__should_filter_by_user(self):
+        self.DATABASE.backfill_average_sump_levels(self.USER_ID)
+
+        statement = self.SESSION.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert 'WHERE daily_sump_level.user_id = ' in str(statement)
+        assert self.USER_ID in statement.params.values()
+
+    def test_insert_sump_levels__should_raise_bad_request_when_readings_not_a_list(self):
+        with pytest.raises(BadRequest):
+            self.DATABASE.insert_sump_levels(self.USER_ID, {'depth': 1})
+        self.SESSION.execute.assert_not_called()
+
+    def test_insert_sump_levels__should_raise_bad_request_when_user_id_is_none(self):
+        with pytest.raises(BadRequest):
+            self.DATABASE.insert_sump_levels(None, [])
+
     def test_change_user_password__should_raise_bad_request_if_password_mismatch(self):
         user = self.__create_database_user(password='mismatched')
         new_pass = 'newPass'
@@ -585,6 +921,25 @@ class TestUserDatabase:
         assert pref.garage_door == node_name
         assert pref.garage_id == 2
 
+    def test_add_new_device_node__should_invalidate_cached_preferences_when_preferred(self):
+        SharedCache.get_instance().set(CacheNamespace.PREFERENCES, self.USER_ID, {'garage_door': 'old'}, 60)
+        devices = RoleDevices(max_nodes=2, role_device_nodes=[RoleDeviceNodes()])
+        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [devices, UserPreference(user_id=self.USER_ID)]
+        self.DATABASE.add_new_device_node(self.USER_ID, self.ROLE_ID, 'Jons Door', True)
+
+        assert SharedCache.get_instance().get(CacheNamespace.PREFERENCES, self.USER_ID) is None
+
+    def test_add_new_device_node__should_invalidate_cached_garage_urls(self):
+        parent_id = str(uuid.uuid4())
+        SharedCache.get_instance().set(CacheNamespace.GARAGE_URLS, self.USER_ID, 'http://192.168.1.2', 60)
+        SharedCache.get_instance().set(CacheNamespace.GARAGE_URLS, parent_id, 'http://192.168.1.2', 60)
+        devices = RoleDevices(max_nodes=2, role_device_nodes=[], parent=UserRoles(user_id=parent_id))
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = devices
+        self.DATABASE.add_new_device_node(self.USER_ID, self.ROLE_ID, 'Jons Door', False)
+
+        assert SharedCache.get_instance().get(CacheNamespace.GARAGE_URLS, self.USER_ID) is None
+        assert SharedCache.get_instance().get(CacheNamespace.GARAGE_URLS, parent_id) is None
+
     def test_add_new_device_node__should_query_the_role_devices_by_role_id(self):
         node_name = 'test name'
         devices = RoleDevices(max_nodes=2, role_device_nodes=[RoleDeviceNodes()])
@@ -652,18 +1007,16 @@ class TestUserDatabase:
         self.SESSION.query.assert_not_called()
 
     def test_create_child_account__should_query_user_creds_by_user_id(self):
-        user_info = UserInformation()
-        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [None, UserCredentials(user=user_info), UserPreference()]
+        self.__set_child_account_queries(UserCredentials(user=UserInformation()))
         self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
 
         self.SESSION.query.return_value.filter_by.assert_any_call(user_id=self.USER_ID)
 
     @patch('svc.db.methods.user_credentials.UserCredentials')
     def test_create_child_account__should_update_the_user_id_and_insert_user(self, mock_user):
-        user_info = UserInformation()
         new_user = UserCredentials()
         mock_user.return_value = new_user
-        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [None, UserCredentials(user=user_info), UserPreference(), UserCredentials()]
+        self.__set_child_account_queries(UserCredentials(user=UserInformation()))
         self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
 
         self.SESSION.add.assert_any_call(new_user)
@@ -672,7 +1025,7 @@ class TestUserDatabase:
     def test_create_child_account__should_insert_user_info(self, mock_info):
         new_info = UserInformation()
         mock_info.return_value = new_info
-        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [None, UserCredentials(user=UserInformation()), UserPreference()]
+        self.__set_child_account_queries(UserCredentials(user=UserInformation()))
         self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
 
         self.SESSION.add.assert_any_call(new_info)
@@ -682,13 +1035,64 @@ class TestUserDatabase:
         role = Roles(role_name='security')
         user_role = UserRoles(role=role)
         mock_roles.return_value = user_role
-        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [None, UserCredentials(user=UserInformation(), user_roles=[user_role]), UserPreference(), UserCredentials()]
+        self.__set_child_account_queries(UserCredentials(user=UserInformation(), user_roles=[user_role]))
         self.DATABASE.create_child_account(self.USER_ID, "", ['security'], self.FAKE_PASS)
 
         self.SESSION.add.assert_any_call(user_role)
 
+    def test_create_child_account__should_insert_role_device_nodes_in_one_call(self):
+        nodes = [RoleDeviceNodes(node_name='first', node_device=1), RoleDeviceNodes(node_name='second', node_device=2)]
+        device = RoleDevices(ip_address='0.0.0.0', max_nodes=2, role_device_nodes=nodes)
+        user_role = UserRoles(role=Roles(role_name='security'), role_devices=device)
+        self.__set_child_account_queries(UserCredentials(user=UserInformation(), user_roles=[user_role]))
+        self.DATABASE.create_child_account(self.USER_ID, "", ['security'], self.FAKE_PASS)
+
+        new_nodes = self.SESSION.add_all.call_args.args[0]
+        assert [(node.node_name, node.node_device) for node in new_nodes] == [('first', 1), ('second', 2)]
+
+    def test_create_child_account__should_flush_new_user_before_duplicating_roles(self):
+        user_role = UserRoles(role=Roles(role_name='security'))
+        self.__set_child_account_queries(UserCredentials(user=UserInformation(), user_roles=[user_role]))
+        self.DATABASE.create_child_account(self.USER_ID, "", ['security'], self.FAKE_PASS)
+
+        flush_index = self.SESSION.mock_calls.index(mock.call.flush())
+        role_index = next(index for index, call in enumerate(self.SESSION.mock_calls) if call[0] == 'add' and isinstance(call.args[0], UserRoles))
+        assert flush_index < role_index
+
+    def test_create_child_account__should_not_commit_transaction(self):
+        self.__set_child_account_queries(UserCredentials(user=UserInformation(), user_roles=[UserRoles(role=Roles(role_name='security'))]))
+        self.DATABASE.create_child_account(self.USER_ID, "", ['security'], self.FAKE_PASS)
+
+        self.SESSION.commit.assert_not_called()
+
+    @patch('svc.db.methods.user_credentials.uuid')
+    def test_create_child_account__should_invalidate_cached_preferences_for_new_user(self, mock_uuid):
+        new_user_id = str(uuid.uuid4())
+        mock_uuid.uuid4.return_value = new_user_id
+        SharedCache.get_instance().set(CacheNamespace.PREFERENCES, new_user_id, {'city': 'stale'}, 60)
+        self.__set_child_account_queries(UserCredentials(user=UserInformation()))
+        self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
+
+        assert SharedCache.get_instance().get(CacheNamespace.PREFERENCES, new_user_id) is None
+
+    @patch('svc.db.methods.user_credentials.uuid')
+    def test_create_child_account__should_invalidate_cached_owner_for_new_user(self, mock_uuid):
+        new_user_id = str(uuid.uuid4())
+        mock_uuid.uuid4.return_value = new_user_id
+        SharedCache.get_instance().set(CacheNamespace.OWNERS, new_user_id, new_user_id, 60)
+        self.__set_child_account_queries(UserCredentials(user=UserInformation()))
+        self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
+
+        assert SharedCache.get_instance().get(CacheNamespace.OWNERS, new_user_id) is None
+
+    def test_create_child_account__should_raise_bad_request_when_user_is_a_child(self):
+        SharedCache.get_instance().set(CacheNamespace.OWNERS, self.USER_ID, str(uuid.uuid4()), 60)
+        self.__set_child_account_queries(UserCredentials(user=UserInformation()))
+        with pytest.raises(BadRequest):
+            self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
+
     def test_create_child_account__should_throw_bad_request_when_no_user(self):
-        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+        self.__set_child_account_queries(None)
         with pytest.raises(BadRequest):
             self.DATABASE.create_child_account(self.USER_ID, "", [], self.FAKE_PASS)
 
@@ -696,53 +1100,46 @@ class TestUserDatabase:
         user_id = uuid.uuid4()
         role_name = 'test_role'
         user_name = 'im_a_test_user'
-        user_info = UserInformation()
-        role = Roles(role_name=role_name)
-        user_roles = UserRoles(role=role)
-        account = ChildAccounts(child_user_id=user_id)
-        creds = UserCredentials(user_roles=[user_roles], user_name=user_name, user=user_info)
-        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [None, creds, UserPreference(), creds]
-        self.SESSION.query.return_value.filter_by.return_value.all.return_value = [account]
+        creds = UserCredentials(user_roles=[UserRoles(role=Roles(role_name=role_name))], user_name=user_name, user=UserInformation())
+        child = UserCredentials(user_roles=[UserRoles(role=Roles(role_name=role_name))], user_name=user_name, user_id=user_id)
+        self.__set_child_account_queries(creds)
+        self.SESSION.query.return_value.join.return_value.filter.return_value.options.return_value.all.return_value = [child]
 
         actual = self.DATABASE.create_child_account(self.USER_ID, user_name, [], self.FAKE_PASS)
         assert actual == [{'user_name': user_name, 'user_id': user_id, 'roles': [role_name]}]
 
     def test_get_user_child_accounts__should_query_children_accounts(self):
         self.DATABASE.get_user_child_accounts(self.USER_ID)
-        self.SESSION.query.return_value.filter_by.assert_called_with(parent_user_id=self.USER_ID)
+
+        criteria = self.SESSION.query.return_value.join.return_value.filter.call_args.args[0]
+        assert (criteria.left.name, criteria.operator.__name__, criteria.right.value) == ('parent_user_id', 'eq', self.USER_ID)
 
     def test_get_user_child_accounts__should_return_bad_request_when_user_id_is_none(self):
         with pytest.raises(BadRequest):
             self.DATABASE.get_user_child_accounts(None)
         self.SESSION.query.assert_not_called()
 
-    def test_get_user_child_accounts__should_query_credentials_by_each_user_id(self):
-        user_id_one = uuid.uuid4()
-        user_id_two = uuid.uuid4()
-        account_one = ChildAccounts(child_user_id=user_id_one)
-        account_two = ChildAccounts(child_user_id=user_id_two)
-        self.SESSION.query.return_value.filter_by.return_value.all.return_value = [account_one, account_two]
+    def test_get_user_child_accounts__should_load_children_in_a_single_query(self):
+        children = [UserCredentials(user_roles=[], user_name='first', user_id=uuid.uuid4()),
+                    UserCredentials(user_roles=[], user_name='second', user_id=uuid.uuid4())]
+        self.SESSION.query.return_value.join.return_value.filter.return_value.options.return_value.all.return_value = children
         self.DATABASE.get_user_child_accounts(self.USER_ID)
 
-        self.SESSION.query.return_value.filter_by.assert_any_call(user_id=user_id_one)
-        self.SESSION.query.return_value.filter_by.assert_any_call(user_id=user_id_two)
+        self.SESSION.query.assert_called_once_with(UserCredentials)
+        self.SESSION.query.return_value.filter_by.assert_not_called()
 
     def test_get_user_child_accounts__should_return_user_name_and_roles_per_user(self):
         user_id = uuid.uuid4()
         role_name = 'test_role'
         user_name = 'im_a_test_user'
-        account = ChildAccounts(child_user_id=user_id)
-        role = Roles(role_name=role_name)
-        user_roles = UserRoles(role=role)
-        creds = UserCredentials(user_roles=[user_roles], user_name=user_name)
-        self.SESSION.query.return_value.filter_by.return_value.all.return_value = [account]
-        self.SESSION.query.return_value.filter_by.return_value.first.return_value = creds
+        child = UserCredentials(user_roles=[UserRoles(role=Roles(role_name=role_name))], user_name=user_name, user_id=user_id)
+        self.SESSION.query.return_value.join.return_value.filter.return_value.options.return_value.all.return_value = [child]
         actual = self.DATABASE.get_user_child_accounts(self.USER_ID)
 
         assert actual == [{'user_name': user_name, 'user_id': user_id, 'roles': [role_name]}]
 
     def test_get_user_child_accounts__should_return_empty_list_when_no_child_accounts(self):
-        self.SESSION.query.return_value.filter_by.return_value.all.return_value = None
+        self.SESSION.query.return_value.join.return_value.filter.return_value.options.return_value.all.return_value = []
         actual = self.DATABASE.get_user_child_accounts(self.USER_ID)
 
         assert actual == []
@@ -1261,6 +1658,34 @@ class TestUserDatabase:
             self.DATABASE.get_scenes_by_user(None)
         self.SESSION.query.assert_not_called()
 
+    def test_get_scene_details_by_user__should_query_scene_by_user_and_id(self):
+        scene_id = str(uuid.uuid4())
+        self.DATABASE.get_scene_details_by_user(self.USER_ID, scene_id)
+
+        self.SESSION.query.assert_called_once_with(Scenes)
+        self.SESSION.query.return_value.filter_by.assert_called_with(user_id=self.USER_ID, id=scene_id)
+
+    def test_get_scene_details_by_user__should_return_light_details(self):
+        detail = SceneDetails()
+        detail.light_group = '3'
+        detail.light_group_name = 'Kitchen'
+        detail.light_brightness = 120
+        scene = Scenes()
+        scene.details = [detail]
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = scene
+        actual = self.DATABASE.get_scene_details_by_user(self.USER_ID, str(uuid.uuid4()))
+
+        assert actual == [{'group_name': 'Kitchen', 'group_id': '3', 'brightness': 120}]
+
+    def test_get_scene_details_by_user__should_raise_bad_request_when_scene_not_found(self):
+        self.SESSION.query.return_value.filter_by.return_value.first.return_value = None
+        with pytest.raises(BadRequest):
+            self.DATABASE.get_scene_details_by_user(self.USER_ID, str(uuid.uuid4()))
+
+    def test_get_scene_details_by_user__should_raise_bad_request_when_scene_id_is_none(self):
+        with pytest.raises(BadRequest):
+            self.DATABASE.get_scene_details_by_user(self.USER_ID, None)
+
     def test_delete_scene_by_user__should_raise_bad_request_when_user_id_is_none(self):
         with pytest.raises(BadRequest):
             self.DATABASE.delete_scene_by_user(None, str(uuid.uuid4()))
@@ -1287,6 +1712,10 @@ class TestUserDatabase:
         self.SESSION.query.return_value.filter_by.assert_any_call(scene_id=scene_id)
         self.SESSION.query.return_value.filter_by.return_value.delete.assert_called()
 
+    def __set_child_account_queries(self, user):
+        self.SESSION.query.return_value.filter_by.return_value.first.side_effect = [None, UserPreference()]
+        self.SESSION.query.return_value.filter_by.return_value.options.return_value.first.return_value = user
+
     @staticmethod
     def __create_user_preference(user, city='Moline', is_fahrenheit=False, is_imperial=False):
         preference = UserPreference()
@@ -6,7 +6,8 @@ from mock import patch, ANY
 from werkzeug.exceptions import Unauthorized
 
 from svc.endpoints.app_routes import get_token, get_user_preferences_by_user_id, update_user_preferences_by_user_id, \
-    get_user_tasks_by_user_id, delete_user_tasks_by_user_id, insert_user_task_by_user_id, update_user_task_by_user_id
+    get_user_tasks_by_user_id, delete_user_tasks_by_user_id, insert_user_task_by_user_id, update_user_task_by_user_id, \
+    get_metrics, get_dashboard_by_user_id
 
 
 @patch('svc.endpoints.app_routes.request')
@@ -286,3 +287,48 @@ class TestAppRoutes:
         mock_requests.data = json.dumps({'grant_type': 'bearer'})
         with pytest.raises(Unauthorized):
             get_token()
+
+    def test_get_metrics__should_call_app_controller_with_bearer_token(self, mock_controller, mock_requests):
+        bearer_token = 'fakeBearerToken'
+        mock_requests.headers = {'Authorization': bearer_token}
+        mock_controller.get_metrics.return_value = {}
+        get_metrics()
+
+        mock_controller.get_metrics.assert_called_with(bearer_token)
+
+    def test_get_metrics__should_return_controller_response(self, mock_controller, mock_requests):
+        response = {'database': {'checkouts': 1}}
+        mock_controller.get_metrics.return_value = response
+        actual = get_metrics()
+
+        assert actual.status_code == 200
+        assert json.loads(actual.data) == response
+
+    @patch('svc.endpoints.app_routes.dashboard_controller')
+    def test_get_dashboard__should_call_dashboard_controller_with_garage_id(self, mock_dashboard, mock_controller, mock_requests):
+        bearer_token = 'fakeBearerToken'
+        mock_requests.headers = {'Authorization': bearer_token}
+        mock_requests.args = {'garageId': '1'}
+        mock_dashboard.get_dashboard.return_value = {}
+        get_dashboard_by_user_id(self.USER_ID)
+
+        mock_dashboard.get_dashboard.assert_called_with(bearer_token, self.USER_ID, '1')
+
+    @patch('svc.endpoints.app_routes.dashboard_controller')
+    def test_get_dashboard__should_default_garage_id_to_none(self, mock_dashboard, mock_controller, mock_requests):
+        mock_requests.headers = {'Authorization': 'fakeBearerToken'}
+        mock_requests.args = {}
+        mock_dashboard.get_dashboard.return_value = {}
+        get_dashboard_by_user_id(self.USER_ID)
+
+        mock_dashboard.get_dashboard.assert_called_with(ANY, self.USER_ID, None)
+
+    @patch('svc.endpoints.app_routes.dashboard_controller')
+    def test_get_dashboard__should_return_controller_response(self, mock_dashboard, mock_controller, mock_requests):
+        response = {'preferences': {'city': 'Prague'}, 'errors': {}}
+        mock_requests.args = {}
+        mock_dashboard.get_dashboard.return_value = response
+        actual = get_dashboard_by_user_id(self.USER_ID)
+
+        assert actual.status_code == 200
+        assert json.loads(actual.data) == response
@@ -2,7 +2,7 @@ import json
 
 from mock import patch
 
-from svc.endpoints.light_routes import get_assigned_light_groups, set_assigned_light_group, set_light_state
+from svc.endpoints.light_routes import get_assigned_light_groups, set_assigned_light_group, set_light_state, set_light_batch
 
 
 @patch('svc.endpoints.light_routes.request')
@@ -79,3 +79,22 @@ class TestLightRoutes:
         actual = set_light_state()
 
         assert actual.content_type == 'application/json'
+
+    def test_set_light_batch__should_call_light_controller_with_request(self, mock_controller, mock_request):
+        bearer_token = 'not real'
+        mock_request.headers = {'Authorization': bearer_token}
+        mock_request.data = b'[{"groupId": "1", "on": false}]'
+        mock_controller.set_light_batch.return_value = []
+        set_light_batch()
+
+        mock_controller.set_light_batch.assert_called_with(bearer_token, [{'groupId': '1', 'on': False}])
+
+    def test_set_light_batch__should_return_per_item_results(self, mock_controller, mock_request):
+        results = [{'groupId': '1', 'status': 200}]
+        mock_request.data = b'[{"groupId": "1", "on": false}]'
+        mock_controller.set_light_batch.return_value = results
+        actual = set_light_batch()
+
+        assert actual.status_code == 200
+        assert actual.content_type == 'application/json'
+        assert json.loads(actual.data) == results
@@ -3,7 +3,7 @@ import uuid
 
 from mock import patch, ANY
 
-from svc.endpoints.scene_routes import get_scenes_by_user, delete_scene_by_user
+from svc.endpoints.scene_routes import get_scenes_by_user, delete_scene_by_user, activate_scene_by_user
 
 
 @patch('svc.endpoints.scene_routes.request')
@@ -98,3 +98,24 @@ class TestSceneRoutes:
 
         assert actual.content_type == 'application/json'
 
+    def test_activate_scene_by_user__should_call_controller_with_request_values(self, mock_controller, mock_request):
+        mock_controller.activate_scene.return_value = []
+        mock_request.headers = {'Authorization': self.BEARER_TOKEN}
+        activate_scene_by_user(self.USER_ID, self.SCENE_ID)
+
+        mock_controller.activate_scene.assert_called_with(self.BEARER_TOKEN, self.USER_ID, self.SCENE_ID)
+
+    def test_activate_scene_by_user__should_return_success_status_code(self, mock_controller, mock_request):
+        mock_controller.activate_scene.return_value = []
+        mock_request.headers = {'Authorization': self.BEARER_TOKEN}
+        actual = activate_scene_by_user(self.USER_ID, self.SCENE_ID)
+
+        assert actual.status_code == 200
+
+    def test_activate_scene_by_user__should_return_response_from_controller(self, mock_controller, mock_request):
+        response = [{'groupId': '1', 'groupName': 'Kitchen', 'status': 200, 'elapsedMs': 12.5}]
+        mock_controller.activate_scene.return_value = response
+        mock_request.headers = {'Authorization': self.BEARER_TOKEN}
+        actual = activate_scene_by_user(self.USER_ID, self.SCENE_ID)
+
+        assert json.loads(actual.data) == response
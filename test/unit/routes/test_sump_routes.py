@@ -3,7 +3,8 @@ import json
 from mock import patch
 
 from models.sump import SumpLevel
-from svc.endpoints.sump_routes import get_current_sump_level, save_current_level_by_user
+from svc.endpoints.sump_routes import get_current_sump_level, save_current_level_by_user, \
+    save_current_levels_by_user, get_sump_levels_by_user
 
 
 @patch('svc.endpoints.sump_routes.request')
@@ -56,3 +57,56 @@ def test_save_current_level_by_user__should_call_controller(mock_controller, moc
     save_current_level_by_user(user_id)
 
     mock_controller.assert_called_with(user_id, bearer_token, request_body)
+
+
+@patch('svc.endpoints.sump_routes.request')
+@patch('svc.endpoints.sump_routes.save_current_levels')
+def test_save_current_levels_by_user__should_call_controller(mock_controller, mock_request):
+    user_id = 1234
+    request_body = b'[]'
+    bearer_token = 'fake_token'
+    mock_request.data = request_body
+    mock_request.headers = {'Authorization': bearer_token}
+    mock_controller.return_value = {'inserted': 0, 'errors': []}
+
+    save_current_levels_by_user(user_id)
+
+    mock_controller.assert_called_with(user_id, bearer_token, request_body)
+
+
+@patch('svc.endpoints.sump_routes.request')
+@patch('svc.endpoints.sump_routes.save_current_levels')
+def test_save_current_levels_by_user__should_return_insert_summary(mock_controller, mock_request):
+    expected = {'inserted': 2, 'errors': [{'index': 2, 'message': 'missing depth'}]}
+    mock_controller.return_value = expected
+
+    actual = save_current_levels_by_user(1234)
+
+    assert actual.status_code == 200
+    assert json.loads(actual.data) == expected
+
+
+@patch('svc.endpoints.sump_routes.request')
+@patch('svc.endpoints.sump_routes.get_sump_levels')
+def test_get_sump_levels_by_user__should_call_controller_with_query_params(mock_controller, mock_request):
+    user_id = 'fakeuserid'
+    bearer_token = 'fake_token'
+    mock_request.headers = {'Authorization': bearer_token}
+    mock_request.args = {'from': '2021-01-01', 'to': '2021-01-08', 'points': '50'}
+    mock_controller.return_value = {}
+
+    get_sump_levels_by_user(user_id)
+
+    mock_controller.assert_called_with(user_id, bearer_token, '2021-01-01', '2021-01-08', '50')
+
+
+@patch('svc.endpoints.sump_routes.request')
+@patch('svc.endpoints.sump_routes.get_sump_levels')
+def test_get_sump_levels_by_user__should_return_levels(mock_controller, mock_request):
+    expected = {'depthUnit': 'cm', 'from': '2021-01-01T00:00:00', 'to': '2021-01-08T00:00:00', 'levels': []}
+    mock_controller.return_value = expected
+
+    actual = get_sump_levels_by_user('fakeuserid')
+
+    assert actual.status_code == 200
+    assert json.loads(actual.data) == expected
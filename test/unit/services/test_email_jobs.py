@@ -0,0 +1,148 @@
+import json
+import threading
+
+from mock import patch, MagicMock, ANY
+from werkzeug.exceptions import FailedDependency
+
+from svc.config.settings_state import Settings
+from svc.services.email_jobs import queue_new_account_email, deliver_new_account_email, handle_email_job, \
+    get_email_status, publish_new_account_email
+from svc.utilities.cache_utils import SharedCache
+from svc.utilities.rabbitmq_client import RabbitMQClient
+from test.memory_broker import MemoryBroker
+
+
+@patch('svc.services.email_jobs.time')
+@patch('svc.services.email_jobs.api_utils')
+class TestEmailJobs:
+    EMAIL = 'child@test.com'
+    PASSWORD = 'fakePassword'
+    QUEUE = 'email_jobs'
+    JOB = {'email': EMAIL, 'password': PASSWORD}
+
+    def setup_method(self):
+        Settings.get_instance().Queue._settings = {'EmailAttempts': 3, 'EmailRetryDelay': 0.5}
+        SharedCache.get_instance().clear()
+        self.BROKER = MemoryBroker()
+        self.CLIENT = RabbitMQClient(Settings.get_instance(), self.QUEUE, connection_factory=self.BROKER.connect)
+
+    def teardown_method(self):
+        Settings.get_instance().Queue._settings = None
+        self.BROKER.disconnect_all()
+
+    @patch('svc.services.email_jobs.worker_pool_utils')
+    def test_queue_new_account_email__should_publish_job_in_background(self, mock_pool, mock_api, mock_time):
+        queue_new_account_email(self.EMAIL, self.PASSWORD)
+
+        mock_pool.submit.assert_called_with(publish_new_account_email, {'email': self.EMAIL, 'password': self.PASSWORD})
+
+    @patch('svc.services.email_jobs.worker_pool_utils')
+    def test_queue_new_account_email__should_not_connect_to_broker(self, mock_pool, mock_api, mock_time):
+        with patch('svc.services.email_jobs.get_client') as mock_client:
+            queue_new_account_email(self.EMAIL, self.PASSWORD)
+
+        mock_client.assert_not_called()
+
+    @patch('svc.services.email_jobs.worker_pool_utils')
+    def test_queue_new_account_email__should_record_queued_status(self, mock_pool, mock_api, mock_time):
+        queue_new_account_email(self.EMAIL, self.PASSWORD)
+
+        assert get_email_status(self.EMAIL) == {'status': 'queued', 'attempts': 0}
+
+    def test_publish_new_account_email__should_publish_job_to_email_queue(self, mock_api, mock_time):
+        self.__declare_queue()
+        with patch('svc.services.email_jobs.get_client', return_value=self.CLIENT):
+            publish_new_account_email(self.JOB)
+
+        assert self.BROKER.queue_depth(self.QUEUE) == 1
+        assert json.loads(self.BROKER.queues[self.QUEUE][0]['body']) == self.JOB
+        mock_api.send_new_account_email.assert_not_called()
+
+    def test_publish_new_account_email__should_publish_transient_message(self, mock_api, mock_time):
+        self.__declare_queue()
+        with patch('svc.services.email_jobs.get_client', return_value=self.CLIENT):
+            publish_new_account_email(self.JOB)
+
+        assert self.BROKER.queues[self.QUEUE][0]['properties'].delivery_mode == 1
+
+    def test_publish_new_account_email__should_send_directly_when_broker_unavailable(self, mock_api, mock_time):
+        self.BROKER.available = False
+        with patch('svc.services.email_jobs.get_client', return_value=self.CLIENT):
+            publish_new_account_email(self.JOB)
+
+        mock_api.send_new_account_email.assert_called_with(self.EMAIL, self.PASSWORD)
+
+    def test_publish_new_account_email__should_send_directly_when_job_is_unroutable(self, mock_api, mock_time):
+        self.BROKER.route = lambda *args: False
+        with patch('svc.services.email_jobs.get_client', return_value=self.CLIENT):
+            publish_new_account_email(self.JOB)
+
+        mock_api.send_new_account_email.assert_called_with(self.EMAIL, self.PASSWORD)
+
+    def test_deliver_new_account_email__should_send_email(self, mock_api, mock_time):
+        actual = deliver_new_account_email({'email': self.EMAIL, 'password': self.PASSWORD})
+
+        assert actual is True
+        mock_api.send_new_account_email.assert_called_once_with(self.EMAIL, self.PASSWORD)
+        assert get_email_status(self.EMAIL) == {'status': 'sent', 'attempts': 1}
+
+    def test_deliver_new_account_email__should_retry_with_backoff(self, mock_api, mock_time):
+        mock_api.send_new_account_email.side_effect = [FailedDependency(), FailedDependency(), None]
+        actual = deliver_new_account_email({'email': self.EMAIL, 'password': self.PASSWORD})
+
+        assert actual is True
+        assert mock_api.send_new_account_email.call_count == 3
+        assert [call.args[0] for call in mock_time.sleep.call_args_list] == [0.5, 1.0]
+        assert get_email_status(self.EMAIL) == {'status': 'sent', 'attempts': 3}
+
+    def test_deliver_new_account_email__should_record_failure_after_last_attempt(self, mock_api, mock_time):
+        mock_api.send_new_account_email.side_effect = FailedDependency()
+        actual = deliver_new_account_email({'email': self.EMAIL, 'password': self.PASSWORD})
+
+        assert actual is False
+        assert mock_api.send_new_account_email.call_count == 3
+        assert get_email_status(self.EMAIL) == {'status': 'failed', 'attempts': 3}
+
+    def test_handle_email_job__should_ack_after_delivery(self, mock_api, mock_time):
+        channel = MagicMock()
+        method = MagicMock(delivery_tag=7)
+        handle_email_job(channel, method, None, json.dumps({'email': self.EMAIL, 'password': self.PASSWORD}))
+
+        mock_api.send_new_account_email.assert_called_with(self.EMAIL, self.PASSWORD)
+        channel.basic_ack.assert_called_with(delivery_tag=7)
+
+    def test_handle_email_job__should_ack_malformed_job(self, mock_api, mock_time):
+        channel = MagicMock()
+        handle_email_job(channel, MagicMock(delivery_tag=3), None, b'not json')
+
+        mock_api.send_new_account_email.assert_not_called()
+        channel.basic_ack.assert_called_with(delivery_tag=3)
+
+    def test_consumer__should_deliver_queued_email(self, mock_api, mock_time):
+        sent = threading.Event()
+        mock_api.send_new_account_email.side_effect = lambda *args: sent.set()
+        consumer = threading.Thread(target=self.CLIENT._consume, args=(handle_email_job,), daemon=True)
+        consumer.start()
+        with patch('svc.services.email_jobs.get_client', return_value=self.CLIENT):
+            self.__wait_for_queue()
+            publish_new_account_email(self.JOB)
+
+        assert sent.wait(5)
+        self.CLIENT.stop_consumer()
+        consumer.join(5)
+        mock_api.send_new_account_email.assert_called_with(self.EMAIL, ANY)
+        assert self.BROKER.stats['acked'] == 1
+
+    def __declare_queue(self):
+        connection = self.BROKER.connect()
+        channel = connection.channel()
+        channel.exchange_declare(exchange='home_automation')
+        channel.queue_declare(queue=self.QUEUE, durable=True)
+        channel.queue_bind(queue=self.QUEUE, exchange='home_automation', routing_key=self.QUEUE)
+        connection.close()
+
+    def __wait_for_queue(self):
+        for _ in range(100):
+            if self.CLIENT._channel is not None and self.CLIENT._channel.consuming:
+                return
+            threading.Event().wait(0.01)
@@ -0,0 +1,208 @@
+import threading
+
+import pytest
+from mock import patch, ANY
+from werkzeug.exceptions import FailedDependency
+
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import CacheNamespace
+from svc.services.light_groups import get_light_groups, set_light_groups, set_light_state, create_light_group, \
+    delete_light_group, assign_light_group, ProcessLightGroupWriteLock
+from svc.utilities.cache_utils import SharedCache, BackgroundRefresh
+
+
+@patch('svc.services.light_groups.Thread')
+@patch('svc.services.light_groups.time')
+@patch('svc.services.light_groups.api_utils')
+class TestLightGroups:
+    API_KEY = 'fakeApiKey'
+    BASE_URL = 'http://lights.test.api'
+    NOW = 1000000.0
+
+    def setup_method(self):
+        Settings.get_instance().BaseUrls._settings = {'Lights': self.BASE_URL}
+        Settings.get_instance().Cache._settings = {'LightGroupTtl': 5, 'LightGroupStaleTtl': 60}
+        SharedCache.get_instance().clear()
+        BackgroundRefresh.get_instance().clear()
+        self.GROUPS = [{'groupId': '1', 'groupName': 'Living Room', 'on': True, 'brightness': 200},
+                       {'groupId': '2', 'groupName': 'Kitchen', 'on': False, 'brightness': 0}]
+
+    def teardown_method(self):
+        Settings.get_instance().Cache._settings = None
+
+    def test_get_light_groups__should_call_api_on_cold_cache(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        actual = get_light_groups(self.API_KEY)
+
+        assert actual == self.GROUPS
+        mock_api.get_light_groups.assert_called_with(self.API_KEY)
+
+    def test_get_light_groups__should_serve_fresh_groups_from_cache(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        actual = get_light_groups(self.API_KEY)
+
+        assert actual == self.GROUPS
+        mock_api.get_light_groups.assert_called_once()
+        mock_thread.assert_not_called()
+
+    def test_get_light_groups__should_not_cache_failures(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.side_effect = [FailedDependency(), self.GROUPS]
+        with pytest.raises(FailedDependency):
+            get_light_groups(self.API_KEY)
+        actual = get_light_groups(self.API_KEY)
+
+        assert actual == self.GROUPS
+
+    def test_get_light_groups__should_serve_stale_groups_and_refresh_in_background(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        mock_time.time.return_value = self.NOW + 5
+        actual = get_light_groups(self.API_KEY)
+
+        assert actual == self.GROUPS
+        mock_api.get_light_groups.assert_called_once()
+        mock_thread.assert_called_once_with(target=ANY, args=(self.API_KEY, ANY), daemon=True)
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_get_light_groups__should_only_start_one_refresh(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        mock_time.time.return_value = self.NOW + 5
+        get_light_groups(self.API_KEY)
+        get_light_groups(self.API_KEY)
+
+        mock_thread.assert_called_once()
+
+    def test_get_light_groups__background_refresh_should_update_cache(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        mock_time.time.return_value = self.NOW + 5
+        get_light_groups(self.API_KEY)
+        refreshed = [{'groupId': '1', 'groupName': 'Living Room', 'on': False, 'brightness': 0}]
+        mock_api.get_light_groups.return_value = refreshed
+        self.__run_refresh(mock_thread)
+
+        assert get_light_groups(self.API_KEY) == refreshed
+        assert mock_thread.call_count == 1
+
+    def test_get_light_groups__background_refresh_failure_should_keep_groups(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        mock_time.time.return_value = self.NOW + 5
+        get_light_groups(self.API_KEY)
+        mock_api.get_light_groups.side_effect = FailedDependency()
+        self.__run_refresh(mock_thread)
+
+        assert get_light_groups(self.API_KEY) == self.GROUPS
+
+    def test_get_light_groups__background_refresh_should_not_overwrite_newer_change(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        mock_time.time.return_value = self.NOW + 5
+        get_light_groups(self.API_KEY)
+        set_light_groups(self.API_KEY, '2', True, 100)
+        self.__run_refresh(mock_thread)
+
+        assert get_light_groups(self.API_KEY)[1] == {'groupId': '2', 'groupName': 'Kitchen', 'on': True, 'brightness': 100}
+
+    def test_set_light_groups__should_call_api(self, mock_api, mock_time, mock_thread):
+        set_light_groups(self.API_KEY, '1', False, None)
+
+        mock_api.set_light_groups.assert_called_with(self.API_KEY, '1', False, None)
+
+    def test_set_light_groups__should_write_state_through_to_cache(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        set_light_groups(self.API_KEY, 1, True, 120)
+        actual = get_light_groups(self.API_KEY)
+
+        assert actual[0] == {'groupId': '1', 'groupName': 'Living Room', 'on': True, 'brightness': 120}
+        assert actual[1] == self.GROUPS[1]
+        mock_api.get_light_groups.assert_called_once()
+
+    def test_set_light_groups__should_wait_for_process_write_lock(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        with ProcessLightGroupWriteLock.get_instance():
+            writer = threading.Thread(target=set_light_groups, args=(self.API_KEY, '1', True, 120), daemon=True)
+            writer.start()
+            writer.join(0.1)
+
+            assert writer.is_alive()
+        writer.join(5)
+        assert get_light_groups(self.API_KEY)[0]['brightness'] == 120
+
+    def test_set_light_groups__should_turn_group_off_when_brightness_zero(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        set_light_groups(self.API_KEY, '1', True, 0)
+
+        assert get_light_groups(self.API_KEY)[0] == {'groupId': '1', 'groupName': 'Living Room', 'on': False, 'brightness': 200}
+
+    def test_set_light_groups__should_invalidate_cache_when_api_fails(self, mock_api, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+        mock_api.set_light_groups.side_effect = FailedDependency()
+        with pytest.raises(FailedDependency):
+            set_light_groups(self.API_KEY, '1', False, None)
+
+        assert SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, self.BASE_URL) is None
+
+    def test_set_light_state__should_invalidate_cache(self, mock_api, mock_time, mock_thread):
+        self.__cache_groups(mock_api, mock_time)
+        set_light_state(self.API_KEY, '4', 100)
+
+        mock_api.set_light_state.assert_called_with(self.API_KEY, '4', 100)
+        assert SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, self.BASE_URL) is None
+
+    def test_create_light_group__should_invalidate_cache(self, mock_api, mock_time, mock_thread):
+        self.__cache_groups(mock_api, mock_time)
+        create_light_group(self.API_KEY, 'Office')
+
+        mock_api.create_light_group.assert_called_with(self.API_KEY, 'Office')
+        assert SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, self.BASE_URL) is None
+
+    def test_delete_light_group__should_invalidate_cache(self, mock_api, mock_time, mock_thread):
+        self.__cache_groups(mock_api, mock_time)
+        delete_light_group('2')
+
+        mock_api.delete_light_group.assert_called_with('2')
+        assert SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, self.BASE_URL) is None
+
+    def test_assign_light_group__should_invalidate_cache(self, mock_api, mock_time, mock_thread):
+        self.__cache_groups(mock_api, mock_time)
+        assign_light_group(self.API_KEY, '1', '4', 'Lamp', 2)
+
+        mock_api.assign_light_group.assert_called_with(self.API_KEY, '1', '4', 'Lamp', 2)
+        assert SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, self.BASE_URL) is None
+
+    def test_assign_light_group__should_invalidate_cache_when_api_fails(self, mock_api, mock_time, mock_thread):
+        self.__cache_groups(mock_api, mock_time)
+        mock_api.assign_light_group.side_effect = FailedDependency()
+        with pytest.raises(FailedDependency):
+            assign_light_group(self.API_KEY, '1', '4', 'Lamp', 2)
+
+        assert SharedCache.get_instance().get(CacheNamespace.LIGHT_GROUPS, self.BASE_URL) is None
+
+    def __cache_groups(self, mock_api, mock_time):
+        mock_time.time.return_value = self.NOW
+        mock_api.get_light_groups.return_value = self.GROUPS
+        get_light_groups(self.API_KEY)
+
+    @staticmethod
+    def __run_refresh(mock_thread):
+        kwargs = mock_thread.call_args[1]
+        kwargs['target'](*kwargs['args'])
@@ -1,7 +1,9 @@
 from mock import patch, ANY
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, ReadTimeout
 
+from svc.constants.home_automation import CacheNamespace
 from svc.services.weather_request import get_weather
+from svc.utilities.cache_utils import SharedCache, BackgroundRefresh
 
 
 @patch('svc.services.weather_request.get_forecast_by_coords')
@@ -19,6 +21,12 @@ class TestWeatherRequest:
     def setup_method(self):
         self.WEATHER_RESPONSE = {'coord': self.COORDS, 'main': {}, 'weather': [{}]}
         self.FORECAST_RESPONSE = {'daily': []}
+        self.CACHE_PATCH = patch('svc.services.weather_request.SharedCache')
+        mock_cache = self.CACHE_PATCH.start()
+        mock_cache.get_instance.return_value.get.return_value = None
+
+    def teardown_method(self):
+        self.CACHE_PATCH.stop()
 
     def test_get_weather__should_return_temp_data(self, mock_weather, mock_forecast):
         expected_temp = 64.8
@@ -112,6 +120,13 @@ class TestWeatherRequest:
         assert actual['maxTemp'] == 0.0
         assert actual['description'] == description
 
+    def test_get_weather__should_return_default_values_when_request_times_out(self, mock_weather, mock_forecast):
+        mock_weather.side_effect = ReadTimeout()
+
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert actual == {'temp': 0.0, 'minTemp': 0.0, 'maxTemp': 0.0, 'description': ''}
+
     def test_get_weather__should_return_default_values_when_throws_connection_error(self, mock_weather, mock_forecast):
         mock_weather.side_effect = ConnectionError()
 
@@ -130,3 +145,159 @@ class TestWeatherRequest:
         mock_weather.return_value = self.WEATHER_RESPONSE
         get_weather(self.CITY, self.UNIT, self.APP_ID)
         mock_forecast.assert_called_with(self.COORDS, ANY, ANY)
+
+
+@patch('svc.services.weather_request.Thread')
+@patch('svc.services.weather_request.time')
+@patch('svc.services.weather_request.get_forecast_by_coords')
+@patch('svc.services.weather_request.get_weather_by_city')
+class TestWeatherCache:
+    CITY = 'Prague'
+    UNIT = 'metric'
+    APP_ID = 'abc123'
+    NOW = 1000000.0
+    COORDS = {'lat': 92.00, 'lon': -93.85}
+
+    def setup_method(self):
+        SharedCache.get_instance().clear()
+        BackgroundRefresh.get_instance().clear()
+        self.WEATHER_RESPONSE = {'coord': self.COORDS, 'main': {'temp': 64.8}, 'weather': [{'description': 'sunny'}]}
+        self.FORECAST_RESPONSE = {'daily': [{'temp': {'min': 12.34, 'max': 12.87}}]}
+        self.STALE_WEATHER = {'temp': 50.1, 'minTemp': 40.0, 'maxTemp': 55.5, 'description': 'rain'}
+
+    def test_get_weather__should_cache_successful_response(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.return_value = self.FORECAST_RESPONSE
+        first = get_weather(self.CITY, self.UNIT, self.APP_ID)
+        second = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert first == second
+        mock_weather.assert_called_once()
+        mock_forecast.assert_called_once()
+        mock_thread.assert_not_called()
+
+    def test_get_weather__should_cache_per_unit(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.return_value = self.FORECAST_RESPONSE
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+        get_weather(self.CITY, 'imperial', self.APP_ID)
+
+        assert mock_weather.call_count == 2
+
+    def test_get_weather__should_not_cache_failed_response(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.side_effect = ConnectionError()
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert mock_weather.call_count == 2
+
+    def test_get_weather__should_not_cache_partial_response(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.return_value = {'daily': []}
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert SharedCache.get_instance().get(CacheNamespace.WEATHER, f'{self.CITY}:{self.UNIT}') is None
+
+    def test_get_weather__should_return_stale_response_when_expired(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        self.__cache_stale_weather()
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert actual == self.STALE_WEATHER
+        mock_weather.assert_not_called()
+
+    def test_get_weather__should_start_background_refresh_when_expired(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        self.__cache_stale_weather()
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        mock_thread.assert_called_once_with(target=ANY, args=(self.CITY, self.UNIT, self.APP_ID), daemon=True)
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_get_weather__should_only_start_one_refresh_per_key(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        self.__cache_stale_weather()
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        mock_thread.assert_called_once()
+
+    def test_get_weather__background_refresh_should_update_cache(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.return_value = self.FORECAST_RESPONSE
+        self.__cache_stale_weather()
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+        self.__run_refresh(mock_thread)
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert actual == {'temp': 64.8, 'minTemp': 12.34, 'maxTemp': 12.87, 'description': 'sunny'}
+
+    def test_get_weather__background_refresh_failure_should_keep_stale_response(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.side_effect = ReadTimeout()
+        self.__cache_stale_weather()
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+        self.__run_refresh(mock_thread)
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert actual == self.STALE_WEATHER
+        assert mock_thread.call_count == 2
+
+    def test_get_weather__should_cache_city_coordinates(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.return_value = self.FORECAST_RESPONSE
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert SharedCache.get_instance().get(CacheNamespace.COORDINATES, self.CITY) == self.COORDS
+
+    def test_get_weather__should_cache_coordinates_when_forecast_fails(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.side_effect = ConnectionError()
+        get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert SharedCache.get_instance().get(CacheNamespace.COORDINATES, self.CITY) == self.COORDS
+
+    def test_get_weather__should_call_forecast_with_cached_coordinates(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.return_value = self.FORECAST_RESPONSE
+        cached_coords = {'lat': 50.08, 'lon': 14.42}
+        SharedCache.get_instance().set(CacheNamespace.COORDINATES, self.CITY, cached_coords, 60)
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        mock_forecast.assert_called_with(cached_coords, self.UNIT, self.APP_ID)
+        assert actual == {'temp': 64.8, 'minTemp': 12.34, 'maxTemp': 12.87, 'description': 'sunny'}
+
+    def test_get_weather__should_return_weather_when_concurrent_forecast_fails(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.return_value = self.WEATHER_RESPONSE
+        mock_forecast.side_effect = ReadTimeout()
+        SharedCache.get_instance().set(CacheNamespace.COORDINATES, self.CITY, self.COORDS, 60)
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert actual == {'temp': 64.8, 'minTemp': 0.0, 'maxTemp': 0.0, 'description': 'sunny'}
+
+    def test_get_weather__should_return_defaults_when_concurrent_weather_fails(self, mock_weather, mock_forecast, mock_time, mock_thread):
+        mock_time.time.return_value = self.NOW
+        mock_weather.side_effect = ConnectionError()
+        mock_forecast.return_value = self.FORECAST_RESPONSE
+        SharedCache.get_instance().set(CacheNamespace.COORDINATES, self.CITY, self.COORDS, 60)
+        actual = get_weather(self.CITY, self.UNIT, self.APP_ID)
+
+        assert actual == {'temp': 0.0, 'minTemp': 0.0, 'maxTemp': 0.0, 'description': ''}
+
+    def __cache_stale_weather(self):
+        entry = {'weather': self.STALE_WEATHER, 'fetched': self.NOW - 601}
+        SharedCache.get_instance().set(CacheNamespace.WEATHER, f'{self.CITY}:{self.UNIT}', entry, 86400)
+
+    @staticmethod
+    def __run_refresh(mock_thread):
+        kwargs = mock_thread.call_args[1]
+        kwargs['target'](*kwargs['args'])
@@ -7,12 +7,14 @@ from requests import Response, ReadTimeout, ConnectTimeout
 from werkzeug.exceptions import FailedDependency, BadRequest, Unauthorized
 
 from svc.config.settings_state import Settings
+from svc.constants.home_automation import Dependency
+from svc.utilities.circuit_breaker_utils import CircuitBreakers, CircuitOpen
 from svc.utilities.api_utils import get_weather_by_city, create_light_group, set_light_groups, set_light_state, \
     get_light_groups, get_garage_door_status, toggle_garage_door_state, update_garage_door_state, \
     send_new_account_email, get_forecast_by_coords
 
 
-@patch('svc.utilities.api_utils.requests')
+@patch('svc.utilities.api_utils.get_session')
 class TestWeatherApiRequests:
     CITY = 'Des Moines'
     COORDS = {'lat': 23.123, 'lon': -92.28876}
@@ -30,46 +32,54 @@ class TestWeatherApiRequests:
 
     def test_get_weather_by_city__should_call_requests_get(self, mock_requests):
         self.RESPONSE._content = json.dumps(self.RESPONSE_CONTENT).encode('UTF-8')
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
 
         get_weather_by_city(self.CITY, self.UNIT_PREFERENCE, self.APP_ID)
 
-        mock_requests.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
+        mock_requests.return_value.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
+
+    def test_get_weather_by_city__should_use_weather_session(self, mock_requests):
+        self.RESPONSE._content = json.dumps(self.RESPONSE_CONTENT).encode('UTF-8')
+        mock_requests.return_value.get.return_value = self.RESPONSE
+
+        get_weather_by_city(self.CITY, self.UNIT_PREFERENCE, self.APP_ID)
+
+        mock_requests.assert_called_with(Dependency.WEATHER)
 
     def test_get_weather_by_city__should_use_provided_city_location_in_url(self, mock_requests):
         city = 'London'
         self.RESPONSE._content = json.dumps(self.RESPONSE_CONTENT).encode('UTF-8')
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
 
         get_weather_by_city(city, self.UNIT_PREFERENCE, self.APP_ID)
 
         self.WEATHER_PARAMS['q'] = city
-        mock_requests.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
+        mock_requests.return_value.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
 
     def test_get_weather_by_city__should_use_provided_app_id_in_url(self, mock_requests):
         app_id = 'fake app id'
         self.RESPONSE._content = json.dumps(self.RESPONSE_CONTENT).encode('UTF-8')
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
 
         get_weather_by_city(self.CITY, self.UNIT_PREFERENCE, app_id)
 
         self.WEATHER_PARAMS['APPID'] = app_id
-        mock_requests.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
+        mock_requests.return_value.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
 
     def test_get_weather_by_city__should_call_api_using_unit_preference_in_params(self, mock_requests):
         self.RESPONSE._content = json.dumps(self.RESPONSE_CONTENT).encode('UTF-8')
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
         unit = 'metric'
         self.WEATHER_PARAMS['units'] = unit
 
         get_weather_by_city(self.CITY, unit, self.APP_ID)
 
-        mock_requests.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
+        mock_requests.return_value.get.assert_called_with(f'{self.URL}/weather', params=self.WEATHER_PARAMS)
 
     def test_get_weather_by_city__should_return_status_code_and_content(self, mock_requests):
         expected_content = json.dumps(self.RESPONSE_CONTENT).encode('UTF-8')
         self.RESPONSE._content = expected_content
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
 
         content = get_weather_by_city(self.CITY, 'metric', self.APP_ID)
 
@@ -77,21 +87,21 @@ class TestWeatherApiRequests:
 
     def test_get_weather_by_city__should_raise_unauthorized(self, mock_requests):
         self.RESPONSE.status_code = 401
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
         with pytest.raises(Unauthorized):
             get_weather_by_city(self.CITY, self.UNIT_PREFERENCE, self.APP_ID)
 
     def test_get_forecast_by_coords__should_make_get_request(self, mock_requests):
         self.RESPONSE._content = json.dumps({}).encode('UTF-8')
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
         get_forecast_by_coords(self.COORDS, self.UNIT_PREFERENCE, self.APP_ID)
 
-        mock_requests.get.assert_called_with(f'{self.URL}/onecall', params=self.FORECAST_PARAMS)
+        mock_requests.return_value.get.assert_called_with(f'{self.URL}/onecall', params=self.FORECAST_PARAMS)
 
     def test_get_forecast_by_coords__should_return_the_response_content(self, mock_requests):
         content = {'doesntMatter': 'dumb'}
         self.RESPONSE._content = json.dumps(content).encode('UTF-8')
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
 
         actual = get_forecast_by_coords(self.COORDS, self.UNIT_PREFERENCE, self.APP_ID)
 
@@ -99,18 +109,18 @@ class TestWeatherApiRequests:
 
     def test_get_forecast_by_coords__should_raise_failed_dependency_when_bad_response(self, mock_requests):
         self.RESPONSE.status_code = 400
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
         with pytest.raises(FailedDependency):
             get_forecast_by_coords(self.COORDS, self.UNIT_PREFERENCE, self.APP_ID)
 
     def test_get_forecast_by_coords__should_raise_unauthorized(self, mock_requests):
         self.RESPONSE.status_code = 401
-        mock_requests.get.return_value = self.RESPONSE
+        mock_requests.return_value.get.return_value = self.RESPONSE
         with pytest.raises(Unauthorized):
             get_forecast_by_coords(self.COORDS, self.UNIT_PREFERENCE, self.APP_ID)
 
 
-@patch('svc.utilities.api_utils.requests')
+@patch('svc.utilities.api_utils.get_session')
 class TestGarageApiRequests:
     GARAGE_ID = 5
     BASE_URL = 'http://localhost:80'
@@ -118,49 +128,62 @@ class TestGarageApiRequests:
     STATE = {'isGarageOpen': False}
     STATUS = {'isGarageOpen': True, 'statusDuration': datetime.now().isoformat(), 'coordinates': {'latitude': 12.34, 'longitude': -56.78}}
 
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'FailureThreshold': 2, 'OpenSeconds': 30}
+        CircuitBreakers.get_instance().reset()
+
     def test_get_garage_door_status__should_call_requests_with_url(self, mock_requests):
         response = Response()
         response.status_code = 200
-        mock_requests.get.return_value = response
+        mock_requests.return_value.get.return_value = response
         response._content = json.dumps(self.STATUS).encode('UTF-8')
         get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
         expected_url = f'{self.BASE_URL}/garageDoor/{str(self.GARAGE_ID)}/status'
-        mock_requests.get.assert_called_with(expected_url, headers=ANY, timeout=5)
+        mock_requests.return_value.get.assert_called_with(expected_url, headers=ANY, timeout=5)
+
+    def test_get_garage_door_status__should_use_garage_session(self, mock_requests):
+        response = Response()
+        response.status_code = 200
+        mock_requests.return_value.get.return_value = response
+        response._content = json.dumps(self.STATUS).encode('UTF-8')
+        get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+
+        mock_requests.assert_called_with(Dependency.GARAGE)
 
     def test_get_garage_door_status__should_call_requests_with_headers(self, mock_requests):
         response = Response()
         response.status_code = 200
-        mock_requests.get.return_value = response
+        mock_requests.return_value.get.return_value = response
         response._content = json.dumps(self.STATUS).encode('UTF-8')
         expected_headers = {'Authorization': 'Bearer ' + self.FAKE_BEARER}
         get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
-        mock_requests.get.assert_called_with(ANY, headers=expected_headers, timeout=5)
+        mock_requests.return_value.get.assert_called_with(ANY, headers=expected_headers, timeout=5)
 
     def test_get_garage_door_status__should_return_response(self, mock_requests):
         response = Response()
         response.status_code = 200
         response._content = json.dumps(self.STATUS).encode('UTF-8')
-        mock_requests.get.return_value = response
+        mock_requests.return_value.get.return_value = response
         actual = get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
         assert actual.to_dict() == self.STATUS
 
     def test_get_garage_door_status__should_raise_failed_dependency_when_request_raises_connection_error(self, mock_requests):
-        mock_requests.get.side_effect = ConnectionError()
+        mock_requests.return_value.get.side_effect = ConnectionError()
         with pytest.raises(FailedDependency):
             get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
     def test_get_garage_door_status__should_raise_failed_dependency_when_request_raises_connection_timeout_error(self, mock_requests):
-        mock_requests.get.side_effect = ConnectTimeout()
+        mock_requests.return_value.get.side_effect = ConnectTimeout()
         with pytest.raises(FailedDependency):
             get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
     def test_get_garage_door_status__should_raise_bad_request_when_failure_status_code(self, mock_requests):
         response = Response()
         response.status_code = 400
-        mock_requests.get.return_value = response
+        mock_requests.return_value.get.return_value = response
         with pytest.raises(BadRequest) as e:
             get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
         assert e.value.description == 'Garage node returned a failure'
@@ -168,37 +191,37 @@ class TestGarageApiRequests:
     def test_toggle_garage_door_state__should_call_requests_with_url(self, mock_requests):
         response = Response()
         response.status_code = 200
-        mock_requests.get.return_value = response
+        mock_requests.return_value.get.return_value = response
         toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
         expected_url = f'{self.BASE_URL}/garageDoor/{str(self.GARAGE_ID)}/toggle'
-        mock_requests.get.assert_called_with(expected_url, headers=ANY, timeout=5)
+        mock_requests.return_value.get.assert_called_with(expected_url, headers=ANY, timeout=5)
 
     def test_toggle_garage_door_state__should_call_requests_with_with_headers(self, mock_requests):
         response = Response()
         response.status_code = 200
-        mock_requests.get.return_value = response
+        mock_requests.return_value.get.return_value = response
         header = {'Authorization': 'Bearer ' + self.FAKE_BEARER}
         toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
 
-        mock_requests.get.assert_called_with(ANY, headers=header, timeout=5)
+        mock_requests.return_value.get.assert_called_with(ANY, headers=header, timeout=5)
 
     def test_toggle_garage_door_state__should_raise_bad_request_when_status_code_failure(self, mock_request):
         response = Response()
         response.status_code = 400
-        mock_request.get.return_value = response
+        mock_request.return_value.get.return_value = response
         with pytest.raises(BadRequest) as e:
             toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
         assert e.value.description == 'Garage node returned a failure'
 
     def test_toggle_garage_door_state__should_raise_bad_request_when_request_raises_connection_error(self, mock_request):
-        mock_request.get.side_effect = ConnectionError()
+        mock_request.return_value.get.side_effect = ConnectionError()
         with pytest.raises(BadRequest) as e:
             toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
         assert e.value.description == 'Garage node returned a failure'
 
     def test_toggle_garage_door_state__should_raise_bad_request_when_request_raises_connection_timeout_error(self, mock_request):
-        mock_request.get.side_effect = ConnectTimeout()
+        mock_request.return_value.get.side_effect = ConnectTimeout()
         with pytest.raises(BadRequest) as e:
             toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
         assert e.value.description == 'Garage node returned a failure'
@@ -208,11 +231,11 @@ class TestGarageApiRequests:
         response = Response()
         response.status_code = 200
         response._content = json.dumps(self.STATUS).encode('UTF-8')
-        mock_requests.post.return_value = response
+        mock_requests.return_value.post.return_value = response
         update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
 
         expected_url = f'{self.BASE_URL}/garageDoor/{str(self.GARAGE_ID)}/state'
-        mock_requests.post.assert_called_with(expected_url, headers=ANY, data=ANY, timeout=5)
+        mock_requests.return_value.post.assert_called_with(expected_url, headers=ANY, data=ANY, timeout=5)
 
     def test_update_garage_door_state__should_call_requests_with_headers(self, mock_requests):
         header = {'Authorization': 'Bearer ' + self.FAKE_BEARER}
@@ -220,39 +243,39 @@ class TestGarageApiRequests:
         response = Response()
         response.status_code = 200
         response._content = json.dumps(self.STATUS).encode('UTF-8')
-        mock_requests.post.return_value = response
+        mock_requests.return_value.post.return_value = response
         update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
 
-        mock_requests.post.assert_called_with(ANY, headers=header, data=ANY, timeout=5)
+        mock_requests.return_value.post.assert_called_with(ANY, headers=header, data=ANY, timeout=5)
 
     def test_update_garage_door_state__should_call_requests_with_request(self, mock_requests):
         request = '{"testData": "NotReal"}'.encode()
         response = Response()
         response.status_code = 200
         response._content = json.dumps(self.STATUS).encode('UTF-8')
-        mock_requests.post.return_value = response
+        mock_requests.return_value.post.return_value = response
         update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
 
-        mock_requests.post.assert_called_with(ANY, headers=ANY, data=request, timeout=5)
+        mock_requests.return_value.post.assert_called_with(ANY, headers=ANY, data=request, timeout=5)
 
     def test_update_garage_door_state__should_raise_bad_request_when_response_is_failure_status(self, mock_requests):
         response = Response()
         response.status_code = 400
-        mock_requests.post.return_value = response
+        mock_requests.return_value.post.return_value = response
         request = '{"testData": "NotReal"}'.encode()
         with pytest.raises(BadRequest) as e:
             update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
         assert e.value.description == 'Garage node returned a failure'
 
     def test_update_garage_door_state__should_raise_bad_request_when_response_raises_connection_error(self, mock_requests):
-        mock_requests.post.side_effect = ConnectionError()
+        mock_requests.return_value.post.side_effect = ConnectionError()
         request = '{"testData": "NotReal"}'.encode()
         with pytest.raises(BadRequest) as e:
             update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
         assert e.value.description == 'Garage node returned a failure'
 
     def test_update_garage_door_state__should_raise_bad_request_when_response_raises_connection_timeout_error(self, mock_requests):
-        mock_requests.post.side_effect = ConnectTimeout()
+        mock_requests.return_value.post.side_effect = ConnectTimeout()
         request = '{"testData": "NotReal"}'.encode()
         with pytest.raises(BadRequest) as e:
             update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
@@ -263,44 +286,102 @@ class TestGarageApiRequests:
         request = {}
         response.status_code = 200
         response._content = json.dumps(self.STATE).encode('UTF-8')
-        mock_requests.post.return_value = response
+        mock_requests.return_value.post.return_value = response
         actual = update_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID, request)
 
         assert actual.to_dict() == self.STATE
 
+    def test_get_garage_door_status__should_fail_fast_when_circuit_open(self, mock_requests):
+        mock_requests.return_value.get.side_effect = ConnectTimeout()
+        for _ in range(2):
+            with pytest.raises(FailedDependency):
+                get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+        mock_requests.return_value.get.reset_mock()
+
+        with pytest.raises(FailedDependency):
+            get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+        mock_requests.return_value.get.assert_not_called()
+
+    def test_toggle_garage_door_state__should_raise_bad_request_when_circuit_open(self, mock_requests):
+        mock_requests.return_value.get.side_effect = ConnectTimeout()
+        for _ in range(2):
+            with pytest.raises(BadRequest):
+                toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+        mock_requests.return_value.get.reset_mock()
+
+        with pytest.raises(BadRequest) as e:
+            toggle_garage_door_state(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+        assert e.value.description == 'Garage node returned a failure'
+        mock_requests.return_value.get.assert_not_called()
+
+    def test_get_garage_door_status__should_keep_separate_circuits_per_node(self, mock_requests):
+        mock_requests.return_value.get.side_effect = ConnectTimeout()
+        for _ in range(2):
+            with pytest.raises(FailedDependency):
+                get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps(self.STATUS).encode('UTF-8')
+        mock_requests.return_value.get.side_effect = None
+        mock_requests.return_value.get.return_value = response
+        actual = get_garage_door_status(self.FAKE_BEARER, 'http://localhost:81', self.GARAGE_ID)
+
+        assert actual.isGarageOpen is True
+
+    def test_get_garage_door_status__should_not_trip_circuit_on_client_errors(self, mock_requests):
+        response = Response()
+        response.status_code = 404
+        mock_requests.return_value.get.return_value = response
+        for _ in range(3):
+            with pytest.raises(BadRequest):
+                get_garage_door_status(self.FAKE_BEARER, self.BASE_URL, self.GARAGE_ID)
+
+        assert mock_requests.return_value.get.call_count == 3
 
-@patch('svc.utilities.api_utils.requests')
+
+@patch('svc.utilities.api_utils.get_session')
 class TestLightApiRequests:
     USERNAME = 'fake username'
     PASSWORD = 'fake password'
     BASE_URL = 'http://lights.test.api'
     API_KEY = 'fake api key'
 
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'FailureThreshold': 2, 'OpenSeconds': 30}
+        CircuitBreakers.get_instance().reset()
+
     def test_get_light_groups__should_call_groups_url(self, mock_requests):
         Settings.get_instance().BaseUrls._settings = {'Lights': self.BASE_URL}
         expected_url = f'{self.BASE_URL}/groups'
-        mock_requests.get.return_value = self.__create_response()
+        mock_requests.return_value.get.return_value = self.__create_response()
         get_light_groups(self.API_KEY)
 
-        mock_requests.get.assert_called_with(expected_url, headers={'LightApiKey': self.API_KEY}, timeout=10)
+        mock_requests.return_value.get.assert_called_with(expected_url, headers={'LightApiKey': self.API_KEY}, timeout=10)
+
+    def test_get_light_groups__should_use_lights_session(self, mock_requests):
+        Settings.get_instance().BaseUrls._settings = {'Lights': self.BASE_URL}
+        mock_requests.return_value.get.return_value = self.__create_response()
+        get_light_groups(self.API_KEY)
+
+        mock_requests.assert_called_with(Dependency.LIGHTS)
 
     def test_get_light_groups__should_raise_failed_dependency_when_response_500(self, mock_requests):
-        mock_requests.get.return_value = self.__create_response(status=500)
+        mock_requests.return_value.get.return_value = self.__create_response(status=500)
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY)
 
     def test_get_light_groups__should_raise_failed_dependency_when_response_400(self, mock_requests):
-        mock_requests.get.return_value = self.__create_response(status=400)
+        mock_requests.return_value.get.return_value = self.__create_response(status=400)
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY)
 
     def test_get_light_groups__should_raise_failed_dependency_when_request_raises_connection_error(self, mock_requests):
-        mock_requests.get.side_effect = ConnectionError()
+        mock_requests.return_value.get.side_effect = ConnectionError()
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY)
 
     def test_get_light_groups__should_raise_failed_dependency_when_request_raises_connection_timeout_error(self, mock_requests):
-        mock_requests.get.side_effect = ConnectTimeout()
+        mock_requests.return_value.get.side_effect = ConnectTimeout()
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY)
 
@@ -313,167 +394,169 @@ class TestLightApiRequests:
                 "name": "Living Room"
             }
         }
-        mock_requests.get.return_value = self.__create_response(data=response_data)
+        mock_requests.return_value.get.return_value = self.__create_response(data=response_data)
         actual = get_light_groups(self.API_KEY)
 
         assert actual['1']['etag'] == 'ab5272cfe11339202929259af22252ae'
 
     def test_set_light_groups__should_call_state_url(self, mock_requests):
         group_id = 1
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         expected_url = f'{self.BASE_URL}/group/state'
         set_light_groups(self.API_KEY, group_id, True, 132)
 
-        mock_requests.post.assert_called_with(expected_url, data=ANY, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(expected_url, data=ANY, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_groups__should_call_state_with_on_off_set(self, mock_requests):
         brightness = 222
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         group_id = 2
         set_light_groups(self.API_KEY, group_id, True, brightness)
 
         expected_request = json.dumps({'groupId': group_id, 'on': True, 'brightness': brightness})
-        mock_requests.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_groups__should_call_state_with_on_to_false_when_brightness_zero(self, mock_requests):
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         group_id = 2
         set_light_groups(self.API_KEY, group_id, True, 0)
 
         expected_request = json.dumps({'groupId': group_id, 'on': False})
-        mock_requests.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_groups__should_call_state_with_dimmer_value(self, mock_requests):
         brightness = 233
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         group_id = 1
         set_light_groups(self.API_KEY, group_id, True, brightness)
 
         expected_request = json.dumps({'groupId': group_id, 'on': True, 'brightness': brightness})
-        mock_requests.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_groups__should_call_state_with_on_set_true_if_dimmer_value(self, mock_requests):
         brightness = 155
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         group_id = 1
         set_light_groups(self.API_KEY, group_id, True, brightness)
 
         expected_request = json.dumps({'groupId': group_id, 'on': True, 'brightness': brightness})
-        mock_requests.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_request, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_groups__should_raise_failed_dependency_when_returns_failure(self, mock_requests):
         brightness = 155
-        mock_requests.post.return_value = self.__create_response(status=400)
+        mock_requests.return_value.post.return_value = self.__create_response(status=400)
         with pytest.raises(FailedDependency):
             set_light_groups(self.API_KEY, 1, True, brightness)
 
     def test_set_light_groups__should_call_api_with_no_brightness_when_not_supplied(self, mock_requests):
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         group_id = 1
         set_light_groups(self.API_KEY, group_id, False, None)
         expected = json.dumps({'groupId': group_id, 'on': False})
 
-        mock_requests.post.assert_called_with(ANY, data=expected, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected, headers={'LightApiKey': self.API_KEY})
 
     def test_create_light_group__should_make_api_call_to_url(self, mock_requests):
         expected_url = f'{self.BASE_URL}/group/create'
+        mock_requests.return_value.post.return_value = self.__create_response()
         create_light_group(self.API_KEY, None)
 
-        mock_requests.post.assert_called_with(expected_url, data=ANY, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(expected_url, data=ANY, headers={'LightApiKey': self.API_KEY})
 
     def test_create_light_group__should_make_api_with_group_name(self, mock_requests):
         group_name = 'Test Group'
         expected_data = json.dumps({'name': group_name})
+        mock_requests.return_value.post.return_value = self.__create_response()
         create_light_group(self.API_KEY, group_name)
 
-        mock_requests.post.assert_called_with(ANY, data=expected_data, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_data, headers={'LightApiKey': self.API_KEY})
 
     # def test_get_all_lights__should_make_api_call_to_url(self, mock_requests):
-    #     mock_requests.get.return_value = self.__create_response()
+    #     mock_requests.return_value.get.return_value = self.__create_response()
     #     expected_url = f'{self.BASE_URL}/{self.API_KEY}/lights'
     #     get_all_lights(self.API_KEY)
     #
-    #     mock_requests.get.assert_called_with(expected_url)
+    #     mock_requests.return_value.get.assert_called_with(expected_url)
     #
     # def test_get_all_lights__should_return_response_from_api(self, mock_requests):
     #     response_data = {'light_name': 'DoesntMatter'}
-    #     mock_requests.get.return_value = self.__create_response(data=response_data)
+    #     mock_requests.return_value.get.return_value = self.__create_response(data=response_data)
     #     actual = get_all_lights(self.API_KEY)
     #
     #     assert actual == response_data
     #
     # def test_get_all_lights__should_raise_failed_dependency_when_node_returns_500(self, mock_requests):
-    #     mock_requests.get.return_value = self.__create_response(status=500)
+    #     mock_requests.return_value.get.return_value = self.__create_response(status=500)
     #     with pytest.raises(FailedDependency):
     #         get_all_lights(self.API_KEY)
     #
     # def test_get_all_lights__should_raise_failed_dependency_when_node_returns_400(self, mock_requests):
-    #     mock_requests.get.return_value = self.__create_response(status=400)
+    #     mock_requests.return_value.get.return_value = self.__create_response(status=400)
     #     with pytest.raises(FailedDependency):
     #         get_all_lights(self.API_KEY)
     #
     # def test_get_all_lights__should_raise_failed_dependency_when_request_raises_connection_error(self, mock_requests):
-    #     mock_requests.get.side_effect = ConnectionError()
+    #     mock_requests.return_value.get.side_effect = ConnectionError()
     #     with pytest.raises(FailedDependency):
     #         get_all_lights(self.API_KEY)
     #
     # def test_get_all_lights__should_raise_failed_dependency_when_request_raises_connection_timeout_error(self, mock_requests):
-    #     mock_requests.get.side_effect = ConnectTimeout()
+    #     mock_requests.return_value.get.side_effect = ConnectTimeout()
     #     with pytest.raises(FailedDependency):
     #         get_all_lights(self.API_KEY)
     #
     # def test_get_light_group_attributes__should_make_api_call_to_url(self, mock_requests):
     #     group_id = "4"
-    #     mock_requests.get.return_value = self.__create_response()
+    #     mock_requests.return_value.get.return_value = self.__create_response()
     #     expected_url = f'{self.BASE_URL}/{self.API_KEY}/groups/{group_id}'
     #     get_light_group_attributes(self.API_KEY, group_id)
     #
-    #     mock_requests.get.assert_called_with(expected_url)
+    #     mock_requests.return_value.get.assert_called_with(expected_url)
     #
     # def test_get_light_group_attributes__should_return_response_from_api(self, mock_requests):
     #     group_id = "12"
     #     response_data = {'lights': ['1', '2']}
-    #     mock_requests.get.return_value = self.__create_response(data=response_data)
+    #     mock_requests.return_value.get.return_value = self.__create_response(data=response_data)
     #     actual = get_light_group_attributes(self.API_KEY, group_id)
     #
     #     assert actual == response_data
     #
     # def test_get_light_group_attributes__should_raise_failed_dependency_when_node_returns_500(self, mock_requests):
     #     group_id = '11'
-    #     mock_requests.get.return_value = self.__create_response(status=500)
+    #     mock_requests.return_value.get.return_value = self.__create_response(status=500)
     #     with pytest.raises(FailedDependency):
     #         get_light_group_attributes(self.API_KEY, group_id)
     #
     # def test_get_light_group_attributes__should_raise_failed_dependency_when_node_returns_400(self, mock_requests):
     #     group_id = '3'
-    #     mock_requests.get.return_value = self.__create_response(status=400)
+    #     mock_requests.return_value.get.return_value = self.__create_response(status=400)
     #     with pytest.raises(FailedDependency):
     #         get_light_group_attributes(self.API_KEY, group_id)
     #
     # def test_get_light_group_attributes__should_raise_failed_dependency_when_request_raises_connection_error(self, mock_requests):
     #     group_id = '3'
-    #     mock_requests.get.side_effect = ConnectionError()
+    #     mock_requests.return_value.get.side_effect = ConnectionError()
     #     with pytest.raises(FailedDependency):
     #         get_light_group_attributes(self.API_KEY, group_id)
     #
     # def test_get_light_group_attributes__should_raise_failed_dependency_when_request_raises_connection_timeout_error(self, mock_requests):
     #     group_id = '3'
-    #     mock_requests.get.side_effect = ConnectTimeout()
+    #     mock_requests.return_value.get.side_effect = ConnectTimeout()
     #     with pytest.raises(FailedDependency):
     #         get_light_group_attributes(self.API_KEY, group_id)
     #
     # def test_get_light_state__should_make_api_call_to_url(self, mock_requests):
     #     light_id = "4"
     #     expected_url = f'{self.BASE_URL}/{self.API_KEY}/lights/{light_id}'
-    #     mock_requests.get.return_value = self.__create_response()
+    #     mock_requests.return_value.get.return_value = self.__create_response()
     #     get_light_state(self.API_KEY, light_id)
     #
-    #     mock_requests.get.assert_called_with(expected_url)
+    #     mock_requests.return_value.get.assert_called_with(expected_url)
     #
     # def test_get_light_state__should_return_response_from_api(self, mock_requests):
     #     light_id = '5'
     #     response_data = {'name': 'livingRoomLamp', 'state': {'on': True}}
-    #     mock_requests.get.return_value = self.__create_response(data=response_data)
+    #     mock_requests.return_value.get.return_value = self.__create_response(data=response_data)
     #
     #     actual = get_light_state(self.API_KEY, light_id)
     #
@@ -481,25 +564,25 @@ class TestLightApiRequests:
     #
     # def test_get_light_state__should_raise_failed_dependency_when_node_returns_500(self, mock_requests):
     #     light_id = '12'
-    #     mock_requests.get.return_value = self.__create_response(status=500)
+    #     mock_requests.return_value.get.return_value = self.__create_response(status=500)
     #     with pytest.raises(FailedDependency):
     #         get_light_state(self.API_KEY, light_id)
     #
     # def test_get_light_state__should_raise_failed_dependency_when_node_returns_400(self, mock_requests):
     #     light_id = '12'
-    #     mock_requests.get.return_value = self.__create_response(status=400)
+    #     mock_requests.return_value.get.return_value = self.__create_response(status=400)
     #     with pytest.raises(FailedDependency):
     #         get_light_state(self.API_KEY, light_id)
     #
     # def test_get_light_state__should_raise_failed_dependency_when_request_raises_connection_error(self, mock_requests):
     #     light_id = '12'
-    #     mock_requests.get.side_effect = ConnectionError()
+    #     mock_requests.return_value.get.side_effect = ConnectionError()
     #     with pytest.raises(FailedDependency):
     #         get_light_state(self.API_KEY, light_id)
     #
     # def test_get_light_state__should_raise_failed_dependency_when_request_raises_connection_timeout_error(self, mock_requests):
     #     light_id = '12'
-    #     mock_requests.get.side_effect = ConnectTimeout()
+    #     mock_requests.return_value.get.side_effect = ConnectTimeout()
     #     with pytest.raises(FailedDependency):
     #         get_light_state(self.API_KEY, light_id)
 
@@ -508,68 +591,90 @@ class TestLightApiRequests:
     def test_set_light_state__should_make_call_to_api(self, mock_requests):
         light_id = '7'
         expected_url = f'{self.BASE_URL}/light/state'
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         set_light_state(self.API_KEY, light_id, None)
 
-        mock_requests.post.assert_called_with(expected_url, data=ANY, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(expected_url, data=ANY, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_state__should_submit_data_to_requested_url(self, mock_requests):
         light_id = '9'
         brightness = 188
         expected_data = json.dumps({'lightId': light_id, 'on': True, 'brightness': brightness})
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         set_light_state(self.API_KEY, light_id, brightness)
 
-        mock_requests.post.assert_called_with(ANY, data=expected_data, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_data, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_state__should_set_light_on_state_to_false_when_brightness_zero(self, mock_requests):
         light_id = '9'
         brightness = 0
         expected_data = json.dumps({'lightId': light_id, 'on': False, 'brightness': brightness})
-        mock_requests.post.return_value = self.__create_response()
+        mock_requests.return_value.post.return_value = self.__create_response()
         set_light_state(self.API_KEY, light_id, brightness)
 
-        mock_requests.post.assert_called_with(ANY, data=expected_data, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.post.assert_called_with(ANY, data=expected_data, headers={'LightApiKey': self.API_KEY})
 
     def test_set_light_state__should_raise_failed_dependency_when_exception(self, mock_requests):
-        mock_requests.post.return_value = self.__create_response(400)
+        mock_requests.return_value.post.return_value = self.__create_response(400)
         with pytest.raises(FailedDependency):
             set_light_state(self.API_KEY, '4', 255)
 
     def test_get_full_state__should_make_call_to_api(self, mock_requests):
-        mock_requests.get.return_value = self.__create_response()
+        mock_requests.return_value.get.return_value = self.__create_response()
         expected_url = f'{self.BASE_URL}/groups'
         get_light_groups(self.API_KEY)
 
-        mock_requests.get.assert_called_with(expected_url, timeout=10, headers={'LightApiKey': self.API_KEY})
+        mock_requests.return_value.get.assert_called_with(expected_url, timeout=10, headers={'LightApiKey': self.API_KEY})
 
     def test_get_full_state__should_return_response_from_api(self, mock_requests):
         response_data = {'fakeResult': 'response'}
-        mock_requests.get.return_value = self.__create_response(data=response_data)
+        mock_requests.return_value.get.return_value = self.__create_response(data=response_data)
         actual = get_light_groups(self.API_KEY, )
 
         assert actual == response_data
 
     def test_get_full_state__should_return_failed_dependency_when_light_node_returns_500(self, mock_requests):
-        mock_requests.get.return_value = self.__create_response(status=500)
+        mock_requests.return_value.get.return_value = self.__create_response(status=500)
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY, )
 
     def test_get_full_state__should_return_failed_dependency_when_light_node_returns_400(self, mock_requests):
-        mock_requests.get.return_value = self.__create_response(status=400)
+        mock_requests.return_value.get.return_value = self.__create_response(status=400)
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY, )
 
     def test_get_full_stat__should_not_fail_when_get_request_throws_connection_exception(self, mock_requests):
-        mock_requests.get.side_effect = ReadTimeout()
+        mock_requests.return_value.get.side_effect = ReadTimeout()
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY, )
 
     def test_get_full_stat__should_not_fail_when_get_request_throws_connection_timeout_exception(self, mock_requests):
-        mock_requests.get.side_effect = ConnectTimeout()
+        mock_requests.return_value.get.side_effect = ConnectTimeout()
         with pytest.raises(FailedDependency):
             get_light_groups(self.API_KEY, )
 
+    def test_get_light_groups__should_fail_fast_when_circuit_open(self, mock_requests):
+        Settings.get_instance().BaseUrls._settings = {'Lights': self.BASE_URL}
+        mock_requests.return_value.get.return_value = self.__create_response(status=503)
+        for _ in range(2):
+            with pytest.raises(FailedDependency):
+                get_light_groups(self.API_KEY)
+        mock_requests.return_value.get.reset_mock()
+
+        with pytest.raises(FailedDependency):
+            get_light_groups(self.API_KEY)
+        mock_requests.return_value.get.assert_not_called()
+
+    def test_set_light_state__should_raise_failed_dependency_when_circuit_open(self, mock_requests):
+        Settings.get_instance().BaseUrls._settings = {'Lights': self.BASE_URL}
+        mock_requests.return_value.post.side_effect = ConnectTimeout()
+        for _ in range(2):
+            with pytest.raises(ConnectTimeout):
+                set_light_state(self.API_KEY, '1', 100)
+
+        with pytest.raises(CircuitOpen):
+            set_light_state(self.API_KEY, '1', 100)
+
     @staticmethod
     def __create_response(status=200, data={}):
         response = Response()
@@ -578,7 +683,7 @@ class TestLightApiRequests:
         return response
 
 
-@patch('svc.utilities.api_utils.requests')
+@patch('svc.utilities.api_utils.get_session')
 class TestEmailApiRequests:
     EMAIL = 'test@test.com'
     PASSWORD = 'fakePassword'
@@ -588,17 +693,27 @@ class TestEmailApiRequests:
     def setup_method(self):
         Settings.get_instance()._settings = {'EmailAppId': self.API_KEY}
         Settings.get_instance().BaseUrls._settings = {'Email': self.URL}
+        self.RESPONSE = Response()
+        self.RESPONSE.status_code = 201
 
     def test_send_new_account_email__should_pass_api_key_to_header_in_requests(self, mock_request):
+        mock_request.return_value.post.return_value = self.RESPONSE
         expected_header = {'api-key': self.API_KEY, 'content-type': 'application/json', 'accept': 'application/json'}
         send_new_account_email(self.EMAIL, self.PASSWORD)
 
-        mock_request.post.assert_called_with(ANY, data=ANY, headers=expected_header)
+        mock_request.return_value.post.assert_called_with(ANY, data=ANY, headers=expected_header)
+
+    def test_send_new_account_email__should_use_email_session(self, mock_request):
+        mock_request.return_value.post.return_value = self.RESPONSE
+        send_new_account_email(self.EMAIL, self.PASSWORD)
+
+        mock_request.assert_called_with(Dependency.EMAIL)
 
     def test_send_new_account_email__should_call_url_in_post_method(self, mock_request):
+        mock_request.return_value.post.return_value = self.RESPONSE
         send_new_account_email(self.EMAIL, self.PASSWORD)
 
-        mock_request.post.assert_called_with(self.URL, data=ANY, headers=ANY)
+        mock_request.return_value.post.assert_called_with(self.URL, data=ANY, headers=ANY)
 
     def test_send_new_account_email__should_make_call_to_post_request_with_correct_body(self, mock_request):
         expected_data = {
@@ -607,6 +722,13 @@ class TestEmailApiRequests:
             "subject": "Home Automation: New Account Registration",
             "htmlContent": f"<html><head></head><body><p>Hello,</p><p>A new Home Automation account has been setup for you.</p><p>Password: {self.PASSWORD}</p></body></html>"
         }
+        mock_request.return_value.post.return_value = self.RESPONSE
         send_new_account_email(self.EMAIL, self.PASSWORD)
 
-        mock_request.post.assert_called_with(ANY, data=json.dumps(expected_data), headers=ANY)
+        mock_request.return_value.post.assert_called_with(ANY, data=json.dumps(expected_data), headers=ANY)
+
+    def test_send_new_account_email__should_raise_failed_dependency_when_email_api_rejects(self, mock_request):
+        self.RESPONSE.status_code = 500
+        mock_request.return_value.post.return_value = self.RESPONSE
+        with pytest.raises(FailedDependency):
+            send_new_account_email(self.EMAIL, self.PASSWORD)
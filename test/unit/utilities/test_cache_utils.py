@@ -0,0 +1,156 @@
+from mock import patch
+
+from svc.utilities.cache_utils import TtlCache, SharedCache, UwsgiCache
+
+
+@patch('svc.utilities.cache_utils.time')
+class TestTtlCache:
+    KEY = 'fakeUserId'
+    VALUE = {'city': 'Des Moines'}
+
+    def setup_method(self):
+        self.CACHE = TtlCache(2, 10)
+
+    def test_get__should_return_none_when_missing(self, mock_time):
+        mock_time.monotonic.return_value = 0
+
+        assert self.CACHE.get(self.KEY) is None
+
+    def test_get__should_return_stored_value(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.CACHE.set(self.KEY, self.VALUE)
+
+        assert self.CACHE.get(self.KEY) == self.VALUE
+
+    def test_get__should_return_none_once_ttl_expires(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.CACHE.set(self.KEY, self.VALUE)
+        mock_time.monotonic.return_value = 10
+
+        assert self.CACHE.get(self.KEY) is None
+
+    def test_set__should_evict_least_recently_used_entry(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.CACHE.set('first', 1)
+        self.CACHE.set('second', 2)
+        self.CACHE.get('first')
+        self.CACHE.set('third', 3)
+
+        assert self.CACHE.get('second') is None
+        assert self.CACHE.get('first') == 1
+        assert self.CACHE.get('third') == 3
+
+    def test_invalidate__should_remove_value(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.CACHE.set(self.KEY, self.VALUE)
+        self.CACHE.invalidate(self.KEY)
+
+        assert self.CACHE.get(self.KEY) is None
+
+    def test_get_stats__should_count_hits_and_misses(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.CACHE.get(self.KEY)
+        self.CACHE.set(self.KEY, self.VALUE)
+        self.CACHE.get(self.KEY)
+
+        assert self.CACHE.get_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    def test_clear__should_reset_entries_and_counters(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.CACHE.set(self.KEY, self.VALUE)
+        self.CACHE.get(self.KEY)
+        self.CACHE.clear()
+
+        assert self.CACHE.get_stats() == {'hits': 0, 'misses': 0, 'size': 0}
+
+
+class TestSharedCache:
+    NAMESPACE = 'preferences'
+    KEY = 'fakeUserId'
+    VALUE = {'city': 'Des Moines', 'is_imperial': True}
+
+    def setup_method(self):
+        self.CACHE = SharedCache.get_instance()
+        self.CACHE.clear()
+
+    def test_backend_name__should_fall_back_to_local_outside_uwsgi(self):
+        assert self.CACHE.backend_name == 'local'
+
+    def test_get__should_return_none_when_missing(self):
+        assert self.CACHE.get(self.NAMESPACE, self.KEY) is None
+
+    def test_get__should_return_stored_value(self):
+        self.CACHE.set(self.NAMESPACE, self.KEY, self.VALUE, 60)
+
+        assert self.CACHE.get(self.NAMESPACE, self.KEY) == self.VALUE
+
+    def test_get__should_return_copy_of_stored_value(self):
+        self.CACHE.set(self.NAMESPACE, self.KEY, self.VALUE, 60)
+        self.CACHE.get(self.NAMESPACE, self.KEY)['city'] = 'Ames'
+
+        assert self.CACHE.get(self.NAMESPACE, self.KEY) == self.VALUE
+
+    def test_get__should_keep_namespaces_separate(self):
+        self.CACHE.set(self.NAMESPACE, self.KEY, self.VALUE, 60)
+
+        assert self.CACHE.get('roles', self.KEY) is None
+
+    def test_invalidate__should_remove_value(self):
+        self.CACHE.set(self.NAMESPACE, self.KEY, self.VALUE, 60)
+        self.CACHE.invalidate(self.NAMESPACE, self.KEY)
+
+        assert self.CACHE.get(self.NAMESPACE, self.KEY) is None
+
+    def test_get_stats__should_count_hits_and_misses_by_namespace(self):
+        self.CACHE.get(self.NAMESPACE, self.KEY)
+        self.CACHE.set(self.NAMESPACE, self.KEY, self.VALUE, 60)
+        self.CACHE.get(self.NAMESPACE, self.KEY)
+
+        assert self.CACHE.get_stats() == {'backend': 'local', self.NAMESPACE: {'hits': 1, 'misses': 1}}
+
+
+@patch('svc.utilities.cache_utils.uwsgi', create=True)
+@patch('svc.utilities.cache_utils.time')
+class TestUwsgiCache:
+    CACHE_NAME = 'home_automation'
+    KEY = 'preferences:fakeUserId'
+
+    def setup_method(self):
+        self.CACHE = UwsgiCache(self.CACHE_NAME)
+
+    def test_set__should_update_uwsgi_cache_with_expiry(self, mock_time, mock_uwsgi):
+        mock_time.time.return_value = 100.0
+        self.CACHE.set(self.KEY, b'{}', 30)
+
+        mock_uwsgi.cache_update.assert_called_with(self.KEY, b'130.0|{}', 31, self.CACHE_NAME)
+
+    def test_set__should_drop_previous_value_when_update_is_rejected(self, mock_time, mock_uwsgi):
+        mock_time.time.return_value = 100.0
+        mock_uwsgi.cache_update.return_value = None
+        self.CACHE.set(self.KEY, b'{}', 30)
+
+        mock_uwsgi.cache_del.assert_called_with(self.KEY, self.CACHE_NAME)
+
+    def test_set__should_keep_value_when_update_succeeds(self, mock_time, mock_uwsgi):
+        mock_time.time.return_value = 100.0
+        mock_uwsgi.cache_update.return_value = True
+        self.CACHE.set(self.KEY, b'{}', 30)
+
+        mock_uwsgi.cache_del.assert_not_called()
+
+    def test_get__should_return_value_before_expiry(self, mock_time, mock_uwsgi):
+        mock_time.time.return_value = 100.0
+        mock_uwsgi.cache_get.return_value = b'130.0|{"a": 1}'
+
+        assert self.CACHE.get(self.KEY) == b'{"a": 1}'
+
+    def test_get__should_return_none_after_expiry(self, mock_time, mock_uwsgi):
+        mock_time.time.return_value = 131.0
+        mock_uwsgi.cache_get.return_value = b'130.0|{"a": 1}'
+
+        assert self.CACHE.get(self.KEY) is None
+
+    def test_invalidate__should_delete_from_uwsgi_cache(self, mock_time, mock_uwsgi):
+        self.CACHE.invalidate(self.KEY)
+
+        mock_uwsgi.cache_del.assert_called_with(self.KEY, self.CACHE_NAME)
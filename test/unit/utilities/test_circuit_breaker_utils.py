@@ -0,0 +1,130 @@
+import pytest
+from mock import patch
+from werkzeug.exceptions import FailedDependency
+
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import Dependency
+from svc.utilities.circuit_breaker_utils import CircuitBreaker, CircuitBreakers, CircuitOpen
+
+
+@patch('svc.utilities.circuit_breaker_utils.time')
+class TestCircuitBreaker:
+    NOW = 1000.0
+
+    def setup_method(self):
+        self.BREAKER = CircuitBreaker(failure_threshold=2, open_seconds=30)
+
+    def test_before_call__should_allow_calls_when_closed(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.BREAKER.before_call()
+
+        assert self.BREAKER.state == CircuitBreaker.CLOSED
+
+    def test_record_failure__should_stay_closed_below_threshold(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.BREAKER.record_failure()
+
+        assert self.BREAKER.state == CircuitBreaker.CLOSED
+
+    def test_record_failure__should_open_at_threshold(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.BREAKER.record_failure()
+        self.BREAKER.record_failure()
+
+        assert self.BREAKER.state == CircuitBreaker.OPEN
+
+    def test_record_success__should_reset_failure_count(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.BREAKER.record_failure()
+        self.BREAKER.record_success()
+        self.BREAKER.record_failure()
+
+        assert self.BREAKER.state == CircuitBreaker.CLOSED
+
+    def test_before_call__should_reject_when_open(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.__trip()
+
+        with pytest.raises(CircuitOpen):
+            self.BREAKER.before_call()
+
+    def test_before_call__should_raise_failed_dependency_when_open(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.__trip()
+
+        with pytest.raises(FailedDependency):
+            self.BREAKER.before_call()
+
+    def test_before_call__should_allow_one_probe_after_open_interval(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.__trip()
+        mock_time.monotonic.return_value = self.NOW + 30
+        self.BREAKER.before_call()
+
+        assert self.BREAKER.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpen):
+            self.BREAKER.before_call()
+
+    def test_record_success__should_close_after_successful_probe(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.__trip()
+        mock_time.monotonic.return_value = self.NOW + 30
+        self.BREAKER.before_call()
+        self.BREAKER.record_success()
+
+        assert self.BREAKER.state == CircuitBreaker.CLOSED
+        self.BREAKER.before_call()
+
+    def test_record_failure__should_reopen_after_failed_probe(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.__trip()
+        mock_time.monotonic.return_value = self.NOW + 30
+        self.BREAKER.before_call()
+        self.BREAKER.record_failure()
+
+        assert self.BREAKER.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpen):
+            self.BREAKER.before_call()
+
+    def test_get_stats__should_report_state_and_rejections(self, mock_time):
+        mock_time.monotonic.return_value = self.NOW
+        self.__trip()
+        with pytest.raises(CircuitOpen):
+            self.BREAKER.before_call()
+
+        assert self.BREAKER.get_stats() == {'state': 'open', 'failures': 2, 'rejected': 1}
+
+    def __trip(self):
+        self.BREAKER.record_failure()
+        self.BREAKER.record_failure()
+
+
+class TestCircuitBreakers:
+
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'FailureThreshold': 4, 'OpenSeconds': 12}
+        CircuitBreakers.get_instance().reset()
+
+    def teardown_method(self):
+        CircuitBreakers.get_instance().reset()
+
+    def test_get__should_reuse_breaker_per_endpoint(self):
+        breakers = CircuitBreakers.get_instance()
+
+        assert breakers.get(Dependency.GARAGE, 'http://1.1.1.1') is breakers.get(Dependency.GARAGE, 'http://1.1.1.1')
+
+    def test_get__should_separate_breakers_per_endpoint(self):
+        breakers = CircuitBreakers.get_instance()
+
+        assert breakers.get(Dependency.GARAGE, 'http://1.1.1.1') is not breakers.get(Dependency.GARAGE, 'http://2.2.2.2')
+
+    def test_get__should_use_settings(self):
+        breaker = CircuitBreakers.get_instance().get(Dependency.LIGHTS, 'http://lights')
+
+        assert breaker.failure_threshold == 4
+        assert breaker.open_seconds == 12
+
+    def test_get_stats__should_key_by_dependency_and_url(self):
+        CircuitBreakers.get_instance().get(Dependency.LIGHTS, 'http://lights')
+
+        assert CircuitBreakers.get_instance().get_stats() == {'lights:http://lights': {'state': 'closed', 'failures': 0, 'rejected': 0}}
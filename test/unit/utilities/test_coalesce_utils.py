@@ -0,0 +1,156 @@
+import threading
+
+import pytest
+from mock import MagicMock
+from werkzeug.exceptions import FailedDependency
+
+from svc.config.settings_state import Settings
+from svc.utilities.coalesce_utils import Coalescer, LightStateCoalescer
+
+
+class TestCoalescer:
+    KEY = ('group', '1')
+
+    def setup_method(self):
+        self.COALESCER = Coalescer()
+
+    def test_submit__should_apply_immediately_when_window_is_zero(self):
+        function = MagicMock(return_value='applied')
+        future = self.COALESCER.submit(self.KEY, 0, function, 'state')
+
+        assert future.done()
+        assert future.result() == 'applied'
+        function.assert_called_once_with('state')
+
+    def test_submit__should_apply_only_latest_arguments_after_window(self):
+        function = MagicMock()
+        for brightness in range(10):
+            future = self.COALESCER.submit(self.KEY, 0.05, function, brightness)
+        future.result(5)
+
+        function.assert_called_once_with(9)
+
+    def test_submit__should_share_one_future_within_window(self):
+        first = self.COALESCER.submit(self.KEY, 0.05, MagicMock(), 1)
+        second = self.COALESCER.submit(self.KEY, 0.05, MagicMock(), 2)
+
+        assert first is second
+
+    def test_submit__should_not_wait_for_apply(self):
+        release = threading.Event()
+        future = self.COALESCER.submit(self.KEY, 0.05, lambda: release.wait(5))
+
+        assert not future.done()
+        release.set()
+        future.result(5)
+
+    def test_submit__should_start_new_window_after_apply(self):
+        function = MagicMock()
+        self.COALESCER.submit(self.KEY, 0.05, function, 1).result(5)
+        self.COALESCER.submit(self.KEY, 0.05, function, 2).result(5)
+
+        assert function.call_count == 2
+
+    def test_submit__should_not_apply_same_key_while_previous_apply_runs(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        function = lambda value: calls.append(value) or started.set() or release.wait(5)
+        first = self.COALESCER.submit(self.KEY, 0.01, function, 1)
+        assert started.wait(5)
+        second = self.COALESCER.submit(self.KEY, 0.01, function, 2)
+        threading.Event().wait(0.05)
+
+        assert calls == [1]
+        release.set()
+        first.result(5)
+        second.result(5)
+
+    def test_submit__should_apply_newest_value_after_previous_apply_finishes(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        function = lambda value: calls.append(value) or started.set() or release.wait(5)
+        self.COALESCER.submit(self.KEY, 0.01, function, 1)
+        assert started.wait(5)
+        self.COALESCER.submit(self.KEY, 0.01, function, 2)
+        future = self.COALESCER.submit(self.KEY, 0, function, 3)
+        release.set()
+        future.result(5)
+
+        assert calls == [1, 3]
+
+    def test_submit__should_wait_for_window_after_previous_apply_finishes(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        function = lambda value: calls.append(value) or started.set() or release.wait(5)
+        first = self.COALESCER.submit(self.KEY, 0.01, function, 1)
+        assert started.wait(5)
+        second = self.COALESCER.submit(self.KEY, 0.5, function, 2)
+        release.set()
+        first.result(5)
+        threading.Event().wait(0.1)
+
+        assert calls == [1]
+        second.result(5)
+        assert calls == [1, 2]
+
+    def test_submit__should_apply_keys_separately(self):
+        function = MagicMock()
+        first = self.COALESCER.submit(('group', '1'), 0.05, function, 1)
+        second = self.COALESCER.submit(('group', '2'), 0.05, function, 2)
+        first.result(5)
+        second.result(5)
+
+        assert function.call_count == 2
+
+    def test_submit__should_set_error_on_future(self):
+        future = self.COALESCER.submit(self.KEY, 0.05, MagicMock(side_effect=FailedDependency()))
+
+        with pytest.raises(FailedDependency):
+            future.result(5)
+
+    def test_get_stats__should_count_submitted_and_applied_updates(self):
+        function = MagicMock()
+        for brightness in range(5):
+            future = self.COALESCER.submit(self.KEY, 0.05, function, brightness)
+        future.result(5)
+
+        assert self.COALESCER.get_stats() == {'submitted': 5, 'applied': 1, 'pending': 0}
+
+    def test_clear__should_reset_stats(self):
+        self.COALESCER.submit(self.KEY, 0, MagicMock())
+        self.COALESCER.clear()
+
+        assert self.COALESCER.get_stats() == {'submitted': 0, 'applied': 0, 'pending': 0}
+
+
+class TestLightStateCoalescer:
+    API_KEY = 'fakeApiKey'
+
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'CoalesceWindow': 0.05}
+        self.COALESCER = LightStateCoalescer.get_instance()
+        self.COALESCER.clear()
+
+    def teardown_method(self):
+        Settings.get_instance().Http._settings = None
+
+    def test_set_group__should_forward_latest_group_state(self):
+        function = MagicMock()
+        self.COALESCER.set_group(function, self.API_KEY, '1', True, 20)
+        self.COALESCER.set_group(function, self.API_KEY, 1, True, 200).result(5)
+
+        function.assert_called_once_with(self.API_KEY, 1, True, 200)
+
+    def test_set_light__should_not_coalesce_with_group_of_same_id(self):
+        group_function = MagicMock()
+        light_function = MagicMock()
+        group = self.COALESCER.set_group(group_function, self.API_KEY, '1', True, 20)
+        light = self.COALESCER.set_light(light_function, self.API_KEY, '1', 80)
+        group.result(5)
+        light.result(5)
+
+        group_function.assert_called_once_with(self.API_KEY, '1', True, 20)
+        light_function.assert_called_once_with(self.API_KEY, '1', 80)
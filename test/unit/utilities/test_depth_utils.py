@@ -1,4 +1,10 @@
-from svc.utilities.depth_utils import get_depth_by_intervals
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from svc.utilities.depth_utils import get_depth_by_intervals, downsample_depths
+
+START = datetime(2021, 1, 1)
+END = datetime(2021, 1, 2)
 
 
 def test_get_depth_by_intervals__should_calculate_distance_with_times():
@@ -8,3 +14,39 @@ def test_get_depth_by_intervals__should_calculate_distance_with_times():
     actual = get_depth_by_intervals(start_time, stop_time)
 
     assert actual == 49100450.0
+
+
+def test_downsample_depths__should_return_min_max_and_average_per_bucket():
+    readings = [(START, 10.0), (START + timedelta(hours=1), 14.0), (START + timedelta(hours=13), 20.0)]
+
+    actual = downsample_depths(readings, START, END, 2)
+
+    assert actual == [{'date': START, 'minDepth': 10.0, 'maxDepth': 14.0, 'averageDepth': 12.0, 'count': 2},
+                      {'date': START + timedelta(hours=12), 'minDepth': 20.0, 'maxDepth': 20.0, 'averageDepth': 20.0, 'count': 1}]
+
+
+def test_downsample_depths__should_skip_empty_buckets():
+    readings = [(START, 10.0), (START + timedelta(hours=23), 12.0)]
+
+    actual = downsample_depths(readings, START, END, 24)
+
+    assert [bucket['date'] for bucket in actual] == [START, START + timedelta(hours=23)]
+
+
+def test_downsample_depths__should_return_no_more_buckets_than_points():
+    readings = ((START + timedelta(seconds=second), 10.0) for second in range(0, 86400, 10))
+
+    actual = downsample_depths(readings, START, END, 100)
+
+    assert len(actual) == 100
+    assert sum(bucket['count'] for bucket in actual) == 8640
+
+
+def test_downsample_depths__should_convert_decimal_distances():
+    actual = downsample_depths([(START, Decimal('10.5'))], START, END, 1)
+
+    assert actual[0]['averageDepth'] == 10.5
+
+
+def test_downsample_depths__should_return_empty_list_without_readings():
+    assert downsample_depths([], START, END, 10) == []
@@ -0,0 +1,59 @@
+import os
+
+from mock import patch
+
+from svc.config.settings_state import Settings
+from svc.constants.home_automation import Dependency
+from svc.utilities.http_session_utils import get_session, HttpSessions, TimeoutSession
+
+
+class TestHttpSessions:
+
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'PoolSize': 4, 'Timeouts': {'Garage': 3}}
+        HttpSessions.get_instance().reset()
+
+    def teardown_method(self):
+        HttpSessions.get_instance().reset()
+
+    def test_get_session__should_reuse_session_for_same_dependency(self):
+        first = get_session(Dependency.LIGHTS)
+        second = get_session(Dependency.LIGHTS)
+
+        assert first is second
+
+    def test_get_session__should_create_separate_sessions_per_dependency(self):
+        assert get_session(Dependency.LIGHTS) is not get_session(Dependency.GARAGE)
+
+    def test_get_session__should_create_new_session_after_fork(self):
+        first = get_session(Dependency.LIGHTS)
+        with patch('svc.utilities.http_session_utils.os.getpid', return_value=os.getpid() + 1):
+            second = get_session(Dependency.LIGHTS)
+
+        assert first is not second
+
+    def test_get_session__should_use_configured_dependency_timeout(self):
+        assert get_session(Dependency.GARAGE).timeout == 3
+
+    def test_get_session__should_fall_back_to_default_dependency_timeout(self):
+        assert get_session(Dependency.WEATHER).timeout == 5
+
+    def test_get_session__should_size_connection_pool_from_settings(self):
+        adapter = get_session(Dependency.LIGHTS).get_adapter('http://127.0.0.1:5002')
+
+        assert adapter._pool_maxsize == 4
+
+
+@patch('requests.Session.request')
+class TestTimeoutSession:
+    URL = 'http://127.0.0.1:5002/api/lights/groups'
+
+    def test_request__should_apply_default_timeout(self, mock_request):
+        TimeoutSession(7).get(self.URL)
+
+        mock_request.assert_called_with('GET', self.URL, allow_redirects=True, timeout=7)
+
+    def test_request__should_keep_explicit_timeout(self, mock_request):
+        TimeoutSession(7).get(self.URL, timeout=2)
+
+        mock_request.assert_called_with('GET', self.URL, allow_redirects=True, timeout=2)
@@ -8,6 +8,7 @@ from mock import patch
 from werkzeug.exceptions import Unauthorized
 
 from svc.config.settings_state import Settings
+from svc.utilities.cache_utils import TokenCache
 from svc.utilities.jwt_utils import is_jwt_valid, create_jwt_token, generate_refresh_token
 
 
@@ -19,6 +20,7 @@ class TestJwt:
         self.JWT_BODY = {'fakeBody': 'valueValue'}
         self.SETTINGS = Settings.get_instance()
         self.SETTINGS._settings = {'JwtSecret': self.JWT_SECRET}
+        TokenCache.get_instance().clear()
 
     def test_is_jwt_valid__should_not_fail_if_it_can_be_decrypted(self):
         jwt_token = jwt.encode(self.JWT_BODY, self.JWT_SECRET, algorithm='HS256').decode('UTF-8')
@@ -90,3 +92,40 @@ class TestJwt:
 
         with pytest.raises(Unauthorized):
             is_jwt_valid(jwt_token)
+
+    @patch('svc.utilities.jwt_utils.jwt')
+    def test_is_jwt_valid__should_only_decode_repeated_token_once(self, mock_jwt):
+        mock_jwt.decode.return_value = {'exp': (datetime.now() + timedelta(hours=1)).timestamp()}
+        jwt_token = 'Bearer abc.def.ghi'
+
+        is_jwt_valid(jwt_token)
+        is_jwt_valid(jwt_token)
+
+        assert mock_jwt.decode.call_count == 1
+
+    @patch('svc.utilities.jwt_utils.jwt')
+    def test_is_jwt_valid__should_decode_again_once_token_expires(self, mock_jwt):
+        mock_jwt.decode.return_value = {'exp': (datetime.now() - timedelta(seconds=1)).timestamp()}
+        jwt_token = 'Bearer abc.def.ghi'
+
+        is_jwt_valid(jwt_token)
+        is_jwt_valid(jwt_token)
+
+        assert mock_jwt.decode.call_count == 2
+
+    def test_is_jwt_valid__should_reject_cached_token_after_secret_rotates(self):
+        self.JWT_BODY['exp'] = datetime.now() + timedelta(hours=1)
+        jwt_token = jwt.encode(self.JWT_BODY, self.JWT_SECRET, algorithm='HS256').decode('UTF-8')
+        is_jwt_valid(jwt_token)
+        self.SETTINGS._settings = {'JwtSecret': 'rotatedSecret'}
+
+        with pytest.raises(Unauthorized):
+            is_jwt_valid(jwt_token)
+
+    def test_is_jwt_valid__should_not_cache_invalid_tokens(self):
+        jwt_token = jwt.encode(self.JWT_BODY, 'badSecret', algorithm='HS256').decode('UTF-8')
+        with pytest.raises(Unauthorized):
+            is_jwt_valid(jwt_token)
+
+        with pytest.raises(Unauthorized):
+            is_jwt_valid(jwt_token)
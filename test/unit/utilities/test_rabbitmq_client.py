@@ -0,0 +1,353 @@
+import json
+import threading
+import time
+
+import pytest
+from mock import MagicMock
+
+from svc.config.settings_state import Settings
+from svc.utilities.rabbitmq_client import RabbitMQClient, RabbitMQClients, ThreadsafeChannel, get_client
+from test.memory_broker import MemoryBroker
+
+
+class TestRabbitMQClient:
+    QUEUE = 'test_queue'
+
+    def setup_method(self):
+        Settings.get_instance().Queue._settings = {'ConsumerWorkers': 3, 'DrainSeconds': 5}
+        self.BROKER = MemoryBroker()
+        self.CLIENT = RabbitMQClient(Settings.get_instance(), self.QUEUE, connection_factory=self.BROKER.connect)
+
+    def teardown_method(self):
+        Settings.get_instance().Queue._settings = None
+        self.BROKER.disconnect_all()
+
+    def test_publish__should_deliver_message_to_bound_queue(self):
+        self.__declare_queue()
+        self.CLIENT.publish(self.QUEUE, {'email': 'test@test.com'})
+
+        assert self.BROKER.queue_depth(self.QUEUE) == 1
+
+    def test_publish__should_raise_when_broker_unavailable(self):
+        self.BROKER.available = False
+        with pytest.raises(Exception, match='Broker Unavailable'):
+            self.CLIENT.publish(self.QUEUE, {})
+
+    def test_publish__should_reuse_publisher_connection(self):
+        for index in range(5):
+            self.CLIENT.publish(self.QUEUE, {'index': index})
+
+        assert self.BROKER.stats['connections'] == 1
+        assert self.BROKER.stats['channels'] == 1
+
+    def test_publish__should_declare_exchange_queue_and_binding_once(self):
+        for index in range(5):
+            self.CLIENT.publish(self.QUEUE, {'index': index})
+
+        assert self.BROKER.stats['declarations'] == 3
+
+    def test_publish__should_declare_durable_queue_before_any_consumer(self):
+        self.CLIENT.publish(self.QUEUE, {'email': 'test@test.com'})
+
+        assert self.BROKER.queue_depth(self.QUEUE) == 1
+        assert ('home_automation', self.QUEUE) in self.BROKER.bindings[self.QUEUE]
+
+    def test_publish__should_publish_mandatory_messages(self):
+        self.CLIENT.publish(self.QUEUE, {})
+
+        assert self.BROKER.queues[self.QUEUE][0]['mandatory'] is True
+
+    def test_publish__should_redeclare_binding_when_message_is_returned(self):
+        self.CLIENT.publish(self.QUEUE, {'index': 1})
+        self.BROKER.bindings.clear()
+        self.CLIENT.publish(self.QUEUE, {'index': 2})
+
+        assert self.BROKER.queue_depth(self.QUEUE) == 2
+
+    def test_publish__should_raise_when_message_stays_unroutable(self):
+        self.BROKER.route = lambda *args: False
+        with pytest.raises(Exception, match='unroutable'):
+            self.CLIENT.publish(self.QUEUE, {})
+
+    def test_publish__should_reconnect_after_connection_lost(self):
+        self.__declare_queue()
+        self.CLIENT.publish(self.QUEUE, {'index': 1})
+        self.BROKER.disconnect_all()
+        self.CLIENT.publish(self.QUEUE, {'index': 2})
+
+        assert self.BROKER.stats['connections'] == 3
+        assert self.BROKER.queue_depth(self.QUEUE) == 2
+
+    def test_publish_batch__should_deliver_all_messages_in_order(self):
+        self.__declare_queue()
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(10)])
+
+        assert [json.loads(message['body'])['index'] for message in self.BROKER.queues[self.QUEUE]] == list(range(10))
+
+    def test_publish_batch__should_commit_once_per_batch(self):
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(10)])
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(10)])
+
+        assert self.BROKER.stats['commits'] == 2
+
+    def test_publish_batch__should_not_publish_anything_when_commit_fails(self):
+        self.__declare_queue()
+        self.BROKER.available = False
+        self.BROKER.disconnect_all()
+        with pytest.raises(Exception, match='Broker Unavailable'):
+            self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(3)])
+
+        assert self.BROKER.queue_depth(self.QUEUE) == 0
+
+    def test_close_publisher__should_close_connection(self):
+        self.CLIENT.publish(self.QUEUE, {})
+        self.CLIENT.close_publisher()
+
+        assert self.BROKER.connections == []
+
+    def test_consume__should_pass_published_messages_to_worker(self):
+        self.RECEIVED = []
+        self.DONE = threading.Event()
+        consumer = threading.Thread(target=self.CLIENT._consume, args=(self.__receive_worker,), daemon=True)
+        consumer.start()
+        self.__wait_for_consumer()
+        self.CLIENT.publish(self.QUEUE, {'email': 'test@test.com'})
+
+        assert self.DONE.wait(5)
+        assert self.RECEIVED == [{'email': 'test@test.com'}]
+        self.CLIENT.stop_consumer()
+        consumer.join(5)
+        assert not consumer.is_alive()
+
+    def test_consume__should_declare_and_bind_queue(self):
+        consumer = threading.Thread(target=self.CLIENT._consume, args=(lambda *args: None,), daemon=True)
+        consumer.start()
+        self.__wait_for_consumer()
+
+        assert self.QUEUE in self.BROKER.queues
+        assert ('home_automation', self.QUEUE) in self.BROKER.bindings[self.QUEUE]
+        self.CLIENT.stop_consumer()
+        consumer.join(5)
+
+    def test_consume__should_process_messages_concurrently(self):
+        self.BARRIER = threading.Barrier(3, timeout=5)
+        consumer = self.__start_consumer(self.__barrier_worker)
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(3)])
+
+        self.__wait_for(lambda: self.BROKER.stats['acked'] == 3)
+        assert self.BROKER.stats['acked'] == 3
+        self.__stop_consumer(consumer)
+
+    def test_consume__should_limit_unacked_messages_to_prefetch_count(self):
+        Settings.get_instance().Queue._settings = {'ConsumerWorkers': 3, 'PrefetchCount': 2, 'DrainSeconds': 5}
+        self.RELEASE = threading.Event()
+        self.RECEIVED = []
+        consumer = self.__start_consumer(self.__blocking_worker)
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(5)])
+        time.sleep(0.2)
+
+        assert len(self.RECEIVED) == 2
+        assert self.BROKER.queue_depth(self.QUEUE) == 3
+        self.RELEASE.set()
+        self.__wait_for(lambda: self.BROKER.stats['acked'] == 5)
+        assert self.BROKER.stats['acked'] == 5
+        self.__stop_consumer(consumer)
+
+    def test_consume__should_settle_messages_on_connection_thread(self):
+        ack_threads = []
+        consumer = self.__start_consumer(lambda channel, method, properties, body: channel.basic_ack(delivery_tag=method.delivery_tag))
+        original_ack = self.CLIENT._channel.basic_ack
+        self.CLIENT._channel.basic_ack = lambda **kwargs: ack_threads.append(threading.current_thread()) or original_ack(**kwargs)
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(4)])
+
+        self.__wait_for(lambda: len(ack_threads) == 4)
+        assert ack_threads == [consumer] * 4
+        self.__stop_consumer(consumer)
+
+    def test_consume__should_keep_order_per_routing_key_when_ordered(self):
+        Settings.get_instance().Queue._settings = {'ConsumerWorkers': 3, 'OrderedConsumer': True, 'DrainSeconds': 5}
+        self.RECEIVED = []
+        consumer = self.__start_consumer(self.__uneven_worker, routing_keys=['door.1', 'door.2'])
+        self.CLIENT.publish_batch('door.1', [{'index': index} for index in range(6)])
+        self.CLIENT.publish_batch('door.2', [{'index': index} for index in range(6)])
+
+        self.__wait_for(lambda: len(self.RECEIVED) == 12)
+        assert [index for key, index in self.RECEIVED if key == 'door.1'] == list(range(6))
+        assert [index for key, index in self.RECEIVED if key == 'door.2'] == list(range(6))
+        self.__stop_consumer(consumer)
+
+    def test_consume__should_requeue_failed_message_once(self):
+        self.RECEIVED = []
+        consumer = self.__start_consumer(self.__failing_worker)
+        self.CLIENT.publish(self.QUEUE, {'index': 1})
+
+        self.__wait_for(lambda: self.BROKER.stats['nacked'] == 2)
+        assert self.RECEIVED == [False, True]
+        assert self.BROKER.queue_depth(self.QUEUE) == 0
+        self.__stop_consumer(consumer)
+
+    def test_stop_consumer__should_wait_for_in_flight_messages(self):
+        self.DONE = threading.Event()
+        consumer = self.__start_consumer(self.__slow_worker)
+        self.CLIENT.publish(self.QUEUE, {'index': 1})
+        assert self.DONE.wait(5)
+        self.__stop_consumer(consumer)
+
+        assert self.BROKER.stats['acked'] == 1
+        assert self.BROKER.queue_depth(self.QUEUE) == 0
+
+    def test_stop_consumer__should_leave_undelivered_messages_on_queue(self):
+        self.RELEASE = threading.Event()
+        self.RECEIVED = []
+        Settings.get_instance().Queue._settings = {'ConsumerWorkers': 1, 'PrefetchCount': 1, 'DrainSeconds': 5}
+        consumer = self.__start_consumer(self.__blocking_worker)
+        self.CLIENT.publish_batch(self.QUEUE, [{'index': index} for index in range(3)])
+        self.__wait_for(lambda: self.BROKER.queue_depth(self.QUEUE) == 2)
+        threading.Timer(0.1, self.RELEASE.set).start()
+        self.__stop_consumer(consumer)
+
+        assert self.BROKER.stats['acked'] == 1
+        assert self.BROKER.queue_depth(self.QUEUE) == 2
+
+    def test_consume__should_reconnect_after_connection_lost(self):
+        Settings.get_instance().Queue._settings = {'ConsumerWorkers': 3, 'DrainSeconds': 5, 'ReconnectDelay': 0.01}
+        received = threading.Event()
+        consumer = self.__start_consumer(lambda channel, method, properties, body: received.set() or channel.basic_ack(delivery_tag=method.delivery_tag))
+        self.BROKER.disconnect_all()
+        self.__wait_for(lambda: self.BROKER.stats['connections'] == 2)
+        self.__wait_for_consumer()
+        self.CLIENT.publish(self.QUEUE, {'index': 1})
+
+        assert received.wait(5)
+        self.__stop_consumer(consumer)
+
+    def test_consume__should_retry_when_broker_unavailable_at_start(self):
+        Settings.get_instance().Queue._settings = {'ConsumerWorkers': 3, 'DrainSeconds': 5, 'ReconnectDelay': 0.01}
+        self.BROKER.available = False
+        consumer = threading.Thread(target=self.CLIENT._consume, args=(lambda *args: None,), daemon=True)
+        consumer.start()
+        time.sleep(0.05)
+        self.BROKER.available = True
+        self.__wait_for_consumer()
+
+        assert self.CLIENT._channel.consuming
+        self.__stop_consumer(consumer)
+
+    def test_consume__should_back_off_between_failed_connections(self):
+        Settings.get_instance().Queue._settings = {'ReconnectDelay': 1, 'MaxReconnectDelay': 3}
+        self.BROKER.available = False
+        self.CLIENT._stopping = MagicMock()
+        self.CLIENT._stopping.is_set.side_effect = [False] * 8 + [True]
+        self.CLIENT._consume(lambda *args: None)
+
+        assert [call.args[0] for call in self.CLIENT._stopping.wait.call_args_list] == [1, 2, 3, 3]
+
+    def test_stop_consumer__should_stop_consumer_waiting_to_reconnect(self):
+        Settings.get_instance().Queue._settings = {'ReconnectDelay': 30}
+        self.BROKER.available = False
+        consumer = threading.Thread(target=self.CLIENT._consume, args=(lambda *args: None,), daemon=True)
+        consumer.start()
+        time.sleep(0.05)
+        self.CLIENT.stop_consumer()
+        consumer.join(5)
+
+        assert not consumer.is_alive()
+
+    def __receive_worker(self, channel, method, properties, body):
+        self.RECEIVED.append(json.loads(body))
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        self.DONE.set()
+
+    def __barrier_worker(self, channel, method, properties, body):
+        self.BARRIER.wait()
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    def __blocking_worker(self, channel, method, properties, body):
+        self.RECEIVED.append(body)
+        self.RELEASE.wait(5)
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    def __uneven_worker(self, channel, method, properties, body):
+        time.sleep(0.01 if json.loads(body)['index'] % 2 == 0 else 0)
+        self.RECEIVED.append((method.routing_key, json.loads(body)['index']))
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    def __failing_worker(self, channel, method, properties, body):
+        self.RECEIVED.append(method.redelivered)
+        raise ValueError()
+
+    def __slow_worker(self, channel, method, properties, body):
+        self.DONE.set()
+        time.sleep(0.3)
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    def __start_consumer(self, worker, routing_keys=None):
+        consumer = threading.Thread(target=self.CLIENT._consume, args=(worker, routing_keys), daemon=True)
+        consumer.start()
+        self.__wait_for_consumer()
+        return consumer
+
+    def __stop_consumer(self, consumer):
+        self.CLIENT.stop_consumer()
+        consumer.join(5)
+        assert not consumer.is_alive()
+
+    @staticmethod
+    def __wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def __declare_queue(self):
+        connection = self.BROKER.connect()
+        channel = connection.channel()
+        channel.exchange_declare(exchange='home_automation')
+        channel.queue_declare(queue=self.QUEUE, durable=True)
+        channel.queue_bind(queue=self.QUEUE, exchange='home_automation', routing_key=self.QUEUE)
+        connection.close()
+
+    def __wait_for_consumer(self):
+        for _ in range(100):
+            if self.CLIENT._channel is not None and self.CLIENT._channel.consuming:
+                return
+            threading.Event().wait(0.01)
+
+
+class TestRabbitMQClients:
+
+    def setup_method(self):
+        RabbitMQClients.get_instance().reset()
+
+    def test_get_client__should_reuse_client_per_queue(self):
+        assert get_client('first') is get_client('first')
+
+    def test_get_client__should_create_client_for_each_queue(self):
+        assert get_client('first') is not get_client('second')
+        assert get_client('second').queue_name == 'second'
+
+
+class TestThreadsafeChannel:
+
+    def setup_method(self):
+        self.CONNECTION = MagicMock()
+        self.CHANNEL = MagicMock()
+        self.THREADSAFE = ThreadsafeChannel(self.CONNECTION, self.CHANNEL)
+
+    def test_basic_ack__should_schedule_ack_on_connection_thread(self):
+        self.THREADSAFE.basic_ack(delivery_tag=4)
+
+        self.CHANNEL.basic_ack.assert_not_called()
+        self.CONNECTION.add_callback_threadsafe.call_args.args[0]()
+        self.CHANNEL.basic_ack.assert_called_with(delivery_tag=4, multiple=False)
+
+    def test_basic_nack__should_schedule_nack_on_connection_thread(self):
+        self.THREADSAFE.basic_nack(delivery_tag=4, requeue=False)
+
+        self.CHANNEL.basic_nack.assert_not_called()
+        self.CONNECTION.add_callback_threadsafe.call_args.args[0]()
+        self.CHANNEL.basic_nack.assert_called_with(delivery_tag=4, multiple=False, requeue=False)
+
+    def test_basic_ack__should_not_raise_when_connection_closed(self):
+        self.CONNECTION.add_callback_threadsafe.side_effect = Exception('closed')
+
+        self.THREADSAFE.basic_ack(delivery_tag=4)
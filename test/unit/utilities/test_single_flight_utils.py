@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+from mock import MagicMock
+from werkzeug.exceptions import FailedDependency
+
+from svc.utilities.single_flight_utils import SingleFlight
+
+
+class TestSingleFlight:
+    KEY = ('http://1.1.1.1', '1')
+
+    def setup_method(self):
+        self.FLIGHT = SingleFlight(16)
+
+    def test_do__should_return_function_result(self):
+        actual = self.FLIGHT.do(self.KEY, 0, lambda value: value * 2, 21)
+
+        assert actual == 42
+
+    def test_do__should_share_one_call_between_concurrent_callers(self):
+        started = threading.Event()
+        release = threading.Event()
+        function = MagicMock(side_effect=lambda: started.set() or release.wait(5) and 'status')
+        results = []
+        leader = threading.Thread(target=lambda: results.append(self.FLIGHT.do(self.KEY, 0, function)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(self.FLIGHT.do(self.KEY, 0, function))) for _ in range(4)]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert results == ['status'] * 5
+        function.assert_called_once()
+
+    def test_do__should_call_again_after_flight_completes_without_ttl(self):
+        function = MagicMock(return_value='status')
+        self.FLIGHT.do(self.KEY, 0, function)
+        self.FLIGHT.do(self.KEY, 0, function)
+
+        assert function.call_count == 2
+
+    def test_do__should_reuse_result_within_ttl(self):
+        function = MagicMock(return_value='status')
+        self.FLIGHT.do(self.KEY, 5, function)
+        actual = self.FLIGHT.do(self.KEY, 5, function)
+
+        assert actual == 'status'
+        function.assert_called_once()
+
+    def test_do__should_keep_keys_separate(self):
+        function = MagicMock(return_value='status')
+        self.FLIGHT.do(self.KEY, 5, function)
+        self.FLIGHT.do(('http://1.1.1.1', '2'), 5, function)
+
+        assert function.call_count == 2
+
+    def test_do__should_raise_error_to_caller(self):
+        function = MagicMock(side_effect=FailedDependency())
+
+        with pytest.raises(FailedDependency):
+            self.FLIGHT.do(self.KEY, 5, function)
+
+    def test_do__should_not_cache_errors(self):
+        function = MagicMock(side_effect=[FailedDependency(), 'status'])
+        with pytest.raises(FailedDependency):
+            self.FLIGHT.do(self.KEY, 5, function)
+        actual = self.FLIGHT.do(self.KEY, 5, function)
+
+        assert actual == 'status'
+
+    def test_invalidate__should_drop_cached_result(self):
+        function = MagicMock(return_value='status')
+        self.FLIGHT.do(self.KEY, 5, function)
+        self.FLIGHT.invalidate(self.KEY)
+        self.FLIGHT.do(self.KEY, 5, function)
+
+        assert function.call_count == 2
+
+    def test_invalidate__should_not_cache_result_of_call_in_flight(self):
+        self.FLIGHT.do(self.KEY, 5, self.__invalidate_during_call)
+        actual = self.FLIGHT.do(self.KEY, 5, lambda: 'fresh status')
+
+        assert actual == 'fresh status'
+
+    def __invalidate_during_call(self):
+        self.FLIGHT.invalidate(self.KEY)
+        return 'stale status'
@@ -1,6 +1,12 @@
-from mock import patch
+from mock import patch, MagicMock
 
-from svc.utilities.user_garage_utils import get_garage_url_by_user
+from svc.constants.home_automation import CacheNamespace
+from svc.utilities.cache_utils import SharedCache
+from svc.utilities.user_garage_utils import get_garage_url_by_user, read_garage_url
+
+
+def setup_function():
+    SharedCache.get_instance().clear()
 
 
 @patch('svc.utilities.user_garage_utils.UserDatabaseManager')
@@ -18,3 +24,43 @@ def test_get_garage_url_by_user__should_return_url_with_ip_from_database(mock_db
     actual = get_garage_url_by_user(user_id)
 
     assert actual == f'http://{database_response}'
+
+
+@patch('svc.utilities.user_garage_utils.UserDatabaseManager')
+def test_get_garage_url_by_user__should_not_open_database_when_cached(mock_db):
+    user_id = 'heyImAUserId'
+    mock_db.return_value.__enter__.return_value.get_user_garage_ip.return_value = '1.1.1.1'
+    get_garage_url_by_user(user_id)
+    actual = get_garage_url_by_user(user_id)
+
+    assert actual == 'http://1.1.1.1'
+    mock_db.assert_called_once()
+
+
+@patch('svc.utilities.user_garage_utils.UserDatabaseManager')
+def test_get_garage_url_by_user__should_cache_per_user(mock_db):
+    mock_db.return_value.__enter__.return_value.get_user_garage_ip.side_effect = ['1.1.1.1', '2.2.2.2']
+    get_garage_url_by_user('firstUser')
+    actual = get_garage_url_by_user('secondUser')
+
+    assert actual == 'http://2.2.2.2'
+
+
+def test_read_garage_url__should_use_provided_database():
+    user_id = 'heyImAUserId'
+    database = MagicMock()
+    database.get_user_garage_ip.return_value = '1.1.1.1:8080'
+    actual = read_garage_url(database, user_id)
+
+    assert actual == 'http://1.1.1.1:8080'
+    database.get_user_garage_ip.assert_called_with(user_id)
+
+
+def test_read_garage_url__should_return_cached_url():
+    user_id = 'heyImAUserId'
+    database = MagicMock()
+    SharedCache.get_instance().set(CacheNamespace.GARAGE_URLS, user_id, 'http://1.1.1.1:8080', 60)
+    actual = read_garage_url(database, user_id)
+
+    assert actual == 'http://1.1.1.1:8080'
+    database.get_user_garage_ip.assert_not_called()
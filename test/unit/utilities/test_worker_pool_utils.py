@@ -0,0 +1,49 @@
+import os
+
+from mock import patch
+
+from svc.config.settings_state import Settings
+from svc.utilities.worker_pool_utils import submit, WorkerPool
+
+
+class TestWorkerPool:
+
+    def setup_method(self):
+        Settings.get_instance().Http._settings = {'MaxWorkers': 2}
+        WorkerPool.get_instance().reset()
+
+    def teardown_method(self):
+        WorkerPool.get_instance().reset()
+
+    def test_submit__should_return_function_result(self):
+        future = submit(sum, [1, 2, 3])
+
+        assert future.result(timeout=5) == 6
+
+    def test_submit__should_pass_keyword_arguments(self):
+        future = submit(int, '11', base=2)
+
+        assert future.result(timeout=5) == 3
+
+    def test_submit__should_reuse_executor(self):
+        pool = WorkerPool.get_instance()
+        pool.submit(len, '').result(timeout=5)
+        executor = pool._executor
+        pool.submit(len, '').result(timeout=5)
+
+        assert pool._executor is executor
+
+    def test_submit__should_use_max_workers_from_settings(self):
+        pool = WorkerPool.get_instance()
+        pool.submit(len, '').result(timeout=5)
+
+        assert pool._executor._max_workers == 2
+
+    def test_submit__should_create_new_executor_after_fork(self):
+        pool = WorkerPool.get_instance()
+        pool.submit(len, '').result(timeout=5)
+        executor = pool._executor
+        with patch('svc.utilities.worker_pool_utils.os.getpid', return_value=os.getpid() + 1):
+            pool.submit(len, '').result(timeout=5)
+
+        assert pool._executor is not executor